@@ -1,10 +1,26 @@
-from collections import defaultdict, deque                                                       
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Mapping, MutableMapping, Sequence
+import csv
 import heapq                                                                                     
-from typing import Dict, List, Set, Tuple, Optional    
+import json
+import math
+import mmap  # mmap: önceden hesaplanmış tabloları dosyadan kopyalamadan (paylaşımlı) açmak için
+import os
+import struct
+import time
+import zlib
+from array import array  # array: istasyon komşuluklarını sıkıştırılmış tam sayı dizilerinde tutmak için
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Set, Tuple, Optional
+
+SONSUZ = float('inf')  # ulaşılamayan istasyonların süresi
 
 # oop nesne yönelimli prensibi kullandık metroağı yapısı istasyonu kullandı
 
 class Istasyon:
+    # __slots__ ile her istasyon nesnesi __dict__ taşımaz, büyük ağlarda bellek tasarrufu sağlar
+    __slots__ = ("istasyon_kodu", "istasyon_adi", "hat_adi", "komsu_istasyonlar")
+
     def __init__(self, istasyon_kodu, istasyon_adi, hat_adi):
         # Her istasyonun bir kodu, adı ve bağlı olduğu bir hat vardır.
         self.istasyon_kodu = istasyon_kodu  # İstasyonun benzersiz kimlik kodu
@@ -19,10 +35,2204 @@ class Istasyon:
         self.komsu_istasyonlar.append((komsu_istasyon, gecis_suresi))
 
 
-class MetroAgi:
+# Arama istatistikleri (isteğe bağlı ölçüm):
+# Arama fonksiyonlarına bir AramaIstatistikleri nesnesi verilirse yığın (heap) işlemleri sayan sarmalayıcılarla
+# yapılır; verilmezse doğrudan heapq fonksiyonları kullanılır ve arama döngülerine hiçbir ek iş girmez.
+
+class AramaIstatistikleri:
+    __slots__ = ("algoritma", "cikarilan", "eklenen", "eski_atlanan", "en_buyuk_kuyruk", "sure_ms")
+
+    def __init__(self, algoritma: str = ""):
+        self.algoritma = algoritma
+        self.cikarilan = 0  # yığından çıkarılan kayıt sayısı
+        self.eklenen = 0  # yığına eklenen kayıt sayısı
+        self.eski_atlanan = 0  # daha kısa süre bulunduğu için atlanan eski kayıtlar
+        self.en_buyuk_kuyruk = 0  # yığının ulaştığı en büyük uzunluk
+        self.sure_ms = 0.0  # duvar saati süresi (MetroAgi tarafından ölçülür)
+
+    @property
+    def kesinlesen(self) -> int:
+        # Eski olmayan her çıkarılan kayıt bir istasyonu kesinleştirir
+        return self.cikarilan - self.eski_atlanan
+
+    def sozluk(self) -> Dict[str, object]:
+        return {"algoritma": self.algoritma, "cikarilan": self.cikarilan, "kesinlesen": self.kesinlesen,
+                "eklenen": self.eklenen, "eski_atlanan": self.eski_atlanan,
+                "en_buyuk_kuyruk": self.en_buyuk_kuyruk, "sure_ms": self.sure_ms}
+
+    # heapq.heappush / heapq.heappop yerine kullanılacak sayan fonksiyonları döndürür.
+    # eski_mi(yigin, kayit) çıkarılan kaydın eski olup olmadığını aramanın kendi kuralıyla söyler;
+    # yiginlar aramanın başlangıç yığınlarıdır (içlerindeki kayıtlar eklenmiş sayılır).
+    # Arama başka bir öncelik kuyruğu kullanıyorsa onun ekle / cikar fonksiyonları heappush / heappop ile verilir.
+    def sayaclar(self, eski_mi, *yiginlar, heappush=heapq.heappush, heappop=heapq.heappop):
+        self.eklenen += sum(len(yigin) for yigin in yiginlar)
+        self.en_buyuk_kuyruk = max([self.en_buyuk_kuyruk] + [len(yigin) for yigin in yiginlar])
+
+        def ekle(yigin, kayit):
+            heappush(yigin, kayit)
+            self.eklenen += 1
+            if len(yigin) > self.en_buyuk_kuyruk:
+                self.en_buyuk_kuyruk = len(yigin)
+
+        def cikar(yigin):
+            kayit = heappop(yigin)
+            self.cikarilan += 1
+            if eski_mi(yigin, kayit):
+                self.eski_atlanan += 1
+            return kayit
+
+        return ekle, cikar
+
+
+# Öncelik kuyruğu arka uçları:
+# Arama döngüleri kuyruğu heapq ile aynı imzayla kullanır: ekle(kuyruk, kayit), cikar(kuyruk); kayit[0] önceliktir.
+# Geçiş süreleri tam sayıyken Dijkstra'nın (ve tutarlı sezgiselli A*'ın) çıkardığı öncelikler hiç azalmaz; aşağıdaki
+# iki kuyruk bundan yararlanır ve kayıtları karşılaştırıp yığın düzenlemek yerine kovalara atar:
+# - DialKuyrugu: kuyruktaki öncelikler en küçüğün en fazla en_buyuk_artis üstündedir; bu kadar kovalık dairesel
+#   dizi yeter. Ekleme O(1), çıkarma boş kovaları atlar.
+# - RadixYigini: kayıtlar son çıkarılan öncelikle farklarının en yüksek bitine göre kovalanır (en fazla 64 kova);
+#   öncelik aralığından bağımsızdır, çok uzun geçiş süreli ağlarda kullanılır.
+# Süreler tam sayı değilse heapq (ikili yığın) kullanılır.
+
+class DialKuyrugu:
+    __slots__ = ("kovalar", "_adet", "_oncelik")
+
+    def __init__(self, en_buyuk_artis: int):
+        self.kovalar: List[List[tuple]] = [[] for _ in range(en_buyuk_artis + 1)]
+        self._adet = 0
+        self._oncelik = None  # son çıkarılan öncelik
+
+    def __len__(self) -> int:
+        return self._adet
+
+    @staticmethod
+    def ekle(kuyruk: 'DialKuyrugu', kayit) -> None:
+        kovalar = kuyruk.kovalar
+        if kuyruk._oncelik is None:
+            kuyruk._oncelik = kayit[0]  # tarama ilk eklenen kaydın önceliğinden başlar (en küçük olmalıdır)
+        kovalar[kayit[0] % len(kovalar)].append(kayit)
+        kuyruk._adet += 1
+
+    @staticmethod
+    def cikar(kuyruk: 'DialKuyrugu'):
+        if not kuyruk._adet:
+            raise IndexError("boş kuyruktan çıkarma")
+        kovalar = kuyruk.kovalar
+        boy = len(kovalar)
+        oncelik = kuyruk._oncelik
+        while not kovalar[oncelik % boy]:
+            oncelik += 1
+        kuyruk._oncelik = oncelik
+        kuyruk._adet -= 1
+        return kovalar[oncelik % boy].pop()
+
+
+class RadixYigini:
+    __slots__ = ("kovalar", "_adet", "_son")
+
     def __init__(self):
+        self.kovalar: List[List[tuple]] = [[] for _ in range(65)]
+        self._adet = 0
+        self._son = 0  # son çıkarılan öncelik
+
+    def __len__(self) -> int:
+        return self._adet
+
+    @staticmethod
+    def ekle(kuyruk: 'RadixYigini', kayit) -> None:
+        kuyruk.kovalar[(kayit[0] ^ kuyruk._son).bit_length()].append(kayit)
+        kuyruk._adet += 1
+
+    @staticmethod
+    def cikar(kuyruk: 'RadixYigini'):
+        if not kuyruk._adet:
+            raise IndexError("boş kuyruktan çıkarma")
+        kovalar = kuyruk.kovalar
+        if not kovalar[0]:
+            # İlk dolu kovadaki en küçük öncelik yeni referans olur; kova daha alt kovalara dağıtılır
+            i = 1
+            while not kovalar[i]:
+                i += 1
+            kova = kovalar[i]
+            kovalar[i] = []
+            son = kuyruk._son = min(kayit[0] for kayit in kova)
+            for kayit in kova:
+                kovalar[(kayit[0] ^ son).bit_length()].append(kayit)
+        kuyruk._adet -= 1
+        return kovalar[0].pop()
+
+
+ONCELIK_KUYRUKLARI = ("otomatik", "heapq", "dial", "radix")  # KompaktMetroAgi.kuyruk_turu değerleri
+
+
+# Dondurulmuş (salt okunur) metro ağı:
+# istasyon kodları 0..n-1 arası yoğun tam sayı kimliklere çevrilir, komşuluklar CSR biçiminde
+# (ofsetler / hedefler / agirliklar) düz dizilerde tutulur. i numaralı istasyonun komşuları
+# hedefler[ofsetler[i]:ofsetler[i + 1]] aralığındadır. Arama algoritmaları nesne işaretçisi
+# kovalamak ve her adımda kod hash'lemek yerine bu diziler üzerinde çalışır.
+
+class KompaktMetroAgi:
+    DIAL_SINIRI = 4096  # otomatik seçimde Dial kuyruğunun kullanılacağı en uzun geçiş süresi (üstünde radix)
+
+    __slots__ = ("kodlar", "kod_indeksi", "ofsetler", "hedefler", "agirliklar", "hat_adlari", "istasyon_hatlari",
+                 "yuruyus", "kuyruk_turu", "_yer_isaretleri", "_hat_grafi", "_en_uzun_sure")
+
+    def __init__(self, kodlar: List[str], ofsetler, hedefler, agirliklar, hat_adlari: List[str], istasyon_hatlari,
+                 kod_indeksi: Optional[Mapping] = None, yuruyus=None):
+        self.kodlar = kodlar  # kimlik -> istasyon kodu
+        if kod_indeksi is None:
+            kod_indeksi = {kod: i for i, kod in enumerate(kodlar)}
+        self.kod_indeksi: Mapping = kod_indeksi  # istasyon kodu -> kimlik
+        self.ofsetler = ofsetler  # uzunluk n + 1
+        self.hedefler = hedefler  # uzunluk m (yönlü kenar sayısı)
+        self.agirliklar = agirliklar  # uzunluk m, geçiş süreleri
+        self.hat_adlari = hat_adlari  # hat kimliği -> hat adı
+        self.istasyon_hatlari = istasyon_hatlari  # uzunluk n, istasyonun hat kimliği
+        if yuruyus is None:
+            yuruyus = bytes(len(hedefler))
+        self.yuruyus = yuruyus  # uzunluk m, bağlantı yürüme bağlantısıysa 1
+        self.kuyruk_turu = "otomatik"  # Dijkstra / A* öncelik kuyruğu (ONCELIK_KUYRUKLARI)
+        self._en_uzun_sure = None  # en uzun geçiş süresi, ilk gerektiğinde hesaplanır
+        self._yer_isaretleri: Optional['YerIsaretleri'] = None  # A* için ilk kullanımda hesaplanır
+        self._hat_grafi: Optional[Tuple[array, List[List[float]]]] = None  # daraltılmış hat grafı (hat_grafi)
+
+    @classmethod
+    def agdan_olustur(cls, metro: 'MetroAgi') -> 'KompaktMetroAgi':
+        kodlar = list(metro.istasyonlar)
+        indeks = {kod: i for i, kod in enumerate(kodlar)}
+        hat_indeksi: Dict[Tuple[str, str], int] = {}
+        istasyon_hatlari = array('i')
+        for kod in kodlar:
+            anahtar = cls.hat_anahtari(metro.istasyonlar[kod])
+            istasyon_hatlari.append(hat_indeksi.setdefault(anahtar, len(hat_indeksi)))
+        hat_adlari = [hat_adi for hat_adi, _ in hat_indeksi]
+
+        ofsetler = array('i', [0])
+        hedefler = array('i')
+        sureler = []
+        yuruyus = array('B')
+        yuruyus_baglantilari = metro.yuruyus_baglantilari
+        for kod in kodlar:
+            for komsu, gecis_suresi in metro.istasyonlar[kod].komsu_istasyonlar:
+                hedefler.append(indeks[komsu.istasyon_kodu])
+                sureler.append(gecis_suresi)
+                yuruyus.append(bool(yuruyus_baglantilari) and metro._cift(kod, komsu.istasyon_kodu) in yuruyus_baglantilari)
+            ofsetler.append(len(hedefler))
+
+        # Süreler tam sayıysa 'i', değilse 'd' (float) dizisi kullanılır
+        tip = 'i' if all(type(sure) is int for sure in sureler) else 'd'
+        return cls(kodlar, ofsetler, hedefler, array(tip, sureler), hat_adlari, istasyon_hatlari, yuruyus=yuruyus)
+
+    # Hat kimliği hat adı ile istasyon kodunun son "_" öncesindeki önekinden oluşur (M1_3 -> ("Mavi Hat", "M1")).
+    # Görünen ad hattı tek başına belirlemez: Ankara'da M1, M2 ve M3'ün üçü de "Mavi Hat"tır ama aralarındaki geçiş
+    # bir aktarmadır. Kodunda "_" olmayan istasyonlar yalnızca hat adına göre gruplanır. hat_adlari her hat
+    # kimliğinin görünen adını tutar, bu yüzden aynı ad birden çok kez geçebilir.
+    @staticmethod
+    def hat_anahtari(istasyon: Istasyon) -> Tuple[str, str]:
+        return istasyon.hat_adi, str(istasyon.istasyon_kodu).rpartition("_")[0]
+
+    def __len__(self) -> int:
+        return len(self.kodlar)
+
+    # Arama için boş bir öncelik kuyruğu ve onun (ekle, cikar) fonksiyonlarını döndürür.
+    # Dial ve radix kuyrukları yalnızca tüm öncelikler tam sayıyken kullanılabilir; otomatik seçimde süreler (A*'da
+    # yer işareti mesafeleri de) tam sayıysa Dial (en uzun geçiş süresi DIAL_SINIRI'nı aşıyorsa radix), değilse
+    # heapq seçilir. carpan, bir eklemenin önceliğinin son çıkarılanı en fazla kaç en uzun geçiş süresi aşabileceğidir
+    # (Dijkstra'da 1, A*'da 2); yer_isaretleri, öncelikleri alt sınırla toplayan aramanın yer işaretleridir.
+    def _oncelik_kuyrugu(self, carpan: int = 1, yer_isaretleri: Optional['YerIsaretleri'] = None):
+        tur = self.kuyruk_turu
+        if tur not in ONCELIK_KUYRUKLARI:
+            raise ValueError(f"bilinmeyen öncelik kuyruğu: {tur}")
+        tam_sayi = memoryview(self.agirliklar).format != 'd' and (yer_isaretleri is None or yer_isaretleri.tam_sayi)
+        if tur != "heapq" and not tam_sayi:
+            if tur != "otomatik":
+                raise ValueError(f"{tur} kuyruğu yalnızca tam sayı geçiş süreleriyle kullanılabilir")
+            tur = "heapq"
+        if tur == "heapq":
+            return [], heapq.heappush, heapq.heappop
+
+        if self._en_uzun_sure is None:
+            self._en_uzun_sure = max(self.agirliklar, default=0)
+        if tur == "radix" or (tur == "otomatik" and self._en_uzun_sure > self.DIAL_SINIRI):
+            return RadixYigini(), RadixYigini.ekle, RadixYigini.cikar
+        return DialKuyrugu(carpan * self._en_uzun_sure), DialKuyrugu.ekle, DialKuyrugu.cikar
+
+    def komsular(self, i: int) -> List[Tuple[int, int]]:
+        ofsetler, hedefler, agirliklar = self.ofsetler, self.hedefler, self.agirliklar
+        return [(hedefler[j], agirliklar[j]) for j in range(ofsetler[i], ofsetler[i + 1])]
+
+    # Öncül (parent) dizisinden rotayı geri sarar: hedef -> ... -> baslangic, sonra ters çevirir
+    @staticmethod
+    def _yol_olustur(onceki, baslangic: int, hedef: int) -> List[int]:
+        yol = [hedef]
+        while yol[-1] != baslangic:
+            yol.append(onceki[yol[-1]])
+        yol.reverse()
+        return yol
+
+    # İleri ve geri öncül dizilerini buluşma kenarı (a, b) üzerinden birleştirir: baslangic..a + b..hedef
+    def _yollari_birlestir(self, onceki_ileri, onceki_geri, baslangic: int, hedef: int, a: int, b: int) -> List[int]:
+        ileri = self._yol_olustur(onceki_ileri, baslangic, a)
+        geri = self._yol_olustur(onceki_geri, hedef, b)
+        geri.reverse()
+        return ileri + geri
+
+    # BFS algoritması (kimlikler üzerinde)
+    # Kuyrukta rota kopyası yerine yalnızca istasyon kimliği tutulur; rota öncül dizisinden çıkarılır.
+    # istatistik yalnızca tek yönlü aramada doldurulur.
+    def en_az_durak(self, baslangic: int, hedef: int, cift_yonlu: bool = False,
+                    istatistik: Optional[AramaIstatistikleri] = None) -> Optional[List[int]]:
+        if cift_yonlu:
+            return self._en_az_durak_cift_yonlu(baslangic, hedef)
+
+        ofsetler, hedefler = self.ofsetler, self.hedefler
+        onceki = array('i', [-1]) * len(self.kodlar)  # -1: henüz keşfedilmedi
+        onceki[baslangic] = baslangic
+        kuyruk = deque([baslangic])
+        ekle, cikar = deque.append, deque.popleft
+        if istatistik is not None:
+            # BFS'te eski kayıt olmaz: her istasyon kuyruğa bir kez girer
+            ekle, cikar = istatistik.sayaclar(lambda _, kayit: False, kuyruk, heappush=ekle, heappop=cikar)
+
+        while kuyruk:
+            mevcut = cikar(kuyruk)
+            if mevcut == hedef:
+                return self._yol_olustur(onceki, baslangic, hedef)
+
+            for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                komsu = hedefler[j]
+                if onceki[komsu] == -1:
+                    onceki[komsu] = mevcut
+                    ekle(kuyruk, komsu)
+
+        return None
+
+    # Çift yönlü BFS: baştan ve hedeften aynı anda katman katman ilerler, ortada buluşur.
+    # Bağlantılar baglanti_ekle ile hep çift yönlü eklendiği için geri arama aynı komşulukları kullanır.
+    def _en_az_durak_cift_yonlu(self, baslangic: int, hedef: int) -> Optional[List[int]]:
+        if baslangic == hedef:
+            return [baslangic]
+
+        ofsetler, hedefler = self.ofsetler, self.hedefler
+        n = len(self.kodlar)
+        onceki = (array('i', [-1]) * n, array('i', [-1]) * n)  # (ileri, geri) öncül dizileri
+        mesafe = (array('i', [-1]) * n, array('i', [-1]) * n)  # (ileri, geri) durak sayıları
+        onceki[0][baslangic], onceki[1][hedef] = baslangic, hedef
+        mesafe[0][baslangic] = mesafe[1][hedef] = 0
+        sinirlar = [[baslangic], [hedef]]
+        derinlik = [0, 0]
+
+        en_iyi = -1  # şimdiye kadar bulunan en kısa toplam durak sayısı
+        bulusma = None  # (ileri taraftaki istasyon, geri taraftaki istasyon)
+
+        # Durma kuralı: iki sınırın derinlikleri toplamı + 1, bulunan en iyi rotadan kısa olamazsa bitir
+        while sinirlar[0] and sinirlar[1]:
+            if en_iyi != -1 and en_iyi <= derinlik[0] + derinlik[1] + 1:
+                break
+
+            # Her turda daha küçük olan sınır (frontier) tam bir katman genişletilir
+            yon = 0 if len(sinirlar[0]) <= len(sinirlar[1]) else 1
+            bu_onceki, bu_mesafe, diger_mesafe = onceki[yon], mesafe[yon], mesafe[1 - yon]
+
+            yeni_sinir = []
+            for mevcut in sinirlar[yon]:
+                yeni_mesafe = bu_mesafe[mevcut] + 1
+                for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                    komsu = hedefler[j]
+                    if bu_mesafe[komsu] == -1:
+                        bu_mesafe[komsu] = yeni_mesafe
+                        bu_onceki[komsu] = mevcut
+                        yeni_sinir.append(komsu)
+                    if diger_mesafe[komsu] != -1:
+                        toplam = yeni_mesafe + diger_mesafe[komsu]
+                        if en_iyi == -1 or toplam < en_iyi:
+                            en_iyi = toplam
+                            bulusma = (mevcut, komsu) if yon == 0 else (komsu, mevcut)
+
+            sinirlar[yon] = yeni_sinir
+            derinlik[yon] += 1
+
+        if bulusma is None:
+            return None
+        return self._yollari_birlestir(onceki[0], onceki[1], baslangic, hedef, *bulusma)
+
+    # Dijkstra algoritması (kimlikler üzerinde)
+    # Yığında (süre, istasyon kimliği) çiftleri tutulur; rota kopyalanmaz, öncül dizisinden çıkarılır.
+    # sezgisel=True verilirse yer işaretli (ALT) A* kullanılır.
+    # istatistik verilirse arama sayaçları (AramaIstatistikleri) bu nesneye yazılır.
+    def en_kisa_sure(self, baslangic: int, hedef: int, cift_yonlu: bool = False, sezgisel: bool = False,
+                     istatistik: Optional[AramaIstatistikleri] = None) -> Optional[Tuple[List[int], int]]:
+        if cift_yonlu:
+            return self._en_kisa_sure_cift_yonlu(baslangic, hedef, istatistik)
+        if sezgisel:
+            return self._a_yildiz(baslangic, hedef, istatistik)
+
+        ofsetler, hedefler, agirliklar = self.ofsetler, self.hedefler, self.agirliklar
+        n = len(self.kodlar)
+        mesafe = [SONSUZ] * n
+        onceki = array('i', [-1]) * n
+        mesafe[baslangic] = 0
+        onceki[baslangic] = baslangic
+        oncelik_kuyrugu, heappush, heappop = self._oncelik_kuyrugu()
+        heappush(oncelik_kuyrugu, (0, baslangic))
+        if istatistik is not None:
+            heappush, heappop = istatistik.sayaclar(lambda _, kayit: mesafe[kayit[1]] < kayit[0], oncelik_kuyrugu,
+                                                    heappush=heappush, heappop=heappop)
+
+        while oncelik_kuyrugu:
+            mevcut_sure, mevcut = heappop(oncelik_kuyrugu)
+
+            if mevcut == hedef:
+                return self._yol_olustur(onceki, baslangic, hedef), mevcut_sure
+
+            # Bu istasyona daha önce daha kısa sürede ulaşıldıysa eski kayıt atlanır
+            if mesafe[mevcut] < mevcut_sure:
+                continue
+
+            for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                komsu = hedefler[j]
+                yeni_sure = mevcut_sure + agirliklar[j]
+                if yeni_sure < mesafe[komsu]:
+                    mesafe[komsu] = yeni_sure
+                    onceki[komsu] = mevcut
+                    heappush(oncelik_kuyrugu, (yeni_sure, komsu))
+
+        return None
+
+    def yer_isaretleri(self) -> 'YerIsaretleri':
+        if self._yer_isaretleri is None:
+            self._yer_isaretleri = YerIsaretleri.sec(self)
+        return self._yer_isaretleri
+
+    # A* algoritması: sezgisel olarak yer işaretlerinden üçgen eşitsizliğiyle elde edilen alt sınır kullanılır.
+    # Alt sınır kabul edilebilir ve tutarlı olduğundan hedef kuyruktan çıktığında rota en hızlısıdır.
+    def _a_yildiz(self, baslangic: int, hedef: int,
+                  istatistik: Optional[AramaIstatistikleri] = None) -> Optional[Tuple[List[int], int]]:
+        ofsetler, hedefler, agirliklar = self.ofsetler, self.hedefler, self.agirliklar
+        yer_isaretleri = self.yer_isaretleri()
+        alt_sinir = yer_isaretleri.alt_sinir_fonksiyonu(hedef)
+        n = len(self.kodlar)
+        mesafe = [SONSUZ] * n
+        onceki = array('i', [-1]) * n
+        mesafe[baslangic] = 0
+        onceki[baslangic] = baslangic
+        # Yer işareti alt sınırı tutarlıdır (bağlantı başına en fazla geçiş süresi kadar değişir), öncelikler azalmaz
+        oncelik_kuyrugu, heappush, heappop = self._oncelik_kuyrugu(2, yer_isaretleri)
+        tahmin = alt_sinir(baslangic)
+        if tahmin == SONSUZ:
+            return None  # başlangıç ile hedef farklı bileşenlerde
+        heappush(oncelik_kuyrugu, (tahmin, 0, baslangic))  # (tahmini toplam, süre, istasyon)
+        if istatistik is not None:
+            heappush, heappop = istatistik.sayaclar(lambda _, kayit: mesafe[kayit[2]] < kayit[1], oncelik_kuyrugu,
+                                                    heappush=heappush, heappop=heappop)
+
+        while oncelik_kuyrugu:
+            _, mevcut_sure, mevcut = heappop(oncelik_kuyrugu)
+
+            if mevcut == hedef:
+                return self._yol_olustur(onceki, baslangic, hedef), mevcut_sure
+
+            if mesafe[mevcut] < mevcut_sure:
+                continue
+
+            for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                komsu = hedefler[j]
+                yeni_sure = mevcut_sure + agirliklar[j]
+                if yeni_sure < mesafe[komsu]:
+                    tahmin = alt_sinir(komsu)
+                    if tahmin == SONSUZ:
+                        continue  # komşudan hedefe hiç ulaşılamıyor
+                    mesafe[komsu] = yeni_sure
+                    onceki[komsu] = mevcut
+                    heappush(oncelik_kuyrugu, (yeni_sure + tahmin, yeni_sure, komsu))
+
+        return None
+
+    # Daraltılmış hat grafı: aynı hattaki bağlantılarla birbirine ulaşan istasyonlar (bir hattın kesintisiz parçası)
+    # tek düğüme daraltılır; farklı hatlardaki iki istasyon arasındaki her bağlantı düğümler arasında bir aktarmadır.
+    # Kapatılan bir bağlantı bir hattı ikiye bölerse iki parça ayrı düğüm olur. Bağlantılar çift yönlü olduğundan
+    # parçalar yalnızca ileri kenarlarla bulunur. Birkaç düzine düğümlük bu grafta tüm çiftler için BFS ile en az
+    # aktarma sayıları hesaplanır. (istasyon -> düğüm dizisi, düğümler arası aktarma sayıları) döndürür.
+    def hat_grafi(self) -> Tuple[array, List[List[float]]]:
+        if self._hat_grafi is None:
+            ofsetler, hedefler, hatlar = self.ofsetler, self.hedefler, self.istasyon_hatlari
+            n = len(self.kodlar)
+            parcalar = array('i', [-1]) * n
+            parca_sayisi = 0
+            for i in range(n):
+                if parcalar[i] != -1:
+                    continue
+                parcalar[i] = parca_sayisi
+                yigin = [i]
+                while yigin:
+                    mevcut = yigin.pop()
+                    for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                        komsu = hedefler[j]
+                        if parcalar[komsu] == -1 and hatlar[komsu] == hatlar[mevcut]:
+                            parcalar[komsu] = parca_sayisi
+                            yigin.append(komsu)
+                parca_sayisi += 1
+
+            parca_komsulari: List[Set[int]] = [set() for _ in range(parca_sayisi)]
+            for i in range(n):
+                for j in range(ofsetler[i], ofsetler[i + 1]):
+                    if parcalar[hedefler[j]] != parcalar[i]:
+                        parca_komsulari[parcalar[i]].add(parcalar[hedefler[j]])
+
+            mesafeler = []
+            for kaynak in range(parca_sayisi):
+                mesafe = [SONSUZ] * parca_sayisi
+                mesafe[kaynak] = 0
+                kuyruk = deque([kaynak])
+                while kuyruk:
+                    parca = kuyruk.popleft()
+                    for komsu in parca_komsulari[parca]:
+                        if mesafe[komsu] == SONSUZ:
+                            mesafe[komsu] = mesafe[parca] + 1
+                            kuyruk.append(komsu)
+                mesafeler.append(mesafe)
+            self._hat_grafi = (parcalar, mesafeler)
+        return self._hat_grafi
+
+    # Hat farkındalıklı en az aktarma araması: aynı hattaki bağlantılar 0, farklı hatta geçiş 1 aktarma sayılır.
+    # Her istasyon tek bir hatta ait olduğundan (istasyon, hat) durum uzayı istasyonların kendisidir. Bu uzaydaki
+    # 0-1 BFS, 0 maliyetli (hat içi) bağlantıları daraltılmış hat grafında BFS'e denktir; en az aktarma sayısı k
+    # bu yüzden hat_grafi tablosundan doğrudan okunur. Eşit aktarmalı rotalar arasından en kısa süreliyi bulan
+    # Dijkstra yalnızca başlangıçtan a, hedefe k - a aktarma uzaklıktaki hat parçalarında ve a'dan a + 1'e geçen
+    # aktarmalarda çalışır. Tam k aktarmalı her rota bu alt grafın içindedir, ağın geri kalanı hiç taranmaz.
+    # (rota, aktarma sayısı, süre) döndürür.
+    def en_az_aktarma(self, baslangic: int, hedef: int,
+                      istatistik: Optional[AramaIstatistikleri] = None) -> Optional[Tuple[List[int], int, int]]:
+        ofsetler, hedefler, agirliklar = self.ofsetler, self.hedefler, self.agirliklar
+        parcalar, mesafeler = self.hat_grafi()
+        baslangic_mesafesi, hedef_parcasi = mesafeler[parcalar[baslangic]], parcalar[hedef]
+        aktarma = baslangic_mesafesi[hedef_parcasi]
+        if aktarma == SONSUZ:
+            return None
+        # Parça -> kaçıncı aktarmada girildiği; yalnızca en az aktarmalı bir rotanın geçebileceği parçalar
+        katman = {parca: baslangic_mesafesi[parca] for parca in range(len(mesafeler))
+                  if baslangic_mesafesi[parca] + mesafeler[parca][hedef_parcasi] == aktarma}
+
+        n = len(self.kodlar)
+        mesafe = [SONSUZ] * n
+        onceki = array('i', [-1]) * n
+        mesafe[baslangic] = 0
+        onceki[baslangic] = baslangic
+        oncelik_kuyrugu, heappush, heappop = self._oncelik_kuyrugu()
+        heappush(oncelik_kuyrugu, (0, baslangic))
+        if istatistik is not None:
+            heappush, heappop = istatistik.sayaclar(lambda _, kayit: mesafe[kayit[1]] < kayit[0], oncelik_kuyrugu,
+                                                    heappush=heappush, heappop=heappop)
+
+        while oncelik_kuyrugu:
+            mevcut_sure, mevcut = heappop(oncelik_kuyrugu)
+
+            if mevcut == hedef:
+                return self._yol_olustur(onceki, baslangic, hedef), aktarma, mevcut_sure
+
+            if mesafe[mevcut] < mevcut_sure:
+                continue
+
+            mevcut_parca = parcalar[mevcut]
+            sonraki_katman = katman[mevcut_parca] + 1
+            for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                komsu = hedefler[j]
+                if parcalar[komsu] != mevcut_parca and katman.get(parcalar[komsu]) != sonraki_katman:
+                    continue
+                yeni_sure = mevcut_sure + agirliklar[j]
+                if yeni_sure < mesafe[komsu]:
+                    mesafe[komsu] = yeni_sure
+                    onceki[komsu] = mevcut
+                    heappush(oncelik_kuyrugu, (yeni_sure, komsu))
+
+        return None
+
+    # Çok ölçütlü (Pareto) arama: süre, aktarma sayısı ve yürüme süresi birlikte en aza indirilir. Sonuç, hiçbir
+    # ölçütte kötüleşmeden bir başkasında iyileştirilemeyen rotaların tamamıdır (Pareto cephesi) ve tek aramada bulunur.
+    # Her istasyonda birbirini domine etmeyen etiketlerden oluşan bir küme tutulur; etiketler (süre + yer işareti alt
+    # sınırı, aktarma, yürüme) sırasıyla kesinleşir, bu yüzden kesinleşmiş bir etiketi aynı istasyona sonradan gelen
+    # hiçbir etiket domine edemez. Alt sınırlarla (yer işaretleri ve hat grafındaki aktarma sayısı) hedefte bulunmuş
+    # bir rotadan iyi olamayacak etiketler daha kuyruğa girmeden budanır. Etiketler paralel dizilerde tutulur
+    # (istasyon, ebeveyn etiket); ölçüt değerleri yalnızca kuyrukta ve istasyonların kesinleşmiş kümelerinde bulunur.
+    # en_fazla_aktarma ve en_fazla_uzama (en hızlı rotanın katı) etiket kümelerini sınırlar.
+    # Süreye göre artan [(yol, süre, aktarma, yürüme süresi), ...] döndürür.
+    def pareto_rotalar(self, baslangic: int, hedef: int, en_fazla_aktarma: Optional[int] = None,
+                       en_fazla_uzama: Optional[float] = None,
+                       istatistik: Optional[AramaIstatistikleri] = None) -> List[Tuple[List[int], int, int, int]]:
+        ofsetler, hedefler, agirliklar, hatlar = self.ofsetler, self.hedefler, self.agirliklar, self.istasyon_hatlari
+        yuruyus = self.yuruyus
+        alt_sinir = self.yer_isaretleri().alt_sinir_fonksiyonu(hedef)
+        parcalar, mesafeler = self.hat_grafi()
+        hedef_hatti_mesafesi = [mesafe[parcalar[hedef]] for mesafe in mesafeler]
+        tahmin = {baslangic: alt_sinir(baslangic)}  # istasyon -> süre alt sınırı (istasyon başına bir kez hesaplanır)
+        if tahmin[baslangic] == SONSUZ:
+            return []
+        aktarma_siniri = SONSUZ if en_fazla_aktarma is None else en_fazla_aktarma
+
+        etiket_istasyonu = array('i', [baslangic])  # etiket -> istasyon
+        ebeveyn = array('i', [-1])  # etiket -> bir önceki istasyondaki etiket
+        kumeler: Dict[int, List[Tuple]] = {}  # istasyon -> kesinleşmiş (süre, aktarma, yürüme) etiketleri
+        cephe = kumeler[hedef] = []
+        cephe_etiketleri = []
+        oncelik_kuyrugu = [(tahmin[baslangic], 0, 0, 0, 0)]  # (süre + alt sınır, aktarma, yürüme, süre, etiket)
+
+        def domine_mi(kume, sure, aktarma, yuruyus_suresi) -> bool:
+            # Kümedeki bir etiket her ölçütte en az bu kadar iyiyse (eşitlik dahil) bu etiket gereksizdir
+            for s, a, y in kume:
+                if s <= sure and a <= aktarma and y <= yuruyus_suresi:
+                    return True
+            return False
+
+        def elenir_mi(kayit) -> bool:
+            tahmini_sure, aktarma, yuruyus_suresi, sure, etiket = kayit
+            istasyon = etiket_istasyonu[etiket]
+            return (domine_mi(kumeler.get(istasyon, ()), sure, aktarma, yuruyus_suresi) or
+                    domine_mi(cephe, tahmini_sure, aktarma + hedef_hatti_mesafesi[parcalar[istasyon]], yuruyus_suresi))
+
+        heappush, heappop = heapq.heappush, heapq.heappop
+        if istatistik is not None:
+            heappush, heappop = istatistik.sayaclar(lambda _, kayit: elenir_mi(kayit), oncelik_kuyrugu)
+
+        while oncelik_kuyrugu:
+            kayit = heappop(oncelik_kuyrugu)
+            tahmini_sure, aktarma, yuruyus_suresi, mevcut_sure, etiket = kayit
+            if en_fazla_uzama is not None and cephe and tahmini_sure > cephe[0][0] * en_fazla_uzama:
+                break  # kalan etiketlerin hepsi en hızlı rotanın izin verilen katından uzun
+            if elenir_mi(kayit):
+                continue
+
+            mevcut = etiket_istasyonu[etiket]
+            kumeler.setdefault(mevcut, []).append((mevcut_sure, aktarma, yuruyus_suresi))
+            if mevcut == hedef:
+                cephe_etiketleri.append(etiket)
+                continue  # hedeften geçip devam eden bir rota, hedefte duranı her ölçütte geçemez
+
+            mevcut_hat = hatlar[mevcut]
+            for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                komsu = hedefler[j]
+                yeni_aktarma = aktarma + (hatlar[komsu] != mevcut_hat)
+                aktarma_alt_siniri = yeni_aktarma + hedef_hatti_mesafesi[parcalar[komsu]]
+                if aktarma_alt_siniri > aktarma_siniri:
+                    continue
+                komsu_tahmini = tahmin.get(komsu)
+                if komsu_tahmini is None:
+                    komsu_tahmini = tahmin[komsu] = alt_sinir(komsu)
+                if komsu_tahmini == SONSUZ:
+                    continue
+                yeni_sure = mevcut_sure + agirliklar[j]
+                yeni_yuruyus = yuruyus_suresi + agirliklar[j] if yuruyus[j] else yuruyus_suresi
+                if (domine_mi(kumeler.get(komsu, ()), yeni_sure, yeni_aktarma, yeni_yuruyus) or
+                        domine_mi(cephe, yeni_sure + komsu_tahmini, aktarma_alt_siniri, yeni_yuruyus)):
+                    continue
+                etiket_istasyonu.append(komsu)
+                ebeveyn.append(etiket)
+                heappush(oncelik_kuyrugu, (yeni_sure + komsu_tahmini, yeni_aktarma, yeni_yuruyus, yeni_sure,
+                                           len(ebeveyn) - 1))
+
+        sonuc = []
+        for (sure, aktarma, yuruyus_suresi), etiket in zip(cephe, cephe_etiketleri):
+            yol = []
+            while etiket != -1:
+                yol.append(etiket_istasyonu[etiket])
+                etiket = ebeveyn[etiket]
+            yol.reverse()
+            sonuc.append((yol, sure, aktarma, yuruyus_suresi))
+        return sonuc
+
+    # Çift yönlü Dijkstra: iki yığın dönüşümlü olarak genişletilir.
+    # Durma kuralı: iki yığının en küçük anahtarlarının toplamı bulunan en iyi süreden (mu) küçük değilse
+    # daha iyi bir rota kalmamıştır.
+    def _en_kisa_sure_cift_yonlu(self, baslangic: int, hedef: int,
+                                 istatistik: Optional[AramaIstatistikleri] = None) -> Optional[Tuple[List[int], int]]:
+        if baslangic == hedef:
+            return [baslangic], 0
+
+        ofsetler, hedefler, agirliklar = self.ofsetler, self.hedefler, self.agirliklar
+        n = len(self.kodlar)
+        mesafe = ([SONSUZ] * n, [SONSUZ] * n)
+        onceki = (array('i', [-1]) * n, array('i', [-1]) * n)
+        mesafe[0][baslangic] = mesafe[1][hedef] = 0
+        onceki[0][baslangic], onceki[1][hedef] = baslangic, hedef
+        yiginlar = ([(0, baslangic)], [(0, hedef)])
+        heappush, heappop = heapq.heappush, heapq.heappop
+        if istatistik is not None:
+            heappush, heappop = istatistik.sayaclar(
+                lambda yigin, kayit: mesafe[yigin is yiginlar[1]][kayit[1]] < kayit[0], *yiginlar)
+
+        mu = SONSUZ
+        bulusma = None
+
+        while yiginlar[0] and yiginlar[1]:
+            if yiginlar[0][0][0] + yiginlar[1][0][0] >= mu:
+                break
+
+            # Anahtarı küçük olan taraf genişletilir
+            yon = 0 if yiginlar[0][0][0] <= yiginlar[1][0][0] else 1
+            yigin, bu_mesafe, bu_onceki, diger_mesafe = yiginlar[yon], mesafe[yon], onceki[yon], mesafe[1 - yon]
+
+            mevcut_sure, mevcut = heappop(yigin)
+            if bu_mesafe[mevcut] < mevcut_sure:
+                continue
+
+            for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                komsu = hedefler[j]
+                yeni_sure = mevcut_sure + agirliklar[j]
+                if yeni_sure < bu_mesafe[komsu]:
+                    bu_mesafe[komsu] = yeni_sure
+                    bu_onceki[komsu] = mevcut
+                    heappush(yigin, (yeni_sure, komsu))
+                toplam = yeni_sure + diger_mesafe[komsu]
+                if toplam < mu:
+                    mu = toplam
+                    bulusma = (mevcut, komsu) if yon == 0 else (komsu, mevcut)
+
+        if bulusma is None:
+            return None
+        return self._yollari_birlestir(onceki[0], onceki[1], baslangic, hedef, *bulusma), mu
+
+
+    # Tek kaynaklı Dijkstra: baslangic'tan tüm istasyonlara en kısa süreleri hesaplar.
+    # (mesafe, onceki, sira) döndürür; sira istasyonların kesinleşme sırasıdır (öncüller her zaman önce gelir).
+    # hedef_kumesi verilirse kümedeki tüm istasyonlar kesinleşince arama erken biter.
+    # onceki_baglanti (uzunluğu n olan dizi) verilirse her istasyona ağaçta ulaşılan bağlantının indeksi (hedefler ile
+    # aynı sıra) bu diziye yazılır; yalnızca sira'daki istasyonların değerleri geçerlidir.
+    def tek_kaynak(self, baslangic: int, hedef_kumesi: Optional[Set[int]] = None, onceki_baglanti=None):
+        ofsetler, hedefler, agirliklar = self.ofsetler, self.hedefler, self.agirliklar
+        kalan = len(hedef_kumesi) if hedef_kumesi is not None else -1
+        n = len(self.kodlar)
+        mesafe = [SONSUZ] * n
+        onceki = array('i', [-1]) * n
+        mesafe[baslangic] = 0
+        onceki[baslangic] = baslangic
+        oncelik_kuyrugu, heappush, heappop = self._oncelik_kuyrugu()
+        heappush(oncelik_kuyrugu, (0, baslangic))
+        sira = []
+
+        while oncelik_kuyrugu:
+            mevcut_sure, mevcut = heappop(oncelik_kuyrugu)
+            if mesafe[mevcut] < mevcut_sure:
+                continue
+            sira.append(mevcut)
+            if kalan > 0 and mevcut in hedef_kumesi:
+                kalan -= 1
+                if kalan == 0:
+                    break
+
+            for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                komsu = hedefler[j]
+                yeni_sure = mevcut_sure + agirliklar[j]
+                if yeni_sure < mesafe[komsu]:
+                    mesafe[komsu] = yeni_sure
+                    onceki[komsu] = mevcut
+                    if onceki_baglanti is not None:
+                        onceki_baglanti[komsu] = j
+                    heappush(oncelik_kuyrugu, (yeni_sure, komsu))
+
+        return mesafe, onceki, sira
+
+    # Bütçeli çok kaynaklı Dijkstra: kaynaklardan birinden en fazla butce sürede ulaşılabilen istasyonlar.
+    # {istasyon: (süre, en yakın kaynak)} döndürür; sözlük kesinleşme (artan süre) sırasındadır. Bütçeyi aşan
+    # istasyonlar kuyruğa hiç girmez, arama sınıra gelince kendiliğinden biter (yalnızca bölge içi gezilir).
+    def butceli_arama(self, kaynaklar: Iterable[int], butce) -> Dict[int, Tuple[float, int]]:
+        ofsetler, hedefler, agirliklar = self.ofsetler, self.hedefler, self.agirliklar
+        oncelik_kuyrugu, heappush, heappop = self._oncelik_kuyrugu()
+        mesafe = {}
+        for kaynak in dict.fromkeys(kaynaklar):
+            mesafe[kaynak] = 0
+            heappush(oncelik_kuyrugu, (0, kaynak, kaynak))
+        sonuc: Dict[int, Tuple[float, int]] = {}
+
+        while oncelik_kuyrugu:
+            mevcut_sure, mevcut, kaynak = heappop(oncelik_kuyrugu)
+            if mevcut in sonuc:
+                continue
+            sonuc[mevcut] = (mevcut_sure, kaynak)
+
+            for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                komsu = hedefler[j]
+                yeni_sure = mevcut_sure + agirliklar[j]
+                if yeni_sure <= butce and yeni_sure < mesafe.get(komsu, SONSUZ):
+                    mesafe[komsu] = yeni_sure
+                    heappush(oncelik_kuyrugu, (yeni_sure, komsu, kaynak))
+        return sonuc
+
+    # Çok kaynaklı / çok hedefli Dijkstra: kaynaklar kümesindeki herhangi bir istasyondan hedef_kumesi'ndeki
+    # herhangi birine en kısa yol, (yol, süre) ya da None. Kaynakların hepsi 0 süreyle kuyruğa girer (tek bir süper
+    # düğümden çıkılıyormuş gibi) ve ilk kesinleşen hedefte durulur; N x M ayrı arama yerine tek arama yapılır.
+    def kumeler_arasi_en_kisa_sure(self, kaynaklar: Iterable[int], hedef_kumesi: Set[int],
+                                   istatistik: Optional[AramaIstatistikleri] = None) -> Optional[Tuple[List[int], int]]:
+        ofsetler, hedefler, agirliklar = self.ofsetler, self.hedefler, self.agirliklar
+        n = len(self.kodlar)
+        mesafe = [SONSUZ] * n
+        onceki = array('i', [-1]) * n
+        kok = array('i', [-1]) * n  # istasyona en hızlı ulaşılan kaynak
+        oncelik_kuyrugu, heappush, heappop = self._oncelik_kuyrugu()
+        for kaynak in dict.fromkeys(kaynaklar):
+            mesafe[kaynak] = 0
+            onceki[kaynak] = kok[kaynak] = kaynak
+            heappush(oncelik_kuyrugu, (0, kaynak))
+        if istatistik is not None:
+            heappush, heappop = istatistik.sayaclar(lambda _, kayit: mesafe[kayit[1]] < kayit[0], oncelik_kuyrugu,
+                                                    heappush=heappush, heappop=heappop)
+
+        while oncelik_kuyrugu:
+            mevcut_sure, mevcut = heappop(oncelik_kuyrugu)
+            if mesafe[mevcut] < mevcut_sure:
+                continue
+            if mevcut in hedef_kumesi:
+                return self._yol_olustur(onceki, kok[mevcut], mevcut), mevcut_sure
+
+            for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                komsu = hedefler[j]
+                yeni_sure = mevcut_sure + agirliklar[j]
+                if yeni_sure < mesafe[komsu]:
+                    mesafe[komsu] = yeni_sure
+                    onceki[komsu] = mevcut
+                    kok[komsu] = kok[mevcut]
+                    heappush(oncelik_kuyrugu, (yeni_sure, komsu))
+
+        return None
+
+    # Yen algoritması: baslangic'tan hedefe döngüsüz rotaları süreye göre artan sırada üreten üreteç; (yol, süre) verir.
+    # Hedeften bir kez çalıştırılan tek kaynaklı Dijkstra (ağ simetrik) tüm sapma aramalarında paylaşılır: her
+    # istasyonun hedefe kalan süresi, bağlantı/istasyon çıkarılmış ağda kesin bir alt sınırdır (A* sezgiseli) ve sapma
+    # istasyonundan ağaç boyunca hedefe giden yol yasaklı bir istasyon ya da ilk adım içermiyorsa arama hiç yapılmaz.
+    # Lawler iyileştirmesiyle her rota için sapmalar yalnızca atasından ayrıldığı istasyondan itibaren denenir.
+    def alternatif_rotalar(self, baslangic: int, hedef: int):
+        kalan, sonraki, _ = self.tek_kaynak(hedef)
+        if kalan[baslangic] == SONSUZ:
+            return
+
+        yol = [baslangic]
+        while yol[-1] != hedef:
+            yol.append(sonraki[yol[-1]])
+        bulunanlar = [yol]
+        ayrilma = 0  # yolun atasından ayrıldığı istasyonun sırası
+        gorulenler = {tuple(yol)}
+        adaylar = []  # (süre, yol, ayrılma sırası)
+        yield yol, kalan[baslangic]
+
+        while True:
+            kok_sureleri = self._birikimli_sureler(yol)
+            for i in range(ayrilma, len(yol) - 1):
+                kok = yol[:i + 1]
+                # Aynı kökü paylaşan bulunmuş rotaların bu kökten sonraki ilk adımları kullanılamaz
+                yasak_adimlar = {p[i + 1] for p in bulunanlar if len(p) > i + 1 and p[:i + 1] == kok}
+                sapma = self._sapma_yolu(yol[i], hedef, kalan, sonraki, set(kok[:-1]), yasak_adimlar)
+                if sapma is None:
+                    continue
+                aday = tuple(kok[:-1] + sapma[0])
+                if aday not in gorulenler:
+                    gorulenler.add(aday)
+                    heapq.heappush(adaylar, (kok_sureleri[i] + sapma[1], aday, i))
+
+            if not adaylar:
+                return
+            sure, aday, ayrilma = heapq.heappop(adaylar)
+            yol = list(aday)
+            bulunanlar.append(yol)
+            yield yol, sure
+
+    def _birikimli_sureler(self, yol: List[int]) -> List[float]:
+        # yol boyunca her istasyona kadar geçen süre (paralel bağlantılardan en kısası kullanılır)
+        sureler = [0]
+        for a, b in zip(yol, yol[1:]):
+            sureler.append(sureler[-1] + self.baglanti_suresi(a, b))
+        return sureler
+
+    def baglanti_suresi(self, a: int, b: int):
+        # a-b doğrudan bağlantısının süresi (paralel bağlantılardan en kısası; bağlantı yoksa SONSUZ)
+        hedefler, agirliklar = self.hedefler, self.agirliklar
+        return min((agirliklar[j] for j in range(self.ofsetler[a], self.ofsetler[a + 1]) if hedefler[j] == b),
+                   default=SONSUZ)
+
+    def _sapma_yolu(self, sapma: int, hedef: int, kalan, sonraki, yasak: Set[int],
+                    yasak_adimlar: Set[int]) -> Optional[Tuple[List[int], float]]:
+        # sapma'dan hedefe, yasak istasyonlara girmeyen ve ilk adımı yasak_adimlar'da olmayan en kısa yol
+        if sonraki[sapma] not in yasak_adimlar:
+            yol = [sapma]
+            while yol[-1] != hedef and sonraki[yol[-1]] not in yasak:
+                yol.append(sonraki[yol[-1]])
+            if yol[-1] == hedef:
+                return yol, kalan[sapma]
+
+        ofsetler, hedefler, agirliklar = self.ofsetler, self.hedefler, self.agirliklar
+        mesafe = {sapma: 0}
+        onceki = {sapma: -1}
+        oncelik_kuyrugu = [(kalan[sapma], 0, sapma)]
+        while oncelik_kuyrugu:
+            _, mevcut_sure, mevcut = heapq.heappop(oncelik_kuyrugu)
+            if mevcut == hedef:
+                yol = [hedef]
+                while onceki[yol[-1]] != -1:
+                    yol.append(onceki[yol[-1]])
+                yol.reverse()
+                return yol, mevcut_sure
+            if mevcut_sure > mesafe[mevcut]:
+                continue
+
+            for j in range(ofsetler[mevcut], ofsetler[mevcut + 1]):
+                komsu = hedefler[j]
+                if komsu in yasak or kalan[komsu] == SONSUZ or (mevcut == sapma and komsu in yasak_adimlar):
+                    continue
+                yeni_sure = mevcut_sure + agirliklar[j]
+                if yeni_sure < mesafe.get(komsu, SONSUZ):
+                    mesafe[komsu] = yeni_sure
+                    onceki[komsu] = mevcut
+                    heapq.heappush(oncelik_kuyrugu, (yeni_sure + kalan[komsu], yeni_sure, komsu))
+        return None
+
+    # Ağın içeriğine (kodlar + komşuluk dizileri) bağlı CRC32 parmak izi.
+    # Diske yazılan tabloların hangi ağdan üretildiğini doğrulamak için kullanılır.
+    def parmak_izi(self) -> int:
+        iz = zlib.crc32("\n".join(self.kodlar).encode("utf-8"))
+        for dizi in (self.ofsetler, self.hedefler, self.agirliklar):
+            iz = zlib.crc32(memoryview(dizi).cast('B'), iz)
+        return zlib.crc32(memoryview(self.agirliklar).format.encode("ascii"), iz)
+
+
+# Yer işaretleri (landmark) ile A* alt sınırları (ALT):
+# Birkaç istasyon L için tüm istasyonlara olan d(L, v) süreleri önceden hesaplanır. Ağ çift yönlü olduğundan
+# üçgen eşitsizliği |d(L, t) - d(L, v)| <= d(v, t) verir; bunların en büyüğü kabul edilebilir bir sezgiseldir.
+# Yer işaretleri en uzak nokta yöntemiyle otomatik seçilir (ağın uçlarına yayılırlar).
+
+class YerIsaretleri:
+    VARSAYILAN_ADET = 4
+
+    __slots__ = ("istasyonlar", "mesafeler", "tam_sayi", "ulasilamaz")
+
+    # mesafeler liste yerine dizi ya da paylaşımlı bellek görünümü (memoryview) satırları da olabilir; bu dizilerde
+    # SONSUZ tutulamadığından ulaşılamayan istasyonlar ulasilamaz değeriyle (ör. -1) işaretlenir ve alt sınır
+    # hesaplanırken SONSUZ sayılır.
+    def __init__(self, istasyonlar: Sequence[int], mesafeler: Sequence[Sequence[float]], ulasilamaz=SONSUZ):
+        self.istasyonlar = istasyonlar  # yer işareti istasyon kimlikleri
+        self.mesafeler = mesafeler  # mesafeler[k][v] = d(istasyonlar[k], v), ulaşılamıyorsa ulasilamaz
+        self.ulasilamaz = ulasilamaz
+        # Tüm mesafeler tam sayıysa alt sınırlar da tam sayıdır (A* Dial / radix kuyruğu kullanabilir)
+        self.tam_sayi = all(type(d) is int or d == ulasilamaz for mesafe in mesafeler for d in mesafe)
+
+    @classmethod
+    def sec(cls, donuk: KompaktMetroAgi, adet: int = VARSAYILAN_ADET) -> 'YerIsaretleri':
+        n = len(donuk)
+        istasyonlar, mesafeler = [], []
+        if n == 0:
+            return cls(istasyonlar, mesafeler)
+
+        # İlk yer işareti: 0 numaralı istasyondan en uzak istasyon
+        en_yakin = donuk.tek_kaynak(0)[0]
+        for _ in range(min(adet, n)):
+            # Seçilmiş yer işaretlerine en uzak (ama ulaşılabilir) istasyon bir sonraki yer işareti olur
+            aday, aday_mesafe = -1, -1
+            for v in range(n):
+                if en_yakin[v] != SONSUZ and en_yakin[v] > aday_mesafe and v not in istasyonlar:
+                    aday, aday_mesafe = v, en_yakin[v]
+            if aday == -1:
+                break
+
+            mesafe = donuk.tek_kaynak(aday)[0]
+            istasyonlar.append(aday)
+            mesafeler.append(mesafe)
+            en_yakin = [m if m < e else e for m, e in zip(mesafe, en_yakin)] if len(istasyonlar) > 1 else mesafe
+
+        return cls(istasyonlar, mesafeler)
+
+    def alt_sinir_fonksiyonu(self, hedef: int):
+        # Hedefe göre önceden hazırlanmış h(v) fonksiyonu döndürür
+        ciftler = [(mesafe, mesafe[hedef]) for mesafe in self.mesafeler]
+        ulasilamaz = self.ulasilamaz
+
+        def alt_sinir(v: int):
+            en_iyi = 0
+            for mesafe, hedef_mesafesi in ciftler:
+                v_mesafesi = mesafe[v]
+                if v_mesafesi == ulasilamaz or hedef_mesafesi == ulasilamaz:
+                    if v_mesafesi != hedef_mesafesi:
+                        return SONSUZ  # v ile hedef farklı bileşenlerde
+                    continue
+                fark = hedef_mesafesi - v_mesafesi if hedef_mesafesi > v_mesafesi else v_mesafesi - hedef_mesafesi
+                if fark > en_iyi:
+                    en_iyi = fark
+            return en_iyi
+
+        return alt_sinir
+
+
+# Önceden hesaplanmış tüm çiftler rota tablosu:
+# sureler[s * n + t] s'den t'ye en kısa süre (-1: ulaşılamaz), sonraki[s * n + t] ise s'den t'ye giden
+# en hızlı rotada s'den sonraki ilk istasyon. Sorgular tablo okuma + rota açma (O(rota uzunluğu)) olur.
+# Tablolar diske yazılıp mmap ile açılabilir; aynı dosyayı açan işçi süreçler sayfaları paylaşır.
+
+class RotaTablosu:
+    SIHIRLI = b"MTRT"  # dosya imzası
+    SURUM = 1
+    _BASLIK = struct.Struct("<4sIIIc11x")  # imza, sürüm, n, parmak izi, süre tipi ('i'/'d'); 32 bayt
+
+    __slots__ = ("n", "parmak_izi", "sureler", "sonraki", "_mmap")
+
+    def __init__(self, n: int, parmak_izi: int, sureler, sonraki, _mmap=None):
+        self.n = n
+        self.parmak_izi = parmak_izi
+        self.sureler = sureler
+        self.sonraki = sonraki
+        self._mmap = _mmap  # dosyadan açıldıysa mmap nesnesi
+
+    @classmethod
+    def hesapla(cls, donuk: KompaktMetroAgi) -> 'RotaTablosu':
+        # Her hedef t için bir Dijkstra; ağ simetrik olduğundan t'den kurulan ağaç t sütununu doğrudan verir
+        # (x'in t'ye süresi mesafe[x], t'ye giderken ilk adımı ağaçtaki ebeveyni). Böylece her sütun t'ye giden tek
+        # bir en kısa yollar ağacıdır (onar buna dayanır). İlk adımlar kaynak başına ayrı ağaçlardan türetilseydi,
+        # eşit süreli yollarda (ör. sıfır dakikalık bağlantılar) farklı ağaçların adımları döngü oluşturabilirdi.
+        n = len(donuk)
+        tip = 'd' if memoryview(donuk.agirliklar).format == 'd' else 'i'
+        sureler = array(tip, [-1]) * (n * n)
+        sonraki = array('i', [-1]) * (n * n)
+
+        for hedef in range(n):
+            mesafe, onceki, sira = donuk.tek_kaynak(hedef)
+            for istasyon in sira:
+                sonraki[istasyon * n + hedef] = onceki[istasyon]
+                sureler[istasyon * n + hedef] = mesafe[istasyon]
+
+        return cls(n, donuk.parmak_izi(), sureler, sonraki)
+
+    def sure(self, baslangic: int, hedef: int):
+        sure = self.sureler[baslangic * self.n + hedef]
+        return None if sure < 0 else sure
+
+    def yol(self, baslangic: int, hedef: int) -> Optional[List[int]]:
+        n, sonraki = self.n, self.sonraki
+        if sonraki[baslangic * n + hedef] == -1:
+            return None
+        # Döngüsüz bir yol en fazla n istasyondur; daha uzunsa tablo tutarsızdır ve yürümek hiç bitmezdi
+        yol = [baslangic]
+        while yol[-1] != hedef:
+            if len(yol) == n:
+                raise ValueError(f"rota tablosu tutarsız: {baslangic} -> {hedef} yolu döngüye giriyor")
+            yol.append(sonraki[yol[-1] * n + hedef])
+        return yol
+
+    # Dinamik bakım: u-v bağlantısının (en kısa) süresi eski_sure'den yeni_sure'ye değiştikten sonra tabloyu onarır.
+    # Ağ simetrik olduğundan t sütunu t'ye giden en kısa yollar ağacıdır (sonraki[x * n + t], x'in ağaçtaki ebeveyni).
+    # Yalnızca değişiklikten etkilenen ağaçlara dokunulur: süre artınca u-v kenarı ağaçta değilse sütun aynen kalır,
+    # kenar ağaçtaysa yalnızca altındaki alt ağaç sınırdaki istasyonlardan yeniden hesaplanır; süre azalınca
+    # iyileşme u ya da v'den başlayarak yayılır. donuk değişiklikten sonraki ağdır. Onarılan ağaç sayısını döndürür.
+    def onar(self, donuk: KompaktMetroAgi, u: int, v: int, eski_sure, yeni_sure) -> int:
+        self._yazilabilir_yap(donuk)
+        n, sureler, sonraki = self.n, self.sureler, self.sonraki
+        onarilan = 0
+        for t in range(n):
+            if yeni_sure > eski_sure:
+                if sonraki[u * n + t] == v:
+                    self._alt_agaci_onar(donuk, t, u)
+                elif sonraki[v * n + t] == u:
+                    self._alt_agaci_onar(donuk, t, v)
+                else:
+                    continue
+            else:
+                sure_u, sure_v = sureler[u * n + t], sureler[v * n + t]
+                if sure_v >= 0 and (sure_u < 0 or sure_v + yeni_sure < sure_u):
+                    self._iyilesmeyi_yay(donuk, t, u, sure_v + yeni_sure, v)
+                elif sure_u >= 0 and (sure_v < 0 or sure_u + yeni_sure < sure_v):
+                    self._iyilesmeyi_yay(donuk, t, v, sure_u + yeni_sure, u)
+                else:
+                    continue
+            onarilan += 1
+
+        self.parmak_izi = donuk.parmak_izi()
+        return onarilan
+
+    def _yazilabilir_yap(self, donuk: KompaktMetroAgi) -> None:
+        # mmap'ten açılmış (salt okunur) tablo belleğe kopyalanır; kesirli süreler için süre dizisi 'd' olur.
+        # Onarılan tablo artık dosyadaki tablodan farklıdır, dosya bir sonraki on_hesapla'da parmak izinden tanınır.
+        tip = 'd' if memoryview(donuk.agirliklar).format == 'd' else memoryview(self.sureler).format
+        if not isinstance(self.sureler, array) or self.sureler.typecode != tip:
+            self.sureler = array(tip, self.sureler)
+        if not isinstance(self.sonraki, array):
+            self.sonraki = array('i', self.sonraki)
+        self._mmap = None
+
+    def _alt_agaci_onar(self, donuk: KompaktMetroAgi, t: int, kok: int) -> None:
+        # t ağacında kok'un alt ağacı (yolu kok üzerinden geçen istasyonlar) sıfırlanır, alt ağaç dışındaki
+        # komşulardan tohumlanan Dijkstra ile yeniden hesaplanır
+        n, sureler, sonraki = self.n, self.sureler, self.sonraki
+        ofsetler, hedefler, agirliklar = donuk.ofsetler, donuk.hedefler, donuk.agirliklar
+        alt_agac = [kok]
+        icinde = {kok}
+        for y in alt_agac:
+            for j in range(ofsetler[y], ofsetler[y + 1]):
+                x = hedefler[j]
+                if x not in icinde and sonraki[x * n + t] == y:
+                    icinde.add(x)
+                    alt_agac.append(x)
+
+        mesafe = {}
+        yigin = []
+        for x in alt_agac:
+            en_iyi, ebeveyn = SONSUZ, -1
+            for j in range(ofsetler[x], ofsetler[x + 1]):
+                z = hedefler[j]
+                if z not in icinde and sureler[z * n + t] >= 0 and sureler[z * n + t] + agirliklar[j] < en_iyi:
+                    en_iyi, ebeveyn = sureler[z * n + t] + agirliklar[j], z
+            mesafe[x] = en_iyi
+            sonraki[x * n + t] = ebeveyn
+            if ebeveyn != -1:
+                yigin.append((en_iyi, x))
+        heapq.heapify(yigin)
+
+        while yigin:
+            sure, x = heapq.heappop(yigin)
+            if sure > mesafe[x]:
+                continue
+            for j in range(ofsetler[x], ofsetler[x + 1]):
+                y = hedefler[j]
+                if y in icinde and sure + agirliklar[j] < mesafe[y]:
+                    mesafe[y] = sure + agirliklar[j]
+                    sonraki[y * n + t] = x
+                    heapq.heappush(yigin, (mesafe[y], y))
+
+        for x in alt_agac:
+            sureler[x * n + t] = -1 if mesafe[x] == SONSUZ else mesafe[x]
+
+    def _iyilesmeyi_yay(self, donuk: KompaktMetroAgi, t: int, baslangic: int, sure, ebeveyn: int) -> None:
+        # baslangic'ın t'ye süresi azaldı; azalma yalnızca gerçekten iyileşen istasyonlara yayılır
+        n, sureler, sonraki = self.n, self.sureler, self.sonraki
+        ofsetler, hedefler, agirliklar = donuk.ofsetler, donuk.hedefler, donuk.agirliklar
+        sureler[baslangic * n + t] = sure
+        sonraki[baslangic * n + t] = ebeveyn
+        yigin = [(sure, baslangic)]
+        while yigin:
+            sure, x = heapq.heappop(yigin)
+            if sure > sureler[x * n + t]:
+                continue
+            for j in range(ofsetler[x], ofsetler[x + 1]):
+                y = hedefler[j]
+                eski = sureler[y * n + t]
+                if eski < 0 or sure + agirliklar[j] < eski:
+                    sureler[y * n + t] = sure + agirliklar[j]
+                    sonraki[y * n + t] = x
+                    heapq.heappush(yigin, (sure + agirliklar[j], y))
+
+    def kaydet(self, dosya_yolu: str) -> None:
+        tip = memoryview(self.sureler).format
+        with open(dosya_yolu, "wb") as dosya:
+            dosya.write(self._BASLIK.pack(self.SIHIRLI, self.SURUM, self.n, self.parmak_izi, tip.encode("ascii")))
+            dosya.write(memoryview(self.sureler).cast('B'))
+            dosya.write(memoryview(self.sonraki).cast('B'))
+
+    @classmethod
+    def ac(cls, dosya_yolu: str) -> 'RotaTablosu':
+        # Dosya ayrıştırılmaz: diziler doğrudan mmap üzerindeki memoryview'lardır
+        with open(dosya_yolu, "rb") as dosya:
+            bellek = mmap.mmap(dosya.fileno(), 0, access=mmap.ACCESS_READ)
+
+        sihirli, surum, n, parmak_izi, tip = cls._BASLIK.unpack_from(bellek, 0)
+        tip = tip.decode("ascii")
+        if sihirli != cls.SIHIRLI or surum != cls.SURUM:
+            bellek.close()
+            raise ValueError(f"{dosya_yolu} geçerli bir rota tablosu dosyası değil")
+
+        gorunum = memoryview(bellek)
+        baslangic = cls._BASLIK.size
+        sure_boyu = n * n * array(tip).itemsize
+        sonraki_boyu = n * n * array('i').itemsize
+        if len(gorunum) != baslangic + sure_boyu + sonraki_boyu:
+            gorunum.release()
+            bellek.close()
+            raise ValueError(f"{dosya_yolu} eksik ya da bozuk")
+
+        sureler = gorunum[baslangic:baslangic + sure_boyu].cast(tip)
+        sonraki = gorunum[baslangic + sure_boyu:].cast('i')
+        return cls(n, parmak_izi, sureler, sonraki, bellek)
+
+# Daraltma hiyerarşisi (contraction hierarchy):
+# Ön işlemde istasyonlar "önem" sırasına göre tek tek daraltılır (graf dışına alınır); daraltılan istasyon v'nin
+# iki komşusu u ve w arasındaki en kısa yol v'den geçiyorsa, yerine u-w kısayolu (süresi u-v + v-w) eklenir.
+# Sorguda iki taraftan yalnızca "yukarı" (daha önemli istasyonlara giden) kenarlar izlenir; aranan istasyon sayısı
+# ağ büyüdükçe çok yavaş artar. Kısayollar orta istasyon üzerinden özyinelemeli olarak açılıp gerçek rotaya çevrilir.
+
+class DaraltmaHiyerarsisi:
+    TANIK_LIMITI = 64  # tanık (witness) aramasında kesinleşecek en fazla istasyon sayısı
+
+    __slots__ = ("sira", "ofsetler", "hedefler", "agirliklar", "_orta")
+
+    def __init__(self, sira, ofsetler, hedefler, agirliklar, orta: Dict[int, int]):
+        self.sira = sira  # istasyon -> daraltma sırası (büyük = daha önemli)
+        self.ofsetler = ofsetler  # yukarı graf (CSR): her istasyondan daha önemli istasyonlara kenarlar
+        self.hedefler = hedefler
+        self.agirliklar = agirliklar
+        self._orta = orta  # (a * n + b) -> kısayolun orta istasyonu, gerçek bağlantılar için -1
+
+    @classmethod
+    def olustur(cls, donuk: KompaktMetroAgi) -> 'DaraltmaHiyerarsisi':
+        n = len(donuk)
+        # Değişken komşuluk: komsular[v][u] = süre (paralel bağlantılardan en kısası)
+        komsular: List[Dict[int, float]] = [{} for _ in range(n)]
+        orta: Dict[int, int] = {}
+        for v in range(n):
+            for u, sure in donuk.komsular(v):
+                if u != v and (u not in komsular[v] or sure < komsular[v][u]):
+                    komsular[v][u] = sure
+                    orta[v * n + u] = orta[u * n + v] = -1
+
+        def tanik_mesafeleri(u: int, haric: int, hedef_kumesi: Set[int], ust_sinir) -> Dict[int, float]:
+            # u'dan haric istasyonu kullanmadan, ust_sinir süresine kadar sınırlı Dijkstra
+            mesafe = {u: 0}
+            yigin = [(0, u)]
+            kesinlesen = 0
+            kalan = len(hedef_kumesi)
+            while yigin and kalan and kesinlesen < cls.TANIK_LIMITI:
+                d, x = heapq.heappop(yigin)
+                if d > mesafe[x]:
+                    continue
+                if d > ust_sinir:
+                    break
+                kesinlesen += 1
+                if x in hedef_kumesi:
+                    kalan -= 1
+                for y, sure in komsular[x].items():
+                    if y == haric:
+                        continue
+                    yeni = d + sure
+                    if yeni < mesafe.get(y, SONSUZ):
+                        mesafe[y] = yeni
+                        heapq.heappush(yigin, (yeni, y))
+            return mesafe
+
+        def kisayollar(v: int) -> List[Tuple[int, int, float]]:
+            # v daraltılırsa eklenmesi gereken (u, w, süre) kısayolları
+            komsu_listesi = list(komsular[v].items())
+            sonuc = []
+            for i, (u, sure_u) in enumerate(komsu_listesi):
+                digerleri = komsu_listesi[i + 1:]
+                if not digerleri:
+                    break
+                en_uzun = max(sure_w for _, sure_w in digerleri)
+                mesafe = tanik_mesafeleri(u, v, {w for w, _ in digerleri}, sure_u + en_uzun)
+                for w, sure_w in digerleri:
+                    if mesafe.get(w, SONSUZ) > sure_u + sure_w:
+                        sonuc.append((u, w, sure_u + sure_w))
+            return sonuc
+
+        daraltilmis_komsu = [0] * n
+
+        def oncelik(v: int) -> int:
+            # Kenar farkı (eklenecek kısayol - silinecek kenar) + daraltılmış komşu sayısı
+            return len(kisayollar(v)) - len(komsular[v]) + daraltilmis_komsu[v]
+
+        yigin = [(oncelik(v), v) for v in range(n)]
+        heapq.heapify(yigin)
+        sira = array('i', [0]) * n
+        yukari: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+        sonraki_sira = 0
+
+        while yigin:
+            _, v = heapq.heappop(yigin)
+            # Tembel güncelleme: önceliği yeniden hesaplanır, artık en küçük değilse kuyruğa geri konur
+            yeni_oncelik = oncelik(v)
+            if yigin and yeni_oncelik > yigin[0][0]:
+                heapq.heappush(yigin, (yeni_oncelik, v))
+                continue
+
+            sira[v] = sonraki_sira
+            sonraki_sira += 1
+            for u, w, sure in kisayollar(v):
+                if sure < komsular[u].get(w, SONSUZ):
+                    komsular[u][w] = komsular[w][u] = sure
+                    orta[u * n + w] = orta[w * n + u] = v
+
+            # v'nin kalan komşuları ondan daha önemlidir: bu kenarlar yukarı grafa girer
+            for u, sure in komsular[v].items():
+                yukari[v].append((u, sure))
+                del komsular[u][v]
+                daraltilmis_komsu[u] += 1
+            komsular[v] = {}
+
+        ofsetler = array('i', [0])
+        hedefler = array('i')
+        agirliklar = []
+        for v in range(n):
+            for u, sure in yukari[v]:
+                hedefler.append(u)
+                agirliklar.append(sure)
+            ofsetler.append(len(hedefler))
+        tip = 'i' if all(type(sure) is int for sure in agirliklar) else 'd'
+        return cls(sira, ofsetler, hedefler, array(tip, agirliklar), orta)
+
+    def _ac(self, a: int, b: int, yol: List[int]) -> None:
+        # a-b kenarını (kısayolsa özyinelemeli olarak) açar; a hariç istasyonları yol'a ekler
+        n = len(self.sira)
+        yigin = [(a, b)]
+        while yigin:
+            x, y = yigin.pop()
+            m = self._orta[x * n + y]
+            if m == -1:
+                yol.append(y)
+            else:
+                yigin.append((m, y))
+                yigin.append((x, m))
+
+    # Yukarı graf üzerinde çift yönlü Dijkstra; bir tarafın en küçük anahtarı bulunan en iyi süreyi aşınca o taraf durur
+    def en_kisa_sure(self, baslangic: int, hedef: int,
+                     istatistik: Optional[AramaIstatistikleri] = None) -> Optional[Tuple[List[int], int]]:
+        if baslangic == hedef:
+            return [baslangic], 0
+
+        ofsetler, hedefler, agirliklar = self.ofsetler, self.hedefler, self.agirliklar
+        mesafe = ({baslangic: 0}, {hedef: 0})
+        onceki = ({baslangic: -1}, {hedef: -1})
+        yiginlar = ([(0, baslangic)], [(0, hedef)])
+        heappush, heappop = heapq.heappush, heapq.heappop
+        if istatistik is not None:
+            heappush, heappop = istatistik.sayaclar(
+                lambda yigin, kayit: kayit[0] > mesafe[yigin is yiginlar[1]][kayit[1]], *yiginlar)
+        en_iyi, bulusma = SONSUZ, -1
+
+        while yiginlar[0] or yiginlar[1]:
+            if not yiginlar[1] or (yiginlar[0] and yiginlar[0][0][0] <= yiginlar[1][0][0]):
+                yon = 0
+            else:
+                yon = 1
+            yigin, bu_mesafe, bu_onceki, diger_mesafe = yiginlar[yon], mesafe[yon], onceki[yon], mesafe[1 - yon]
+            if yigin[0][0] >= en_iyi:
+                yigin.clear()  # bu taraftan daha iyi bir buluşma çıkamaz
+                continue
+
+            d, v = heappop(yigin)
+            if d > bu_mesafe[v]:
+                continue
+            if v in diger_mesafe and d + diger_mesafe[v] < en_iyi:
+                en_iyi, bulusma = d + diger_mesafe[v], v
+
+            for j in range(ofsetler[v], ofsetler[v + 1]):
+                u = hedefler[j]
+                yeni = d + agirliklar[j]
+                if yeni < bu_mesafe.get(u, SONSUZ):
+                    bu_mesafe[u] = yeni
+                    bu_onceki[u] = v
+                    heappush(yigin, (yeni, u))
+
+        if bulusma == -1:
+            return None
+
+        # Yukarı yolları birleştir: baslangic ... bulusma ... hedef, sonra kısayolları aç
+        ust_yol = [bulusma]
+        while onceki[0][ust_yol[-1]] != -1:
+            ust_yol.append(onceki[0][ust_yol[-1]])
+        ust_yol.reverse()
+        x = bulusma
+        while onceki[1][x] != -1:
+            x = onceki[1][x]
+            ust_yol.append(x)
+
+        yol = [baslangic]
+        for a, b in zip(ust_yol, ust_yol[1:]):
+            self._ac(a, b, yol)
+        return yol, en_iyi
+
+# Yolcu akışı (başlangıç-hedef talep matrisinin ağa atanması):
+# Talep kayıtları başlangıç istasyonuna göre tek geçişte gruplanır (başlangıç -> {hedef: yolcu}), böylece her
+# başlangıcın hedefleri tüm ağ taranmadan bilinir. Her başlangıç için tek bir Dijkstra ağacı kurulur ve o başlangıçtan çıkan bütün yolculuklar ağaç üzerinde birlikte atanır: kesinleşme sırasının
+# tersinde her istasyonun talebi öncülüne eklenir, böylece ağaçtaki (öncül, istasyon) bağlantısının yükü o istasyonun
+# alt ağacındaki toplam talep olur. Yük, Dijkstra'nın kaydettiği öncül bağlantı kimliğine doğrudan eklenir (paralel
+# bağlantılar arasında arama yapılmaz). Atama maliyeti yolcu sayısından bağımsızdır (başlangıç başına bir arama).
+# Yükler yönlüdür; farklı hatlardaki iki istasyon arasındaki bağlantılar aktarma olarak raporlanır.
+
+class YolcuAkisi:
+    __slots__ = ("donuk", "yukler", "toplam_yolcu", "ulasilamayan")
+
+    def __init__(self, donuk: KompaktMetroAgi, yukler, toplam_yolcu: float, ulasilamayan: float):
+        self.donuk = donuk
+        self.yukler = yukler  # bağlantı indeksi (donuk.hedefler ile aynı sıra) -> o bağlantıdan geçen yolcu
+        self.toplam_yolcu = toplam_yolcu  # ağa atanan yolcu
+        self.ulasilamayan = ulasilamayan  # hedefine rota bulunamayan yolcu
+
+    @classmethod
+    def hesapla(cls, donuk: KompaktMetroAgi, talep: Iterable[Tuple[int, int, float]]) -> 'YolcuAkisi':
+        n = len(donuk)
+        talepler: Dict[int, Dict[int, float]] = defaultdict(lambda: defaultdict(float))  # başlangıç -> hedef -> yolcu
+        for baslangic, hedef, yolcu in talep:
+            if baslangic != hedef:  # aynı istasyonda başlayıp biten yolculuk ağa yük getirmez
+                talepler[baslangic][hedef] += yolcu
+
+        yukler = array('d', [0.0]) * len(donuk.hedefler)
+        bos = array('d', [0.0]) * n
+        onceki_baglanti = array('i', [-1]) * n
+        toplam = ulasilamayan = 0.0
+        for baslangic, hedefler in talepler.items():
+            hedefler = {hedef: yolcu for hedef, yolcu in hedefler.items() if yolcu}
+            if not hedefler:
+                continue
+            mesafe, onceki, sira = donuk.tek_kaynak(baslangic, set(hedefler), onceki_baglanti)
+            akis = array('d', bos)  # istasyon -> alt ağacındaki toplam talep
+            for hedef, yolcu in hedefler.items():
+                if mesafe[hedef] == SONSUZ:
+                    ulasilamayan += yolcu
+                else:
+                    toplam += yolcu
+                    akis[hedef] = yolcu
+
+            # Ağaçtaki bağlantı, Dijkstra'nın istasyona son ulaştığı bağlantının kimliğiyle doğrudan bulunur
+            for istasyon in reversed(sira[1:]):
+                yolcu = akis[istasyon]
+                if yolcu:
+                    akis[onceki[istasyon]] += yolcu
+                    yukler[onceki_baglanti[istasyon]] += yolcu
+
+        return cls(donuk, yukler, toplam, ulasilamayan)
+
+    def _baglantilar(self, aktarma: bool):
+        # (kod1, kod2, yolcu) üreteci; aktarma=True ise yalnızca farklı hatlar arası, değilse hat içi bağlantılar
+        donuk, yukler = self.donuk, self.yukler
+        hatlar = donuk.istasyon_hatlari
+        for a in range(len(donuk)):
+            for j in range(donuk.ofsetler[a], donuk.ofsetler[a + 1]):
+                b = donuk.hedefler[j]
+                if yukler[j] and (hatlar[a] != hatlar[b]) == aktarma:
+                    yield donuk.kodlar[a], donuk.kodlar[b], yukler[j]
+
+    # En kalabalık hat içi bağlantılar: [(kod1, kod2, yolcu), ...] (yönlü, azalan yolcu sırasıyla)
+    def en_yogun_baglantilar(self, adet: int = 10) -> List[Tuple[str, str, float]]:
+        return heapq.nlargest(adet, self._baglantilar(False), key=lambda kayit: kayit[2])
+
+    # En kalabalık aktarmalar (hatlar arası geçişler): [(kod1, kod2, yolcu), ...]
+    def en_yogun_aktarmalar(self, adet: int = 10) -> List[Tuple[str, str, float]]:
+        return heapq.nlargest(adet, self._baglantilar(True), key=lambda kayit: kayit[2])
+
+    # Hat başına yük: {hat adı: {"en_yogun": bağlantı başına en yüksek yolcu, "yolcu_dakika": toplam yolcu x süre}}
+    def hat_yukleri(self) -> Dict[str, Dict[str, float]]:
+        donuk, yukler = self.donuk, self.yukler
+        hatlar = donuk.istasyon_hatlari
+        sonuc = {hat: {"en_yogun": 0.0, "yolcu_dakika": 0.0} for hat in donuk.hat_adlari}
+        for a in range(len(donuk)):
+            for j in range(donuk.ofsetler[a], donuk.ofsetler[a + 1]):
+                if yukler[j] and hatlar[a] == hatlar[donuk.hedefler[j]]:
+                    hat = sonuc[donuk.hat_adlari[hatlar[a]]]
+                    hat["en_yogun"] = max(hat["en_yogun"], yukler[j])
+                    hat["yolcu_dakika"] += yukler[j] * donuk.agirliklar[j]
+        return sonuc
+
+
+# Tarife (zaman çizelgesi) katmanı:
+# Sabit geçiş süreleri yerine seferlerin kalkış / varış saatleriyle çalışır; bekleme süreleri ve sefer aralıkları
+# hesaba katılır. Saatler gün başından itibaren saniye olarak tutulur, "SS:DD" ya da "SS:DD:ss" metinleri de kabul
+# edilir (24:00'ı geçen saatler ertesi güne taşan seferlerdir). Süre parametreleri ağın geri kalanı gibi dakikadır.
+# - en_erken_varis: Connection Scan (CSA); tüm sefer bağlantıları kalkış saatine göre sıralı düz dizilerde tutulur,
+#   sorgu kalkış saatinden başlayıp diziyi tek geçişte tarar.
+# - raptor: tur tabanlı RAPTOR; k. turda en fazla k sefer kullanılır, böylece aktarma sayısı sınırlanır ve her aktarma
+#   sayısı için en erken varış (Pareto kümesi) bulunur. Her rota için durak sırası ve durak saatleri düz dizilerdedir.
+# Yürüme aktarmaları derlenirken geçişli olarak kapatılır (iki algoritma da bunu varsayar): A-B ve B-C yürüme
+# aktarmaları varsa A-C de tek bir aktarma olarak eklenir.
+
+class Tarife:
+    VARSAYILAN_ARALIK = 5  # dakika; hatlardan() içinde aralığı verilmeyen hatlar için
+    __slots__ = ("kodlar", "kod_indeksi", "_seferler", "_yuruyusler", "_derlendi",
+                 "rota_hatlari", "rota_durak_ofsetleri", "rota_duraklari", "rota_zaman_ofsetleri", "rota_sefer_sayilari",
+                 "rota_sefer_tabanlari", "varislar", "kalkislar", "durak_rota_ofsetleri", "durak_rotalari",
+                 "durak_rota_siralari", "yuruyus_ofsetleri", "yuruyus_hedefleri", "yuruyus_sureleri",
+                 "b_kalkis_duragi", "b_varis_duragi", "b_kalkis", "b_varis", "b_sefer", "sefer_rotalari")
+
+    def __init__(self, kodlar: Sequence[str], kod_indeksi: Optional[Mapping] = None):
+        self.kodlar = kodlar  # durak kimliği -> istasyon kodu
+        if kod_indeksi is None:
+            kod_indeksi = {kod: i for i, kod in enumerate(kodlar)}
+        self.kod_indeksi = kod_indeksi
+        # (hat adı, durak kimlikleri) -> [(varış saatleri, kalkış saatleri), ...]; aynı durak dizisi bir rotadır
+        self._seferler: Dict[Tuple[str, Tuple[int, ...]], List[Tuple[List[int], List[int]]]] = defaultdict(list)
+        self._yuruyusler: Dict[Tuple[int, int], int] = {}  # (durak1, durak2) -> saniye
+        self._derlendi = False
+
+    @staticmethod
+    def _saniye(zaman) -> int:
+        if isinstance(zaman, str):
+            parcalar = [int(parca) for parca in zaman.strip().split(":")]
+            return parcalar[0] * 3600 + parcalar[1] * 60 + (parcalar[2] if len(parcalar) > 2 else 0)
+        return int(zaman)
+
+    @staticmethod
+    def saat(saniye: int) -> str:
+        # Saniyeyi "SS:DD" metnine çevirir
+        return f"{saniye // 3600:02d}:{saniye % 3600 // 60:02d}"
+
+    # Bir sefer ekler: duraklar (istasyon kodu, varış, kalkış) üçlülerinden oluşur, sefer sırasıyla verilir.
+    # Aynı hattın aynı durak dizisini izleyen seferleri birbirini sollamamalıdır (RAPTOR rotaları FIFO varsayar).
+    def sefer_ekle(self, hat_adi: str, duraklar: Iterable[Tuple[str, object, object]]) -> None:
+        kimlikler, varislar, kalkislar = [], [], []
+        for kod, varis, kalkis in duraklar:
+            kimlikler.append(self.kod_indeksi[kod])
+            varislar.append(self._saniye(varis))
+            kalkislar.append(self._saniye(kalkis))
+        if len(kimlikler) < 2:
+            raise ValueError("bir sefer en az iki duraktan oluşmalı")
+        self._seferler[hat_adi, tuple(kimlikler)].append((varislar, kalkislar))
+        self._derlendi = False
+
+    def yuruyus_ekle(self, istasyon1_kodu, istasyon2_kodu, dakika) -> None:
+        # İki durak arasında çift yönlü yürüme aktarması
+        durak1, durak2 = self.kod_indeksi[istasyon1_kodu], self.kod_indeksi[istasyon2_kodu]
+        saniye = round(dakika * 60)
+        for anahtar in ((durak1, durak2), (durak2, durak1)):
+            if saniye < self._yuruyusler.get(anahtar, SONSUZ):
+                self._yuruyusler[anahtar] = saniye
+        self._derlendi = False
+
+    # Ağın hatlarından düzenli aralıklı tarife üretir. Her hattın kendi içindeki bağlantıları basit yollara ayrılır
+    # (dallanan hatlarda her dal ayrı bir rota olur), her yol için iki yönde ilk_sefer'den son_sefer'e kadar
+    # aralik dakikada bir sefer konur. aralik bir sayı ya da {hat adı: dakika} sözlüğü olabilir; sıfır ya da negatif
+    # (saniyeye yuvarlanınca sıfır olan) aralık ValueError verir.
+    # Farklı hatlardaki istasyonlar arasındaki bağlantılar yürüme aktarması olur.
+    @classmethod
+    def hatlardan(cls, metro: 'MetroAgi', ilk_sefer="06:00", son_sefer="24:00", aralik=5,
+                  durak_bekleme=0) -> 'Tarife':
+        donuk = metro.dondur()
+        tarife = cls(donuk.kodlar, donuk.kod_indeksi)
+        ilk, son, bekleme = cls._saniye(ilk_sefer), cls._saniye(son_sefer), round(durak_bekleme * 60)
+        for hat_araligi in (aralik.values() if isinstance(aralik, dict) else (aralik,)):
+            if round(hat_araligi * 60) <= 0:
+                raise ValueError(f"sefer aralığı pozitif olmalı: {hat_araligi}")
+        ofsetler, hedefler, agirliklar, hatlar = donuk.ofsetler, donuk.hedefler, donuk.agirliklar, donuk.istasyon_hatlari
+
+        hat_komsulari: List[Dict[int, Dict[int, float]]] = [defaultdict(dict) for _ in donuk.hat_adlari]
+        for i in range(len(donuk)):
+            for j in range(ofsetler[i], ofsetler[i + 1]):
+                komsu, sure = hedefler[j], agirliklar[j]
+                if komsu == i:
+                    continue
+                if hatlar[komsu] == hatlar[i]:
+                    komsular = hat_komsulari[hatlar[i]][i]
+                    komsular[komsu] = min(sure, komsular.get(komsu, SONSUZ))
+                elif round(sure * 60) < tarife._yuruyusler.get((i, komsu), SONSUZ):
+                    tarife._yuruyusler[i, komsu] = round(sure * 60)
+
+        for hat, komsular in enumerate(hat_komsulari):
+            hat_adi = donuk.hat_adlari[hat]
+            hat_araligi = round((aralik.get(hat_adi, cls.VARSAYILAN_ARALIK) if isinstance(aralik, dict) else aralik) * 60)
+            for yol in cls._basit_yollar(komsular):
+                for duraklar in (yol, yol[::-1]):
+                    sureler = [round(komsular[a][b] * 60) for a, b in zip(duraklar, duraklar[1:])]
+                    kalkis = ilk
+                    while kalkis <= son:
+                        varislar, kalkislar = [kalkis], [kalkis]
+                        for sure in sureler:
+                            varislar.append(kalkislar[-1] + sure)
+                            kalkislar.append(varislar[-1] + bekleme)
+                        tarife._seferler[hat_adi, tuple(duraklar)].append((varislar, kalkislar))
+                        kalkis += hat_araligi
+        return tarife
+
+    @staticmethod
+    def _basit_yollar(komsular: Dict[int, Dict[int, float]]) -> List[List[int]]:
+        # Hattın bağlantılarını kenar ayrık basit yollara böler; yollar önce uç (tek komşulu) istasyonlardan başlar
+        kullanilan: Set[Tuple[int, int]] = set()
+        yollar = []
+        for baslangic in sorted(komsular, key=lambda istasyon: (len(komsular[istasyon]) != 1, istasyon)):
+            while True:
+                yol = [baslangic]
+                while True:
+                    sonraki = next((komsu for komsu in komsular[yol[-1]]
+                                    if (min(yol[-1], komsu), max(yol[-1], komsu)) not in kullanilan), None)
+                    if sonraki is None:
+                        break
+                    kullanilan.add((min(yol[-1], sonraki), max(yol[-1], sonraki)))
+                    yol.append(sonraki)
+                if len(yol) < 2:
+                    break
+                yollar.append(yol)
+        return yollar
+
+    def derle(self) -> None:
+        # Seferleri sorgu dizilerine çevirir (sorgular gerekirse kendisi çağırır)
+        n = len(self.kodlar)
+        self.rota_hatlari: List[str] = []
+        self.rota_durak_ofsetleri = array('i', [0])
+        self.rota_duraklari = array('i')
+        self.rota_zaman_ofsetleri = array('i', [0])  # rota r'nin s. seferinin i. durağı: ofset + s * durak sayısı + i
+        self.rota_sefer_sayilari = array('i')
+        self.rota_sefer_tabanlari = array('i')  # rotanın ilk seferinin genel sefer kimliği
+        self.varislar = array('i')
+        self.kalkislar = array('i')
+        self.sefer_rotalari = array('i')  # genel sefer kimliği -> rota
+        durak_rotalari: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        baglantilar = []
+
+        for (hat_adi, duraklar), seferler in self._seferler.items():
+            rota = len(self.rota_hatlari)
+            self.rota_hatlari.append(hat_adi)
+            self.rota_duraklari.extend(duraklar)
+            self.rota_durak_ofsetleri.append(len(self.rota_duraklari))
+            for sira, durak in enumerate(duraklar):
+                durak_rotalari[durak].append((rota, sira))
+
+            self.rota_sefer_tabanlari.append(len(self.sefer_rotalari))
+            self.rota_sefer_sayilari.append(len(seferler))
+            for varislar, kalkislar in sorted(seferler, key=lambda sefer: sefer[1][0]):
+                sefer = len(self.sefer_rotalari)
+                self.sefer_rotalari.append(rota)
+                self.varislar.extend(varislar)
+                self.kalkislar.extend(kalkislar)
+                for i in range(len(duraklar) - 1):
+                    baglantilar.append((kalkislar[i], varislar[i + 1], duraklar[i], duraklar[i + 1], sefer))
+            self.rota_zaman_ofsetleri.append(len(self.varislar))
+
+        self.durak_rota_ofsetleri = array('i', [0])
+        self.durak_rotalari = array('i')
+        self.durak_rota_siralari = array('i')
+        for rotalar in durak_rotalari:
+            for rota, sira in rotalar:
+                self.durak_rotalari.append(rota)
+                self.durak_rota_siralari.append(sira)
+            self.durak_rota_ofsetleri.append(len(self.durak_rotalari))
+
+        yuruyus_listesi = self._yuruyus_kapanisi(n)
+        self.yuruyus_ofsetleri = array('i', [0])
+        self.yuruyus_hedefleri = array('i')
+        self.yuruyus_sureleri = array('i')
+        for yuruyusler in yuruyus_listesi:
+            for durak, saniye in yuruyusler:
+                self.yuruyus_hedefleri.append(durak)
+                self.yuruyus_sureleri.append(saniye)
+            self.yuruyus_ofsetleri.append(len(self.yuruyus_hedefleri))
+
+        # CSA dizileri: bağlantılar kalkış (eşitlikte varış) saatine göre sıralı
+        baglantilar.sort()
+        self.b_kalkis = array('i', (baglanti[0] for baglanti in baglantilar))
+        self.b_varis = array('i', (baglanti[1] for baglanti in baglantilar))
+        self.b_kalkis_duragi = array('i', (baglanti[2] for baglanti in baglantilar))
+        self.b_varis_duragi = array('i', (baglanti[3] for baglanti in baglantilar))
+        self.b_sefer = array('i', (baglanti[4] for baglanti in baglantilar))
+        self._derlendi = True
+
+    def _yuruyus_kapanisi(self, n: int) -> List[List[Tuple[int, int]]]:
+        # Her duraktan yürüme grafında Dijkstra: durak -> [(yürüyerek ulaşılan durak, saniye), ...]
+        komsular: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for (durak1, durak2), saniye in self._yuruyusler.items():
+            komsular[durak1].append((durak2, saniye))
+
+        kapanis: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        for kaynak in komsular:
+            mesafe = {kaynak: 0}
+            yigin = [(0, kaynak)]
+            while yigin:
+                sure, durak = heapq.heappop(yigin)
+                if sure > mesafe[durak]:
+                    continue
+                if durak != kaynak:
+                    kapanis[kaynak].append((durak, sure))
+                for komsu, saniye in komsular.get(durak, ()):
+                    if sure + saniye < mesafe.get(komsu, SONSUZ):
+                        mesafe[komsu] = sure + saniye
+                        heapq.heappush(yigin, (sure + saniye, komsu))
+        return kapanis
+
+    def _yuruyus_suresi(self, durak1: int, durak2: int) -> int:
+        for j in range(self.yuruyus_ofsetleri[durak1], self.yuruyus_ofsetleri[durak1 + 1]):
+            if self.yuruyus_hedefleri[j] == durak2:
+                return self.yuruyus_sureleri[j]
+        raise KeyError((durak1, durak2))
+
+    # Connection Scan: kalkis saatinde baslangic'tan çıkan yolcunun hedefe en erken varışı.
+    # (varış saati, bacaklar) döndürür; her bacak (hat adı ya da yürüme için None, biniş istasyonu, biniş saati,
+    # iniş istasyonu, iniş saati) biçimindedir.
+    def en_erken_varis(self, baslangic_kodu, hedef_kodu, kalkis) -> Optional[Tuple[int, List[Tuple]]]:
+        if not self._derlendi:
+            self.derle()
+        baslangic, hedef = self.kod_indeksi[baslangic_kodu], self.kod_indeksi[hedef_kodu]
+        b_kalkis, b_varis, b_kalkis_duragi, b_varis_duragi, b_sefer = (
+            self.b_kalkis, self.b_varis, self.b_kalkis_duragi, self.b_varis_duragi, self.b_sefer)
+        yuruyus_ofsetleri, yuruyus_hedefleri, yuruyus_sureleri = (
+            self.yuruyus_ofsetleri, self.yuruyus_hedefleri, self.yuruyus_sureleri)
+
+        n = len(self.kodlar)
+        varis = [SONSUZ] * n
+        gelis = array('i', [-1]) * n  # >= 0: duraka getiren bağlantı, <= -2: -(yürünen durak + 2)
+        binis = array('i', [-1]) * len(self.sefer_rotalari)  # sefer -> binilen bağlantı
+        varis[baslangic] = self._saniye(kalkis)
+        for j in range(yuruyus_ofsetleri[baslangic], yuruyus_ofsetleri[baslangic + 1]):
+            durak = yuruyus_hedefleri[j]
+            if varis[baslangic] + yuruyus_sureleri[j] < varis[durak]:
+                varis[durak] = varis[baslangic] + yuruyus_sureleri[j]
+                gelis[durak] = -(baslangic + 2)
+
+        for c in range(bisect_left(b_kalkis, varis[baslangic]), len(b_kalkis)):
+            kalkis_saati = b_kalkis[c]
+            if kalkis_saati >= varis[hedef]:
+                break  # bundan sonraki bağlantılar daha erken varış sağlayamaz
+            sefer = b_sefer[c]
+            if binis[sefer] == -1:
+                if varis[b_kalkis_duragi[c]] > kalkis_saati:
+                    continue  # bu sefere henüz binilemiyor
+                binis[sefer] = c
+
+            durak, varis_saati = b_varis_duragi[c], b_varis[c]
+            if varis_saati < varis[durak]:
+                varis[durak] = varis_saati
+                gelis[durak] = c
+                for j in range(yuruyus_ofsetleri[durak], yuruyus_ofsetleri[durak + 1]):
+                    komsu = yuruyus_hedefleri[j]
+                    if varis_saati + yuruyus_sureleri[j] < varis[komsu]:
+                        varis[komsu] = varis_saati + yuruyus_sureleri[j]
+                        gelis[komsu] = -(durak + 2)
+
+        if varis[hedef] == SONSUZ:
+            return None
+
+        kodlar = self.kodlar
+        bacaklar = []
+        durak = hedef
+        while durak != baslangic:
+            c = gelis[durak]
+            if c <= -2:
+                onceki = -c - 2
+                bacaklar.append((None, kodlar[onceki], varis[durak] - self._yuruyus_suresi(onceki, durak),
+                                 kodlar[durak], varis[durak]))
+                durak = onceki
+            else:
+                ilk = binis[b_sefer[c]]
+                bacaklar.append((self.rota_hatlari[self.sefer_rotalari[b_sefer[c]]], kodlar[b_kalkis_duragi[ilk]],
+                                 b_kalkis[ilk], kodlar[durak], b_varis[c]))
+                durak = b_kalkis_duragi[ilk]
+        bacaklar.reverse()
+        return varis[hedef], bacaklar
+
+    # RAPTOR: en fazla en_fazla_aktarma aktarmalı yolculuklar arasında, her aktarma sayısı için en erken varış.
+    # [(aktarma sayısı, varış saati, bacaklar), ...] döndürür; liste aktarma sayısına göre artan, varışa göre azalan
+    # Pareto kümesidir (daha fazla aktarma yalnızca daha erken varıyorsa listede yer alır). Başlangıç hedefle aynıysa
+    # en_erken_varis gibi kalkış anında bacaksız varılır: [(0, kalkış, [])].
+    def raptor(self, baslangic_kodu, hedef_kodu, kalkis, en_fazla_aktarma: int = 3) -> List[Tuple[int, int, List[Tuple]]]:
+        if not self._derlendi:
+            self.derle()
+        baslangic, hedef = self.kod_indeksi[baslangic_kodu], self.kod_indeksi[hedef_kodu]
+        if baslangic == hedef:
+            return [(0, self._saniye(kalkis), [])]
+        rota_durak_ofsetleri, rota_duraklari = self.rota_durak_ofsetleri, self.rota_duraklari
+        rota_zaman_ofsetleri, rota_sefer_sayilari = self.rota_zaman_ofsetleri, self.rota_sefer_sayilari
+        varislar, kalkislar = self.varislar, self.kalkislar
+        durak_rota_ofsetleri, durak_rotalari, durak_rota_siralari = (
+            self.durak_rota_ofsetleri, self.durak_rotalari, self.durak_rota_siralari)
+        yuruyus_ofsetleri, yuruyus_hedefleri, yuruyus_sureleri = (
+            self.yuruyus_ofsetleri, self.yuruyus_hedefleri, self.yuruyus_sureleri)
+
+        n = len(self.kodlar)
+        en_iyi = [SONSUZ] * n  # herhangi bir turdaki en erken varış
+        onceki_tur = [SONSUZ] * n  # bir önceki turun varışları
+        ebeveynler: List[Dict[int, Tuple]] = [{}]  # tur -> durak -> ("sefer", rota, sefer, biniş sırası) / ("yuruyus", durak)
+        onceki_tur[baslangic] = en_iyi[baslangic] = self._saniye(kalkis)
+        isaretli = {baslangic}
+        for j in range(yuruyus_ofsetleri[baslangic], yuruyus_ofsetleri[baslangic + 1]):
+            durak = yuruyus_hedefleri[j]
+            if onceki_tur[baslangic] + yuruyus_sureleri[j] < onceki_tur[durak]:
+                onceki_tur[durak] = en_iyi[durak] = onceki_tur[baslangic] + yuruyus_sureleri[j]
+                ebeveynler[0][durak] = ("yuruyus", baslangic)
+                isaretli.add(durak)
+
+        sonuclar = []
+        if hedef in ebeveynler[0]:
+            # Yalnızca yürüyerek ulaşılabiliyor (aktarmasız sayılır)
+            sonuclar.append((0, onceki_tur[hedef],
+                             self._raptor_bacaklari(ebeveynler, 0, baslangic, hedef, en_iyi[baslangic])))
+        for tur in range(1, en_fazla_aktarma + 2):
+            bu_tur = list(onceki_tur)
+            ebeveyn: Dict[int, Tuple] = {}
+            ebeveynler.append(ebeveyn)
+
+            # İşaretli duraklardan geçen rotalar, rotadaki en erken işaretli duraktan itibaren taranır
+            taranacak: Dict[int, int] = {}
+            for durak in isaretli:
+                for j in range(durak_rota_ofsetleri[durak], durak_rota_ofsetleri[durak + 1]):
+                    rota, sira = durak_rotalari[j], durak_rota_siralari[j]
+                    if sira < taranacak.get(rota, len(rota_duraklari)):
+                        taranacak[rota] = sira
+            isaretli = set()
+
+            for rota, ilk_sira in taranacak.items():
+                duraklar_basi = rota_durak_ofsetleri[rota]
+                durak_sayisi = rota_durak_ofsetleri[rota + 1] - duraklar_basi
+                zaman_basi, sefer_sayisi = rota_zaman_ofsetleri[rota], rota_sefer_sayilari[rota]
+                sefer, binis_sirasi = -1, -1
+                for sira in range(ilk_sira, durak_sayisi):
+                    durak = rota_duraklari[duraklar_basi + sira]
+                    if sefer != -1:
+                        varis_saati = varislar[zaman_basi + sefer * durak_sayisi + sira]
+                        if varis_saati < en_iyi[durak] and varis_saati < en_iyi[hedef]:
+                            bu_tur[durak] = en_iyi[durak] = varis_saati
+                            ebeveyn[durak] = ("sefer", rota, sefer, binis_sirasi)
+                            isaretli.add(durak)
+
+                    # Önceki turda bu durağa daha erken varıldıysa daha erken bir sefere binilebilir
+                    hazir = onceki_tur[durak]
+                    if hazir < SONSUZ and (sefer == -1 or hazir <= kalkislar[zaman_basi + sefer * durak_sayisi + sira]):
+                        alt, ust = 0, sefer_sayisi if sefer == -1 else sefer
+                        while alt < ust:
+                            orta = (alt + ust) // 2
+                            if kalkislar[zaman_basi + orta * durak_sayisi + sira] < hazir:
+                                alt = orta + 1
+                            else:
+                                ust = orta
+                        if alt < (sefer_sayisi if sefer == -1 else sefer):
+                            sefer, binis_sirasi = alt, sira
+
+            # Bu turda varılan duraklardan yürüme aktarmaları
+            for durak in list(isaretli):
+                for j in range(yuruyus_ofsetleri[durak], yuruyus_ofsetleri[durak + 1]):
+                    komsu = yuruyus_hedefleri[j]
+                    varis_saati = bu_tur[durak] + yuruyus_sureleri[j]
+                    if varis_saati < en_iyi[komsu] and varis_saati < en_iyi[hedef]:
+                        bu_tur[komsu] = en_iyi[komsu] = varis_saati
+                        ebeveyn[komsu] = ("yuruyus", durak)
+                        isaretli.add(komsu)
+
+            if hedef in ebeveyn:
+                if sonuclar and sonuclar[-1][0] == tur - 1:
+                    sonuclar.pop()  # tek seferli yolculuk yürüyüşten erken varıyor
+                sonuclar.append((tur - 1, bu_tur[hedef],
+                                 self._raptor_bacaklari(ebeveynler, tur, baslangic, hedef, en_iyi[baslangic])))
+            if not isaretli:
+                break
+            onceki_tur = bu_tur
+        return sonuclar
+
+    def _raptor_bacaklari(self, ebeveynler: List[Dict[int, Tuple]], tur: int, baslangic: int, hedef: int,
+                          kalkis: int) -> List[Tuple]:
+        kodlar = self.kodlar
+        bacaklar = []
+        durak = hedef
+        while durak != baslangic:
+            # Durağın değeri en son hangi turda güncellendiyse o turun ebeveyni kullanılır
+            while durak not in ebeveynler[tur]:
+                tur -= 1
+            ebeveyn = ebeveynler[tur][durak]
+            if ebeveyn[0] == "yuruyus":
+                onceki = ebeveyn[1]
+                sure = self._yuruyus_suresi(onceki, durak)
+                bacaklar.append((None, kodlar[onceki], None, kodlar[durak], sure))
+                durak = onceki
+            else:
+                _, rota, sefer, binis_sirasi = ebeveyn
+                duraklar_basi = self.rota_durak_ofsetleri[rota]
+                durak_sayisi = self.rota_durak_ofsetleri[rota + 1] - duraklar_basi
+                taban = self.rota_zaman_ofsetleri[rota] + sefer * durak_sayisi
+                inis_sirasi = next(sira for sira in range(binis_sirasi, durak_sayisi)
+                                   if self.rota_duraklari[duraklar_basi + sira] == durak)
+                onceki = self.rota_duraklari[duraklar_basi + binis_sirasi]
+                bacaklar.append((self.rota_hatlari[rota], kodlar[onceki], self.kalkislar[taban + binis_sirasi],
+                                 kodlar[durak], self.varislar[taban + inis_sirasi]))
+                durak = onceki
+                tur -= 1
+        bacaklar.reverse()
+
+        # Yürüme bacakları bir önceki bacağın bittiği anda (ilk bacaksa kalkış saatinde) başlar
+        zaman = kalkis
+        for i, bacak in enumerate(bacaklar):
+            if bacak[0] is None:
+                bacaklar[i] = (None, bacak[1], zaman, bacak[3], zaman + bacak[4])
+            zaman = bacaklar[i][4]
+        return bacaklar
+
+
+# İkili (binary) ağ görüntüsü (snapshot):
+# Kompakt ağın dizileri ile istasyon kodları, adları ve hat adları tek bir dosyaya yazılır. Dosya mmap ile açılır
+# ve diziler dosya üzerindeki memoryview'lar olarak kullanılır; hiçbir satır ayrıştırılmaz, istasyon nesneleri
+# ancak ihtiyaç duyuldukça (tembel olarak) oluşturulur. Böylece işçi süreçler ağı neredeyse anında açar ve
+# aynı dosyayı açan süreçler sayfaları işletim sistemi üzerinden paylaşır.
+#
+# Düzen: 32 baytlık başlık, ardından 8 bayta hizalanmış bölümler:
+#   agirliklar (m), ofsetler (n + 1), hedefler (m), istasyon_hatlari (n), sirali_kimlikler (n),
+#   metin_ofsetleri (2n + h + 1), metin (UTF-8; önce n kod, sonra n ad, sonra h hat adı), yuruyus (m bayt)
+# Sürüm 1 dosyalarında yuruyus bölümü yoktur (tüm bağlantılar raylı sayılır); bu dosyalar da açılır.
+# Başlıktaki CRC32 başlıktan sonraki tüm baytları kapsar.
+
+class _MetinTablosu(Sequence):
+    # Ortak metin bloğundaki [baslangic, baslangic + adet) aralığındaki dizgeleri tembel olarak çözer
+    __slots__ = ("_ofsetler", "_metin", "_baslangic", "_adet")
+
+    def __init__(self, ofsetler, metin, baslangic: int, adet: int):
+        self._ofsetler = ofsetler
+        self._metin = metin
+        self._baslangic = baslangic
+        self._adet = adet
+
+    def __len__(self) -> int:
+        return self._adet
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(self._adet))]
+        if i < 0:
+            i += self._adet
+        if not 0 <= i < self._adet:
+            raise IndexError(i)
+        k = self._baslangic + i
+        return str(self._metin[self._ofsetler[k]:self._ofsetler[k + 1]], "utf-8")
+
+
+class _KodIndeksi(Mapping):
+    # Kod -> kimlik eşlemesi; sözlük kurmak yerine koda göre sıralı kimlikler üzerinde ikili arama yapar
+    __slots__ = ("_kodlar", "_sirali")
+
+    def __init__(self, kodlar: _MetinTablosu, sirali):
+        self._kodlar = kodlar
+        self._sirali = sirali
+
+    def __getitem__(self, kod):
+        kodlar, sirali = self._kodlar, self._sirali
+        alt, ust = 0, len(sirali)
+        while alt < ust:
+            orta = (alt + ust) // 2
+            if kodlar[sirali[orta]] < kod:
+                alt = orta + 1
+            else:
+                ust = orta
+        if alt < len(sirali) and kodlar[sirali[alt]] == kod:
+            return sirali[alt]
+        raise KeyError(kod)
+
+    def __iter__(self):
+        return iter(self._kodlar)
+
+    def __len__(self) -> int:
+        return len(self._kodlar)
+
+
+class MetroSnapshotu:
+    SIHIRLI = b"MTRS"  # dosya imzası
+    SURUM = 2
+    _BASLIK = struct.Struct("<4sIIIIIc3xI")  # imza, sürüm, n, m, hat sayısı, metin boyu, ağırlık tipi, CRC32
+
+    __slots__ = ("donuk", "adlar", "_mmap")
+
+    def __init__(self, donuk: KompaktMetroAgi, adlar: _MetinTablosu, _mmap):
+        self.donuk = donuk  # mmap üzerindeki kompakt ağ
+        self.adlar = adlar  # kimlik -> istasyon adı
+        self._mmap = _mmap
+
+    @staticmethod
+    def _duzen(n: int, m: int, hat_sayisi: int, metin_boyu: int, tip: str, surum: int = SURUM):
+        # Bölümlerin (ad, ofset, bayt boyu, tip) listesi; okuma ve yazma aynı düzeni kullanır
+        bolumler = [("agirliklar", m, tip), ("ofsetler", n + 1, 'i'), ("hedefler", m, 'i'),
+                    ("istasyon_hatlari", n, 'i'), ("sirali", n, 'i'), ("metin_ofsetleri", 2 * n + hat_sayisi + 1, 'i'),
+                    ("metin", metin_boyu, 'B')]
+        if surum >= 2:
+            bolumler.append(("yuruyus", m, 'B'))
+        duzen = []
+        ofset = MetroSnapshotu._BASLIK.size
+        for ad, adet, bolum_tipi in bolumler:
+            boy = adet * array(bolum_tipi).itemsize
+            duzen.append((ad, ofset, boy, bolum_tipi))
+            ofset += (boy + 7) // 8 * 8
+        return duzen, ofset
+
+    @classmethod
+    def yaz(cls, metro: 'MetroAgi', dosya_yolu: str) -> None:
+        donuk = metro.dondur()
+        n, m, hat_sayisi = len(donuk), len(donuk.hedefler), len(donuk.hat_adlari)
+        tip = memoryview(donuk.agirliklar).format
+
+        metinler = [kod.encode("utf-8") for kod in donuk.kodlar]
+        metinler += [metro.istasyonlar[kod].istasyon_adi.encode("utf-8") for kod in donuk.kodlar]
+        metinler += [hat.encode("utf-8") for hat in donuk.hat_adlari]
+        metin_ofsetleri = array('i', [0])
+        for metin in metinler:
+            metin_ofsetleri.append(metin_ofsetleri[-1] + len(metin))
+        sirali = array('i', sorted(range(n), key=donuk.kodlar.__getitem__))
+
+        icerik = {"agirliklar": donuk.agirliklar, "ofsetler": donuk.ofsetler, "hedefler": donuk.hedefler,
+                  "istasyon_hatlari": donuk.istasyon_hatlari, "sirali": sirali,
+                  "metin_ofsetleri": metin_ofsetleri, "metin": b"".join(metinler), "yuruyus": donuk.yuruyus}
+        duzen, toplam = cls._duzen(n, m, hat_sayisi, metin_ofsetleri[-1], tip)
+
+        govde = bytearray(toplam - cls._BASLIK.size)
+        for ad, ofset, boy, _ in duzen:
+            baslangic = ofset - cls._BASLIK.size
+            govde[baslangic:baslangic + boy] = memoryview(icerik[ad]).cast('B')
+
+        with open(dosya_yolu, "wb") as dosya:
+            dosya.write(cls._BASLIK.pack(cls.SIHIRLI, cls.SURUM, n, m, hat_sayisi, metin_ofsetleri[-1],
+                                         tip.encode("ascii"), zlib.crc32(govde)))
+            dosya.write(govde)
+
+    @classmethod
+    def ac(cls, dosya_yolu: str, dogrula: bool = True) -> 'MetroSnapshotu':
+        with open(dosya_yolu, "rb") as dosya:
+            bellek = mmap.mmap(dosya.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(bellek) < cls._BASLIK.size:
+            bellek.close()
+            raise ValueError(f"{dosya_yolu} geçerli bir ağ görüntüsü değil")
+        sihirli, surum, n, m, hat_sayisi, metin_boyu, tip, crc = cls._BASLIK.unpack_from(bellek, 0)
+        if sihirli != cls.SIHIRLI:
+            bellek.close()
+            raise ValueError(f"{dosya_yolu} geçerli bir ağ görüntüsü değil")
+        if not 1 <= surum <= cls.SURUM:
+            bellek.close()
+            raise ValueError(f"{dosya_yolu}: desteklenmeyen görüntü sürümü {surum}")
+
+        duzen, toplam = cls._duzen(n, m, hat_sayisi, metin_boyu, tip.decode("ascii"), surum)
+        gorunum = memoryview(bellek)
+        if len(gorunum) != toplam or (dogrula and zlib.crc32(gorunum[cls._BASLIK.size:]) != crc):
+            gorunum.release()
+            bellek.close()
+            raise ValueError(f"{dosya_yolu} eksik ya da bozuk (sağlama toplamı tutmuyor)")
+
+        bolum = {ad: gorunum[ofset:ofset + boy].cast(bolum_tipi) for ad, ofset, boy, bolum_tipi in duzen}
+        metin_ofsetleri, metin = bolum["metin_ofsetleri"], bolum["metin"]
+        kodlar = _MetinTablosu(metin_ofsetleri, metin, 0, n)
+        adlar = _MetinTablosu(metin_ofsetleri, metin, n, n)
+        hat_adlari = list(_MetinTablosu(metin_ofsetleri, metin, 2 * n, hat_sayisi))
+
+        donuk = KompaktMetroAgi(kodlar, bolum["ofsetler"], bolum["hedefler"], bolum["agirliklar"], hat_adlari,
+                                bolum["istasyon_hatlari"], kod_indeksi=_KodIndeksi(kodlar, bolum["sirali"]),
+                                yuruyus=bolum.get("yuruyus"))
+        return cls(donuk, adlar, bellek)
+
+
+class _SnapshotIstasyonu(Istasyon):
+    # Görüntüden açılan istasyon: komşu listesi ilk erişimde dosyadaki dizilerden kurulur
+    __slots__ = ("_istasyonlar", "_kimlik")
+
+    _komsu_yuvasi = Istasyon.komsu_istasyonlar  # Istasyon'daki asıl __slots__ alanı
+
+    @property
+    def komsu_istasyonlar(self) -> List[Tuple[Istasyon, int]]:
+        try:
+            return _SnapshotIstasyonu._komsu_yuvasi.__get__(self)
+        except AttributeError:
+            donuk = self._istasyonlar.snapshot.donuk
+            komsular = [(self._istasyonlar[donuk.kodlar[komsu]], sure) for komsu, sure in donuk.komsular(self._kimlik)]
+            _SnapshotIstasyonu._komsu_yuvasi.__set__(self, komsular)
+            return komsular
+
+    @komsu_istasyonlar.setter
+    def komsu_istasyonlar(self, deger) -> None:
+        _SnapshotIstasyonu._komsu_yuvasi.__set__(self, deger)
+
+
+class _SnapshotIstasyonlari(MutableMapping):
+    # MetroAgi.istasyonlar yerine geçen tembel sözlük: istasyon nesnesi yalnızca istendiğinde oluşturulur.
+    # Görüntü açıldıktan sonra istasyon_ekle ile eklenen istasyonlar ayrıca tutulur.
+
+    def __init__(self, snapshot: MetroSnapshotu):
+        self.snapshot = snapshot
+        self._nesneler: Dict[str, Istasyon] = {}  # oluşturulmuş (ya da sonradan eklenmiş) istasyonlar
+        self._eklenenler: List[str] = []  # görüntüden sonra eklenen kodlar (sırayla)
+
+    def __getitem__(self, kod) -> Istasyon:
+        istasyon = self._nesneler.get(kod)
+        if istasyon is None:
+            donuk = self.snapshot.donuk
+            kimlik = donuk.kod_indeksi[kod]  # yoksa KeyError
+            istasyon = _SnapshotIstasyonu.__new__(_SnapshotIstasyonu)
+            istasyon.istasyon_kodu = kod
+            istasyon.istasyon_adi = self.snapshot.adlar[kimlik]
+            istasyon.hat_adi = donuk.hat_adlari[donuk.istasyon_hatlari[kimlik]]
+            istasyon._istasyonlar = self
+            istasyon._kimlik = kimlik
+            self._nesneler[kod] = istasyon
+        return istasyon
+
+    def __contains__(self, kod) -> bool:
+        return kod in self._nesneler or kod in self.snapshot.donuk.kod_indeksi
+
+    def __setitem__(self, kod, istasyon: Istasyon) -> None:
+        if kod in self.snapshot.donuk.kod_indeksi:
+            raise KeyError(f"{kod} görüntüde zaten var")
+        if kod not in self._nesneler:
+            self._eklenenler.append(kod)
+        self._nesneler[kod] = istasyon
+
+    def __delitem__(self, kod) -> None:
+        raise TypeError("istasyon silme desteklenmiyor")
+
+    def __iter__(self):
+        yield from self.snapshot.donuk.kodlar
+        yield from self._eklenenler
+
+    def __len__(self) -> int:
+        return len(self.snapshot.donuk) + len(self._eklenenler)
+
+# Rota önbelleği: (başlangıç, hedef, mod) anahtarlı, LRU tahliyeli ve isteğe bağlı ömürlü (TTL) önbellek.
+# Her kayıt ağın o anki sürüm numarasıyla saklanır; ağ değiştikten sonra eski kayıtlar asla döndürülmez.
+
+class RotaOnbellegi:
+    __slots__ = ("kapasite", "omur", "_kayitlar", "isabet", "iska", "tahliye", "gecersiz")
+
+    def __init__(self, kapasite: int = 1024, omur: Optional[float] = None):
+        self.kapasite = kapasite  # en fazla kayıt sayısı (0: önbellek kapalı)
+        self.omur = omur  # saniye cinsinden kayıt ömrü (None: süresiz)
+        self._kayitlar: OrderedDict = OrderedDict()  # anahtar -> (sürüm, zaman, değer); sonda en yeni kullanılan
+        self.isabet = 0
+        self.iska = 0
+        self.tahliye = 0  # kapasite dolduğu için atılan kayıtlar
+        self.gecersiz = 0  # ağ sürümü değiştiği ya da ömrü dolduğu için atılan kayıtlar
+
+    def __len__(self) -> int:
+        return len(self._kayitlar)
+
+    def al(self, anahtar, surum: int):
+        # (bulundu mu, değer) döndürür
+        kayit = self._kayitlar.get(anahtar)
+        if kayit is not None:
+            kayit_surumu, zaman, deger = kayit
+            if kayit_surumu == surum and (self.omur is None or time.monotonic() - zaman < self.omur):
+                self._kayitlar.move_to_end(anahtar)
+                self.isabet += 1
+                return True, deger
+            del self._kayitlar[anahtar]
+            self.gecersiz += 1
+        self.iska += 1
+        return False, None
+
+    def koy(self, anahtar, surum: int, deger) -> None:
+        if self.kapasite <= 0:
+            return
+        self._kayitlar[anahtar] = (surum, time.monotonic(), deger)
+        self._kayitlar.move_to_end(anahtar)
+        while len(self._kayitlar) > self.kapasite:
+            self._kayitlar.popitem(last=False)
+            self.tahliye += 1
+
+    def temizle(self) -> None:
+        self._kayitlar.clear()
+
+    def surumu_tasi(self, eski_surum: int, yeni_surum: int, gecerli_mi) -> None:
+        # Ağ değişikliğinden etkilenmeyen kayıtlar (gecerli_mi(anahtar, değer) True) yeni sürüme taşınır,
+        # diğerleri atılır
+        for anahtar, (surum, zaman, deger) in list(self._kayitlar.items()):
+            if surum == eski_surum and gecerli_mi(anahtar, deger):
+                self._kayitlar[anahtar] = (yeni_surum, zaman, deger)
+            else:
+                del self._kayitlar[anahtar]
+                self.gecersiz += 1
+
+    def istatistikler(self) -> Dict[str, int]:
+        return {"kayit": len(self._kayitlar), "isabet": self.isabet, "iska": self.iska,
+                "tahliye": self.tahliye, "gecersiz": self.gecersiz}
+
+
+# Ağ düzeyinde arama ölçümleri: her ölçülen arama AramaIstatistikleri olarak kaydedilir, algoritma ve ölçüt başına
+# 2'nin kuvvetleri kovalarında histogramlar biriktirilir. geri_cagirma verilirse her aramadan sonra çağrılır.
+
+class AramaOlcumleri:
+    OLCUTLER = ("cikarilan", "kesinlesen", "eklenen", "eski_atlanan", "en_buyuk_kuyruk", "sure_ms")
+
+    def __init__(self, geri_cagirma=None):
+        self.geri_cagirma = geri_cagirma  # geri_cagirma(istatistik)
+        self.son: Optional[AramaIstatistikleri] = None  # en son ölçülen arama
+        self._sorgular: Dict[str, int] = defaultdict(int)  # algoritma -> arama sayısı
+        self._toplamlar: Dict[Tuple[str, str], float] = defaultdict(int)  # (algoritma, ölçüt) -> toplam
+        self._kovalar: Dict[Tuple[str, str], Dict[float, int]] = defaultdict(lambda: defaultdict(int))
+
+    @staticmethod
+    def _kova(deger) -> float:
+        # Değeri kapsayan en küçük 2^k üst sınırı (0 ve altı için 0)
+        if deger <= 0:
+            return 0
+        if isinstance(deger, int):
+            return 1 << (deger - 1).bit_length()
+        return 2.0 ** math.ceil(math.log2(deger))
+
+    def kaydet(self, istatistik: AramaIstatistikleri) -> None:
+        self.son = istatistik
+        self._sorgular[istatistik.algoritma] += 1
+        for olcut in self.OLCUTLER:
+            deger = getattr(istatistik, olcut)
+            self._toplamlar[istatistik.algoritma, olcut] += deger
+            self._kovalar[istatistik.algoritma, olcut][self._kova(deger)] += 1
+        if self.geri_cagirma is not None:
+            self.geri_cagirma(istatistik)
+
+    # JSON'a yazılabilir özet:
+    # {algoritma: {"sorgu": n, ölçüt: {"toplam": t, "ortalama": o, "kovalar": [[üst sınır, adet], ...]}}}
+    def histogramlar(self) -> Dict[str, Dict[str, object]]:
+        sonuc = {}
+        for algoritma, sorgu in self._sorgular.items():
+            ozet = {"sorgu": sorgu}
+            for olcut in self.OLCUTLER:
+                toplam = self._toplamlar[algoritma, olcut]
+                ozet[olcut] = {"toplam": toplam, "ortalama": toplam / sorgu,
+                               "kovalar": sorted([ust, adet] for ust, adet in self._kovalar[algoritma, olcut].items())}
+            sonuc[algoritma] = ozet
+        return sonuc
+
+    def sifirla(self) -> None:
+        self.son = None
+        self._sorgular.clear()
+        self._toplamlar.clear()
+        self._kovalar.clear()
+
+
+# İstasyon adı indeksi:
+# Aynı fiziksel istasyon her hatta ayrı bir kodla bulunur (Kızılay: M4_1, A1_8, M2_12, M1_1). Adı aynı olan istasyonlar
+# tek bir kümede (süper düğüm) toplanır. Adlar büyük / küçük harften ve Türkçe karakterlerden bağımsız bir anahtara
+# çevrilir ("Kızılay" -> "kizilay"); adın her kelimesinden başlayan anahtar parçaları sıralı bir dizide tutulur ve
+# önek araması ikili arama (bisect) ile yapılır. Böylece "kültür" yazınca da "Atatürk Kültür Merkezi" bulunur.
+
+class IstasyonAdIndeksi:
+    _KATLAMA = str.maketrans("ıİIşŞğĞüÜöÖçÇâÂîÎûÛ", "iiissgguuooccaaiiuu")
+
+    __slots__ = ("kumeler", "_parcalar", "_parca_kumeleri")
+
+    def __init__(self, istasyonlar: Iterable[Istasyon]):
+        self.kumeler: Dict[str, Tuple[str, List[str]]] = {}  # anahtar -> (görünen ad, istasyon kodları)
+        for istasyon in istasyonlar:
+            anahtar = self.anahtar(istasyon.istasyon_adi)
+            kume = self.kumeler.get(anahtar)
+            if kume is None:
+                kume = self.kumeler[anahtar] = (istasyon.istasyon_adi, [])
+            kume[1].append(istasyon.istasyon_kodu)
+
+        parcalar = sorted((anahtar[i:], anahtar) for anahtar in self.kumeler
+                          for i in range(len(anahtar)) if i == 0 or anahtar[i - 1] == " ")
+        self._parcalar = [parca for parca, _ in parcalar]  # sıralı anahtar parçaları (kelime başından sona)
+        self._parca_kumeleri = [anahtar for _, anahtar in parcalar]  # parçanın ait olduğu küme anahtarı
+
+    @classmethod
+    def anahtar(cls, ad) -> str:
+        return " ".join(str(ad).translate(cls._KATLAMA).lower().split())
+
+    # Otomatik tamamlama: herhangi bir kelimesi onek ile başlayan istasyon adları (eşleşen parçaya göre alfabetik)
+    def tamamla(self, onek: str, adet: int = 10) -> List[str]:
+        onek = self.anahtar(onek)
+        sonuc: Dict[str, None] = {}
+        for i in range(bisect_left(self._parcalar, onek), len(self._parcalar)):
+            if len(sonuc) >= adet or not self._parcalar[i].startswith(onek):
+                break
+            sonuc[self.kumeler[self._parca_kumeleri[i]][0]] = None
+        return list(sonuc)
+
+    # Adın kümesindeki istasyon kodları (ad bulunamazsa boş liste)
+    def kodlar(self, ad) -> List[str]:
+        kume = self.kumeler.get(self.anahtar(ad))
+        return list(kume[1]) if kume is not None else []
+
+
+class MetroAgi:
+    ALTERNATIF_DENEME_CARPANI = 10  # alternatif_rotalar'da benzerlik nedeniyle elenebilecek aday çarpanı
+    GTFS_AKTARMA_SURESI = 120  # transfers.txt'de min_transfer_time verilmemiş aktarmaların süresi (saniye)
+
+    def __init__(self, onbellek_kapasitesi: int = 1024, onbellek_omru: Optional[float] = None,
+                 kuyruk_turu: str = "otomatik"):
+        if kuyruk_turu not in ONCELIK_KUYRUKLARI:
+            raise ValueError(f"bilinmeyen öncelik kuyruğu: {kuyruk_turu}")
         self.istasyonlar: Dict[str, Istasyon] = {}
-        self.hatlar: Dict[str, List[Istasyon]] = defaultdict(list)
+        self._hatlar: Optional[Dict[str, List[Istasyon]]] = defaultdict(list)
+        self.surum = 0  # ağ her değiştiğinde artar (önbellek kayıtları bu numarayla doğrulanır)
+        self.onbellek = RotaOnbellegi(onbellek_kapasitesi, onbellek_omru)
+        self._donuk: Optional[KompaktMetroAgi] = None  # dondur() ile üretilen kompakt kopya
+        self._rota_tablosu: Optional[RotaTablosu] = None  # on_hesapla() ile üretilen tüm çiftler tablosu
+        self._hiyerarsi: Optional[DaraltmaHiyerarsisi] = None  # hiyerarsi_olustur() ile üretilen daraltma hiyerarşisi
+        self.olcum: Optional[AramaOlcumleri] = None  # olcum_ac() ile açılır; kapalıyken aramalar sayaçsız çalışır
+        self._kapali_baglantilar: Dict[Tuple[str, str], List] = defaultdict(list)  # istasyon çifti -> kapalı süreler
+        self.yuruyus_baglantilari: Set[Tuple[str, str]] = set()  # yürüyerek geçilen istasyon çiftleri (_cift sırasıyla)
+        self._ad_indeksi: Optional[IstasyonAdIndeksi] = None  # ad_indeksi ile ilk kullanımda kurulur
+        self.kuyruk_turu = kuyruk_turu  # aramaların öncelik kuyruğu (ONCELIK_KUYRUKLARI; bkz. KompaktMetroAgi)
+
+    @property
+    def hatlar(self) -> Dict[str, List[Istasyon]]:
+        # Görüntüden (snapshot) açılan ağda hat listeleri ilk erişimde kurulur
+        if self._hatlar is None:
+            self._hatlar = defaultdict(list)
+            for istasyon in self.istasyonlar.values():
+                self._hatlar[istasyon.hat_adi].append(istasyon)
+        return self._hatlar
 
     def istasyon_ekle(self, istasyon_kodu, istasyon_adi, hat_adi) -> None:
         # Eğer bu istasyon koduna sahip bir istasyon henüz eklenmemişse eklenir.
@@ -30,8 +2240,9 @@ class MetroAgi:
             istasyon = Istasyon(istasyon_kodu, istasyon_adi, hat_adi) # Yeni bir istasyon nesnesi oluşturulur
             self.istasyonlar[istasyon_kodu] = istasyon
             self.hatlar[hat_adi].append(istasyon)
+            self._degisti()
 
-    def baglanti_ekle(self, istasyon1_kodu, istasyon2_kodu, gecis_suresi) -> None:
+    def baglanti_ekle(self, istasyon1_kodu, istasyon2_kodu, gecis_suresi, yuruyus: bool = False) -> None:
         # Belirtilen istasyon kodlarına sahip istasyon nesneleri alınır.
         istasyon1 = self.istasyonlar[istasyon1_kodu]
         istasyon2 = self.istasyonlar[istasyon2_kodu]
@@ -39,295 +2250,675 @@ class MetroAgi:
         # İstasyonların birbirleriyle bağlantılı olduğunu belirten komşuluk bilgisi eklenir.
         istasyon1.komsu_ekle(istasyon2, gecis_suresi)  
         istasyon2.komsu_ekle(istasyon1, gecis_suresi)   #(çift yönlü bağlantı)
+        if yuruyus:
+            # Yürüme bağlantısı (ör. AŞTİ - Söğütözü): süresi pareto_rotalar'da yürüme süresine de sayılır
+            self.yuruyus_baglantilari.add(self._cift(istasyon1_kodu, istasyon2_kodu))
+        self._degisti()
 
-    # BFS algoritması:
+    def _degisti(self) -> None:
+        # Ağ değişti: sürüm artar, kompakt kopya ve önceden hesaplanmış tablolar artık geçersiz
+        self.surum += 1
+        self._donuk = None
+        self._rota_tablosu = None
+        self._hiyerarsi = None
+        self._ad_indeksi = None
 
-    def en_az_aktarma_bul(self, baslangic_kodu, hedef_kodu) -> Optional[List[Istasyon]]:
+    # Canlı aksaklıklar: bağlantı kapatma, yeniden açma ve gecikme ekleme.
+    # Bir bağlantının süresi yalnızca arttığında (kapatma, gecikme) ağın tamamı yeniden hesaplanmaz: önbellekteki
+    # sonuçlardan değişen bağlantıyı kullanmayanlar geçerli kalır, A* yer işaretleri (alt sınır olarak hâlâ geçerli)
+    # ve gecikmede hat grafı korunur, rota tablosunda yalnızca bu bağlantıdan etkilenen ağaçlar onarılır.
+    # Süre azaldığında (baglanti_ac, negatif gecikme) önbellek temizlenir, tablo yine artımlı güncellenir.
+    # Daraltma hiyerarşisi her değişiklikte atılır (gerekirse hiyerarsi_olustur ile yeniden kurulur).
+    def baglanti_kapat(self, istasyon1_kodu, istasyon2_kodu) -> None:
+        istasyon1, istasyon2 = self.istasyonlar[istasyon1_kodu], self.istasyonlar[istasyon2_kodu]
+        eski_sure = self._baglanti_suresi(istasyon1, istasyon2)
+        if eski_sure == SONSUZ:
+            raise KeyError(f"{istasyon1_kodu} ile {istasyon2_kodu} arasında açık bağlantı yok")
+
+        # Kapatılan süreler baglanti_ac ile geri açılmak üzere saklanır
+        self._kapali_baglantilar[self._cift(istasyon1_kodu, istasyon2_kodu)].extend(
+            sure for komsu, sure in istasyon1.komsu_istasyonlar if komsu is istasyon2)
+        istasyon1.komsu_istasyonlar = [(komsu, sure) for komsu, sure in istasyon1.komsu_istasyonlar if komsu is not istasyon2]
+        istasyon2.komsu_istasyonlar = [(komsu, sure) for komsu, sure in istasyon2.komsu_istasyonlar if komsu is not istasyon1]
+        self._baglanti_degisti(istasyon1_kodu, istasyon2_kodu, eski_sure, SONSUZ)
+
+    def baglanti_ac(self, istasyon1_kodu, istasyon2_kodu) -> None:
+        # baglanti_kapat ile kapatılan bağlantılar kapatılmadan önceki süreleriyle geri açılır
+        istasyon1, istasyon2 = self.istasyonlar[istasyon1_kodu], self.istasyonlar[istasyon2_kodu]
+        kapali = self._kapali_baglantilar.pop(self._cift(istasyon1_kodu, istasyon2_kodu), None)
+        if not kapali:
+            raise KeyError(f"{istasyon1_kodu} ile {istasyon2_kodu} arasında kapalı bağlantı yok")
+
+        eski_sure = self._baglanti_suresi(istasyon1, istasyon2)
+        for sure in kapali:
+            istasyon1.komsu_ekle(istasyon2, sure)
+            istasyon2.komsu_ekle(istasyon1, sure)
+        self._baglanti_degisti(istasyon1_kodu, istasyon2_kodu, eski_sure, self._baglanti_suresi(istasyon1, istasyon2))
+
+    def gecikme_ekle(self, istasyon1_kodu, istasyon2_kodu, dakika) -> None:
+        # İki istasyon arasındaki (açık) bağlantıların süresine dakika eklenir; gecikme negatif dakikayla kaldırılır
+        istasyon1, istasyon2 = self.istasyonlar[istasyon1_kodu], self.istasyonlar[istasyon2_kodu]
+        eski_sure = self._baglanti_suresi(istasyon1, istasyon2)
+        if eski_sure == SONSUZ:
+            raise KeyError(f"{istasyon1_kodu} ile {istasyon2_kodu} arasında açık bağlantı yok")
+        if any(komsu is istasyon2 and sure + dakika < 0 for komsu, sure in istasyon1.komsu_istasyonlar):
+            raise ValueError(f"{istasyon1_kodu}-{istasyon2_kodu} bağlantısının süresi negatif olamaz")
+
+        istasyon1.komsu_istasyonlar = [(komsu, sure + dakika if komsu is istasyon2 else sure)
+                                       for komsu, sure in istasyon1.komsu_istasyonlar]
+        istasyon2.komsu_istasyonlar = [(komsu, sure + dakika if komsu is istasyon1 else sure)
+                                       for komsu, sure in istasyon2.komsu_istasyonlar]
+        self._baglanti_degisti(istasyon1_kodu, istasyon2_kodu, eski_sure, eski_sure + dakika)
+
+    @staticmethod
+    def _cift(istasyon1_kodu, istasyon2_kodu) -> Tuple[str, str]:
+        return (istasyon1_kodu, istasyon2_kodu) if istasyon1_kodu <= istasyon2_kodu else (istasyon2_kodu, istasyon1_kodu)
+
+    @staticmethod
+    def _baglanti_suresi(istasyon1: Istasyon, istasyon2: Istasyon):
+        # Paralel bağlantıların en kısası (bağlantı yoksa SONSUZ)
+        return min((sure for komsu, sure in istasyon1.komsu_istasyonlar if komsu is istasyon2), default=SONSUZ)
+
+    def _baglanti_degisti(self, istasyon1_kodu, istasyon2_kodu, eski_sure, yeni_sure) -> None:
+        eski_surum = self.surum
+        self.surum += 1
+        eski_donuk = self._donuk
+        self._donuk = None
+        self._hiyerarsi = None
+
+        if yeni_sure >= eski_sure:
+            cift = {istasyon1_kodu, istasyon2_kodu}
+
+            def gecerli_mi(anahtar, deger) -> bool:
+                # Süre arttığında bağlantıyı kullanmayan en iyi rota en iyi olmaya devam eder;
+                # durak sayısı ise yalnızca bağlantı tamamen kapandıysa değişebilir
+                if deger is None:
+                    return True
+                if anahtar[2] == "durak":
+                    etkilenir = yeni_sure == SONSUZ
+                elif anahtar[2] in ("hizli", "aktarma"):
+                    etkilenir = yeni_sure > eski_sure
+                else:
+                    return False
+                rota = deger if isinstance(deger, list) else deger[0]
+                return not etkilenir or all({a.istasyon_kodu, b.istasyon_kodu} != cift for a, b in zip(rota, rota[1:]))
+
+            self.onbellek.surumu_tasi(eski_surum, self.surum, gecerli_mi)
+            if eski_donuk is not None:
+                donuk = self.dondur()
+                # Hat grafı (parçalar ve aktarma sayıları) yalnızca bağlantı açık kaldıysa aynıdır; kapanan
+                # bağlantı bir hattı bölebilir
+                if yeni_sure != SONSUZ:
+                    donuk._hat_grafi = eski_donuk._hat_grafi
+                # Yer işaretleri yalnızca süre tipi değişmediyse korunur: kesirli gecikmeli bağlantı kapanıp süreler
+                # tam sayıya dönünce kesirli mesafeler tam sayı önceliklerle çalışan kuyruklara uymaz
+                if memoryview(donuk.agirliklar).format == memoryview(eski_donuk.agirliklar).format:
+                    donuk._yer_isaretleri = eski_donuk._yer_isaretleri
+        else:
+            self.onbellek.temizle()
+
+        if self._rota_tablosu is not None:
+            donuk = self.dondur()
+            self._rota_tablosu.onar(donuk, donuk.kod_indeksi[istasyon1_kodu], donuk.kod_indeksi[istasyon2_kodu],
+                                    eski_sure, yeni_sure)
+
+    # Toplu ekleme: önce tüm kodlar doğrulanır (bilinmeyen kodların hepsi tek hatada raporlanır, ağ değişmez),
+    # tekrarlanan bağlantılar tekilleştirilir (aynı çift için en kısa süre kalır), sonra komşuluklar tek geçişte
+    # kurulur ve ağ sürümü yalnızca bir kez artar. (eklenen istasyon sayısı, eklenen bağlantı sayısı) döndürür.
+    # Bağlantılar (istasyon1, istasyon2, süre) ya da yürüme bağlantıları için (istasyon1, istasyon2, süre, yürüyüş)
+    # biçimindedir; tekilleştirmede en kısa bağlantının yürüme bilgisi kalır. Ağda zaten bağlı (ya da
+    # baglanti_kapat ile kapatılmış) çiftler atlanır ve mevcut süreleri korunur; böylece aynı dosyayı yeniden yüklemek
+    # paralel bağlantı kopyaları oluşturmaz (süre değiştirmek için gecikme_ekle kullanılır).
+    def toplu_ekle(self, istasyonlar: Iterable[Tuple[str, str, str]],
+                   baglantilar: Iterable[Tuple]) -> Tuple[int, int]:
+        yeni_istasyonlar: Dict[str, Tuple[str, str]] = {}
+        for istasyon_kodu, istasyon_adi, hat_adi in istasyonlar:
+            if istasyon_kodu not in self.istasyonlar and istasyon_kodu not in yeni_istasyonlar:
+                yeni_istasyonlar[istasyon_kodu] = (istasyon_adi, hat_adi)
+
+        tekil: Dict[Tuple[str, str], Tuple[int, bool]] = {}  # çift -> (süre, yürüyüş)
+        bilinmeyenler: Set[str] = set()
+        for baglanti in baglantilar:
+            istasyon1_kodu, istasyon2_kodu, gecis_suresi = baglanti[:3]
+            for kod in (istasyon1_kodu, istasyon2_kodu):
+                if kod not in self.istasyonlar and kod not in yeni_istasyonlar:
+                    bilinmeyenler.add(kod)
+            anahtar = (istasyon1_kodu, istasyon2_kodu) if istasyon1_kodu <= istasyon2_kodu else (istasyon2_kodu, istasyon1_kodu)
+            if anahtar not in tekil or gecis_suresi < tekil[anahtar][0]:
+                tekil[anahtar] = (gecis_suresi, len(baglanti) > 3 and bool(baglanti[3]))
+
+        if bilinmeyenler:
+            ornek = ", ".join(sorted(bilinmeyenler)[:20])
+            raise KeyError(f"{len(bilinmeyenler)} bilinmeyen istasyon kodu: {ornek}")
+
+        istasyon_sozlugu, hatlar = self.istasyonlar, self.hatlar
+        for istasyon_kodu, (istasyon_adi, hat_adi) in yeni_istasyonlar.items():
+            istasyon = Istasyon(istasyon_kodu, istasyon_adi, hat_adi)
+            istasyon_sozlugu[istasyon_kodu] = istasyon
+            hatlar[hat_adi].append(istasyon)
+
+        kapali = self._kapali_baglantilar
+        for anahtar, (gecis_suresi, yuruyus) in list(tekil.items()):
+            istasyon1, istasyon2 = istasyon_sozlugu[anahtar[0]], istasyon_sozlugu[anahtar[1]]
+            if anahtar in kapali or any(komsu is istasyon2 for komsu, _ in istasyon1.komsu_istasyonlar):
+                del tekil[anahtar]  # çift ağda zaten var
+                continue
+            istasyon1.komsu_istasyonlar.append((istasyon2, gecis_suresi))
+            istasyon2.komsu_istasyonlar.append((istasyon1, gecis_suresi))
+            if yuruyus:
+                self.yuruyus_baglantilari.add(anahtar)
+
+        if yeni_istasyonlar or tekil:
+            self._degisti()
+        return len(yeni_istasyonlar), len(tekil)
+
+    # Ağı dosyadan yükler. Desteklenen biçimler:
+    # - istasyonlar.csv (kod, ad, hat) ve baglantilar.csv (istasyon1, istasyon2, sure, isteğe bağlı yuruyus)
+    #   içeren bir klasör
+    # - GTFS alt kümesi içeren bir klasör: stops.txt, stop_times.txt (isteğe bağlı trips.txt, routes.txt, transfers.txt)
+    # - {"istasyonlar": [...], "baglantilar": [...]} biçiminde bir .json dosyası
+    # CSV ve GTFS dosyaları satır satır okunur, hiçbiri bütün halde belleğe alınmaz (yalnızca seferlere göre gruplu
+    # olmayan bir stop_times.txt'nin seferleri bellekte gruplanır).
+    def yukle(self, yol: str) -> Tuple[int, int]:
+        if os.path.isdir(yol):
+            if os.path.exists(os.path.join(yol, "istasyonlar.csv")):
+                return self.toplu_ekle(self._csv_istasyonlari(os.path.join(yol, "istasyonlar.csv")),
+                                       self._csv_baglantilari(os.path.join(yol, "baglantilar.csv")))
+            if os.path.exists(os.path.join(yol, "stops.txt")):
+                return self.toplu_ekle(*self._gtfs_oku(yol))
+            raise ValueError(f"{yol} içinde istasyonlar.csv ya da stops.txt bulunamadı")
+
+        if yol.endswith(".json"):
+            with open(yol, encoding="utf-8") as dosya:
+                veri = json.load(dosya)
+            return self.toplu_ekle(((s["kod"], s["ad"], s["hat"]) for s in veri["istasyonlar"]),
+                                   ((b["istasyon1"], b["istasyon2"], b["sure"], bool(b.get("yuruyus")))
+                                    for b in veri["baglantilar"]))
+
+        raise ValueError(f"{yol} için desteklenmeyen biçim")
+
+    @staticmethod
+    def _sayi(metin: str):
+        # "5" -> 5, "2.5" -> 2.5
+        try:
+            return int(metin)
+        except ValueError:
+            return float(metin)
+
+    @staticmethod
+    def _csv_istasyonlari(dosya_yolu: str):
+        with open(dosya_yolu, newline="", encoding="utf-8-sig") as dosya:
+            for satir in csv.DictReader(dosya):
+                yield satir["kod"], satir["ad"], satir["hat"]
+
+    @classmethod
+    def _csv_baglantilari(cls, dosya_yolu: str):
+        if not os.path.exists(dosya_yolu):
+            return
+        with open(dosya_yolu, newline="", encoding="utf-8-sig") as dosya:
+            for satir in csv.DictReader(dosya):
+                yuruyus = (satir.get("yuruyus") or "").strip().lower() in ("1", "evet", "true")
+                yield satir["istasyon1"], satir["istasyon2"], cls._sayi(satir["sure"]), yuruyus
+
+    @staticmethod
+    def _gtfs_saniye(zaman: str) -> int:
+        # GTFS saatleri 24:00:00'ı geçebilir (gece yarısından sonraki seferler)
+        saat, dakika, saniye = zaman.strip().split(":")
+        return int(saat) * 3600 + int(dakika) * 60 + int(saniye)
+
+    @classmethod
+    def _gtfs_oku(cls, klasor: str):
+        def oku(dosya_adi):
+            dosya_yolu = os.path.join(klasor, dosya_adi)
+            if not os.path.exists(dosya_yolu):
+                return
+            with open(dosya_yolu, newline="", encoding="utf-8-sig") as dosya:
+                yield from csv.DictReader(dosya)
+
+        hat_adlari = {s["route_id"]: s.get("route_short_name") or s.get("route_long_name") or s["route_id"]
+                      for s in oku("routes.txt")}
+        sefer_hatlari = {s["trip_id"]: hat_adlari.get(s["route_id"], s["route_id"]) for s in oku("trips.txt")}
+
+        # Aynı durak çifti her seferde tekrar eder; okurken tekilleştirilir (en kısa süre kalır)
+        durak_hatlari: Dict[str, str] = {}
+        baglantilar: Dict[Tuple[str, str], Tuple[int, bool]] = {}  # çift -> (süre, yürüyüş)
+
+        def baglanti(durak1, durak2, saniye, yuruyus=False):
+            if durak1 == durak2:
+                return
+            anahtar = (durak1, durak2) if durak1 <= durak2 else (durak2, durak1)
+            sure = max(1, round(saniye / 60))  # dakikaya yuvarlanır, en az 1 dakika
+            if anahtar not in baglantilar or sure < baglantilar[anahtar][0]:
+                baglantilar[anahtar] = (sure, yuruyus)
+
+        def seferi_isle(duraklar):
+            duraklar.sort()
+            for (_, durak1, _, kalkis), (_, durak2, varis, _) in zip(duraklar, duraklar[1:]):
+                baglanti(durak1, durak2, varis - kalkis)
+
+        def durak_kaydi(satir):
+            varis = cls._gtfs_saniye(satir["arrival_time"] or satir["departure_time"])
+            kalkis = cls._gtfs_saniye(satir["departure_time"] or satir["arrival_time"])
+            return int(satir["stop_sequence"]), satir["stop_id"], varis, kalkis
+
+        def sefer_duraklari():
+            # (sefer, durak kayıtları) üretir; her sefer seferi_isle'de stop_sequence'e göre sıralanır.
+            # stop_times.txt çoğunlukla seferlere göre gruplu (ardışık) gelir ve satır satır işlenir. Bir sefer dosyada
+            # dağınık geçiyorsa dosya ikinci kez okunur ve seferler bellekte gruplanır; baglanti tekilleştirdiği için
+            # ilk geçişte işlenmiş seferler sonucu değiştirmez.
+            gorulen: Set[str] = set()
+            mevcut_sefer, duraklar = None, []
+            for satir in oku("stop_times.txt"):
+                sefer = satir["trip_id"]
+                if sefer != mevcut_sefer:
+                    if sefer in gorulen:
+                        break
+                    if duraklar:
+                        yield mevcut_sefer, duraklar
+                    gorulen.add(sefer)
+                    mevcut_sefer, duraklar = sefer, []
+                duraklar.append(durak_kaydi(satir))
+            else:
+                if duraklar:
+                    yield mevcut_sefer, duraklar
+                return
+
+            gruplar: Dict[str, List[Tuple]] = defaultdict(list)
+            for satir in oku("stop_times.txt"):
+                gruplar[satir["trip_id"]].append(durak_kaydi(satir))
+            yield from gruplar.items()
+
+        for sefer, duraklar in sefer_duraklari():
+            seferi_isle(duraklar)
+            for _, durak, _, _ in duraklar:
+                durak_hatlari.setdefault(durak, sefer_hatlari.get(sefer, ""))
+
+        # Aktarmalar (yürüme bağlantıları); min_transfer_time saniye cinsindendir. transfer_type 3 (aktarma yapılamaz)
+        # ve 4-5 (araç içinde aktarma, yürüme değil) satırları atlanır; süresi verilmemiş aktarmaya GTFS_AKTARMA_SURESI
+        # uygulanır.
+        for satir in oku("transfers.txt"):
+            if (satir.get("transfer_type") or "0").strip() not in ("0", "1", "2"):
+                continue
+            saniye = (satir.get("min_transfer_time") or "").strip()
+            baglanti(satir["from_stop_id"], satir["to_stop_id"], int(saniye) if saniye else cls.GTFS_AKTARMA_SURESI,
+                     True)
+
+        istasyonlar = ((s["stop_id"], s["stop_name"], durak_hatlari.get(s["stop_id"], "")) for s in oku("stops.txt"))
+        return istasyonlar, ((durak1, durak2, sure, yuruyus) for (durak1, durak2), (sure, yuruyus) in baglantilar.items())
+
+    # Ağı sürümlü ve sağlama toplamlı ikili görüntü dosyasına yazar
+    def kaydet_snapshot(self, dosya_yolu: str) -> None:
+        MetroSnapshotu.yaz(self, dosya_yolu)
+
+    # Görüntü dosyasını mmap ile açar: diziler ayrıştırılmadan kullanılır, istasyon nesneleri gerektikçe oluşturulur.
+    # dogrula=False verilirse CRC32 kontrolü atlanır (dosyanın tamamı okunmaz).
+    @classmethod
+    def ac_snapshot(cls, dosya_yolu: str, dogrula: bool = True, **secenekler) -> 'MetroAgi':
+        snapshot = MetroSnapshotu.ac(dosya_yolu, dogrula)
+        metro = cls(**secenekler)
+        metro.istasyonlar = _SnapshotIstasyonlari(snapshot)
+        metro._hatlar = None
+        metro._donuk = snapshot.donuk
+        # Yürüme bağlantıları görüntüdeki bağlantı bayraklarından geri kurulur (ağ değişip yeniden dondurulursa diye)
+        donuk = snapshot.donuk
+        bayraklar = bytes(donuk.yuruyus)
+        j = bayraklar.find(1)
+        while j != -1:
+            i = bisect_right(donuk.ofsetler, j) - 1
+            metro.yuruyus_baglantilari.add(metro._cift(donuk.kodlar[i], donuk.kodlar[donuk.hedefler[j]]))
+            j = bayraklar.find(1, j + 1)
+        return metro
+
+    def dondur(self) -> KompaktMetroAgi:
+        # Ağın kompakt (CSR) kopyasını döndürür; ağ değişmedikçe aynı kopya tekrar kullanılır.
+        if self._donuk is None:
+            self._donuk = KompaktMetroAgi.agdan_olustur(self)
+        self._donuk.kuyruk_turu = self.kuyruk_turu
+        return self._donuk
+
+    def on_hesapla(self, dosya_yolu: Optional[str] = None) -> RotaTablosu:
+        # Tüm çiftler süre / sonraki-adım tablolarını hazırlar; bundan sonra en_hizli_rota_bul tablo okur.
+        # dosya_yolu verilirse ve dosya bu ağa aitse mmap ile açılır (yeniden hesaplanmaz);
+        # yoksa hesaplanıp dosyaya yazılır ve oradan açılır. Böylece işçi süreçler tabloyu paylaşır.
+        donuk = self.dondur()
+        tablo = None
+        if dosya_yolu is not None and os.path.exists(dosya_yolu):
+            tablo = RotaTablosu.ac(dosya_yolu)
+            if tablo.n != len(donuk) or tablo.parmak_izi != donuk.parmak_izi():
+                tablo = None  # dosya başka bir ağa (ya da ağın eski haline) ait
+
+        if tablo is None:
+            tablo = RotaTablosu.hesapla(donuk)
+            if dosya_yolu is not None:
+                tablo.kaydet(dosya_yolu)
+                tablo = RotaTablosu.ac(dosya_yolu)
+
+        self._rota_tablosu = tablo
+        return tablo
+
+    # Çoktan çoğa rota matrisi: her farklı kaynak için tek bir "birden hepsine" Dijkstra çalıştırılır ve
+    # o kaynağın tüm hedefleri aynı arama ağacından cevaplanır. Sonuçlar üreteç (generator) olarak akar,
+    # böylece büyük matrisler bellekte hiçbir zaman bütün halde tutulmaz.
+    # (kaynak kodu, hedef kodu, sonuç) üretir; sonuç en_hizli_rota_bul ile aynı biçimdedir.
+    # rotalar=False verilirse sonuç yalnızca süredir (rota nesneleri oluşturulmaz).
+    def rota_matrisi(self, kaynaklar, hedefler, rotalar: bool = True):
+        donuk = self.dondur()
+        hedef_kodlari = list(dict.fromkeys(hedefler))
+        hedef_kimlikleri = {donuk.kod_indeksi[kod] for kod in hedef_kodlari if kod in donuk.kod_indeksi}
+
+        for kaynak_kodu in dict.fromkeys(kaynaklar):
+            if kaynak_kodu not in donuk.kod_indeksi:
+                for hedef_kodu in hedef_kodlari:
+                    yield kaynak_kodu, hedef_kodu, None
+                continue
+
+            kaynak = donuk.kod_indeksi[kaynak_kodu]
+            if self._rota_tablosu is not None:
+                tablo = self._rota_tablosu
+                mesafe = None
+            else:
+                mesafe, onceki, _ = donuk.tek_kaynak(kaynak, hedef_kimlikleri)
+
+            for hedef_kodu in hedef_kodlari:
+                hedef = donuk.kod_indeksi.get(hedef_kodu)
+                if hedef is None:
+                    yield kaynak_kodu, hedef_kodu, None
+                    continue
+
+                if mesafe is None:
+                    sure = tablo.sure(kaynak, hedef)
+                else:
+                    sure = None if mesafe[hedef] == SONSUZ else mesafe[hedef]
+
+                if sure is None:
+                    yield kaynak_kodu, hedef_kodu, None
+                elif not rotalar:
+                    yield kaynak_kodu, hedef_kodu, sure
+                else:
+                    yol = tablo.yol(kaynak, hedef) if mesafe is None else donuk._yol_olustur(onceki, kaynak, hedef)
+                    yield kaynak_kodu, hedef_kodu, (self._nesnele(donuk, yol), sure)
+
+    # Erişilebilirlik (izokron): kaynaktan en fazla dakika sürede ulaşılabilen istasyonlar, {kod: süre}
+    # (artan süre sırasıyla, kaynağın kendisi 0 ile dahil). Rota tablosu varsa tablonun satırı taranır.
+    def erisilebilir(self, kaynak_kodu, dakika) -> Dict[str, int]:
+        if kaynak_kodu not in self.istasyonlar:
+            return {}
+        return dict(self._onbellekten((kaynak_kodu, None, "erisim", dakika),
+                                      lambda: self._erisilebilir_hesapla(kaynak_kodu, dakika)))
+
+    def _erisilebilir_hesapla(self, kaynak_kodu, dakika) -> Dict[str, int]:
+        donuk = self.dondur()
+        kaynak = donuk.kod_indeksi[kaynak_kodu]
+        if self._rota_tablosu is not None:
+            tablo = self._rota_tablosu
+            taban = kaynak * tablo.n
+            sureler = ((tablo.sureler[taban + i], i) for i in range(tablo.n))
+            return {donuk.kodlar[i]: sure for sure, i in sorted(kayit for kayit in sureler if 0 <= kayit[0] <= dakika)}
+        return {donuk.kodlar[i]: sure for i, (sure, _) in donuk.butceli_arama((kaynak,), dakika).items()}
+
+    # Çok kaynaklı erişilebilirlik: tüm kaynaklar tek bir aramada işlenir; en az bir kaynaktan dakika süre içinde
+    # ulaşılabilen her istasyon için {kod: (süre, en yakın kaynağın kodu)} döndürür. Bilinmeyen kaynaklar atlanır.
+    def erisilebilir_coklu(self, kaynak_kodlari: Iterable[str], dakika) -> Dict[str, Tuple[int, str]]:
+        donuk = self.dondur()
+        kaynaklar = [donuk.kod_indeksi[kod] for kod in kaynak_kodlari if kod in donuk.kod_indeksi]
+        return {donuk.kodlar[i]: (sure, donuk.kodlar[kaynak])
+                for i, (sure, kaynak) in donuk.butceli_arama(kaynaklar, dakika).items()}
+
+    # Yolcu akışı simülasyonu: talep {(başlangıç kodu, hedef kodu): yolcu} sözlüğü ya da (başlangıç, hedef, yolcu)
+    # kayıtları olabilir; yolculuklar en hızlı rotalara atanır (ayrıntılar için YolcuAkisi).
+    # Bilinmeyen kodlar toplu_ekle'deki gibi tek hatada raporlanır.
+    def yolcu_akisi(self, talep) -> YolcuAkisi:
+        if isinstance(talep, Mapping):
+            talep = ((baslangic_kodu, hedef_kodu, yolcu) for (baslangic_kodu, hedef_kodu), yolcu in talep.items())
+        donuk = self.dondur()
+        kod_indeksi = donuk.kod_indeksi
+        kayitlar = []
+        bilinmeyenler: Set[str] = set()
+        for baslangic_kodu, hedef_kodu, yolcu in talep:
+            baslangic, hedef = kod_indeksi.get(baslangic_kodu), kod_indeksi.get(hedef_kodu)
+            if baslangic is None or hedef is None:
+                bilinmeyenler.update(kod for kod in (baslangic_kodu, hedef_kodu) if kod not in kod_indeksi)
+            else:
+                kayitlar.append((baslangic, hedef, yolcu))
+
+        if bilinmeyenler:
+            ornek = ", ".join(sorted(bilinmeyenler)[:20])
+            raise KeyError(f"{len(bilinmeyenler)} bilinmeyen istasyon kodu: {ornek}")
+        return YolcuAkisi.hesapla(donuk, kayitlar)
+
+    # Sonuç önbellekte varsa onu, yoksa hesapla() sonucunu döndürür ve önbelleğe koyar.
+    # Önbellekteki rota listeleri çağırana kopyalanarak verilir (çağıran değiştirse de önbellek bozulmaz).
+    def _onbellekten(self, anahtar, hesapla):
+        bulundu, sonuc = self.onbellek.al(anahtar, self.surum)
+        if not bulundu:
+            sonuc = hesapla()
+            self.onbellek.koy(anahtar, self.surum, sonuc)
+
+        if isinstance(sonuc, list):
+            return list(sonuc)
+        if isinstance(sonuc, tuple):
+            return (list(sonuc[0]),) + sonuc[1:]
+        return sonuc
+
+    # Ağın hatlarından düzenli aralıklı bir tarife (zaman çizelgesi) üretir; ayrıntılar için Tarife.hatlardan.
+    # Tarife üretildiği andaki ağa aittir, sonraki ağ değişikliklerini izlemez.
+    def tarife_olustur(self, ilk_sefer="06:00", son_sefer="24:00", aralik=Tarife.VARSAYILAN_ARALIK,
+                       durak_bekleme=0) -> Tarife:
+        return Tarife.hatlardan(self, ilk_sefer, son_sefer, aralik, durak_bekleme)
+
+    # Daraltma hiyerarşisini hazırlar; bundan sonra en_hizli_rota_bul hiyerarşi üzerinden sorgulanır.
+    # Çok büyük (bölgesel) ağlar için tek seferlik ön işlem karşılığında sorgular çok hızlanır.
+    def hiyerarsi_olustur(self) -> DaraltmaHiyerarsisi:
+        self._hiyerarsi = DaraltmaHiyerarsisi.olustur(self.dondur())
+        return self._hiyerarsi
+
+    # Arama ölçümünü açar: bundan sonra önbellekten gelmeyen her en_hizli_rota_bul / en_az_aktarma_bul araması
+    # sayaçlarla çalışır, olcum'a kaydedilir ve varsa geri_cagirma(istatistik) çağrılır.
+    def olcum_ac(self, geri_cagirma=None) -> AramaOlcumleri:
+        self.olcum = AramaOlcumleri(geri_cagirma)
+        return self.olcum
+
+    def olcum_kapat(self) -> None:
+        self.olcum = None
+
+    def _olcerek(self, algoritma: str, arama):
+        # arama(istatistik) çağrılır; ölçüm kapalıysa istatistik None'dur ve arama sayaçsız yapılır
+        olcum = self.olcum
+        if olcum is None:
+            return arama(None)
+        istatistik = AramaIstatistikleri(algoritma)
+        baslangic_zamani = time.perf_counter()
+        sonuc = arama(istatistik)
+        istatistik.sure_ms = (time.perf_counter() - baslangic_zamani) * 1000
+        olcum.kaydet(istatistik)
+        return sonuc
+
+    def _nesnele(self, donuk: KompaktMetroAgi, yol: List[int]) -> List[Istasyon]:
+        # Kimlik listesini istasyon nesnelerine çevirir
+        return [self.istasyonlar[donuk.kodlar[i]] for i in yol]
+
+    # BFS algoritması (en az durak):
+    # cift_yonlu=True verilirse arama baştan ve hedeften aynı anda yapılır (uzun rotalarda daha az istasyon gezilir)
+    # (eşit uzunluklu rotalardan farklısını bulabileceği için önbellekte ayrı tutulur)
+    def en_az_durak_bul(self, baslangic_kodu, hedef_kodu, cift_yonlu: bool = False) -> Optional[List[Istasyon]]:
         # Eğer başlangıç veya hedef istasyon yoksa None döndür
         if baslangic_kodu not in self.istasyonlar or hedef_kodu not in self.istasyonlar:
             return None  
+        return self._onbellekten((baslangic_kodu, hedef_kodu, "durak", cift_yonlu),
+                                 lambda: self._en_az_durak_hesapla(baslangic_kodu, hedef_kodu, cift_yonlu))
         
-        baslangic = self.istasyonlar[baslangic_kodu]
-        hedef = self.istasyonlar[hedef_kodu] #ilgili nesneleri tutar
+    def _en_az_durak_hesapla(self, baslangic_kodu, hedef_kodu, cift_yonlu: bool) -> Optional[List[Istasyon]]:
+        donuk = self.dondur()
+        baslangic, hedef = donuk.kod_indeksi[baslangic_kodu], donuk.kod_indeksi[hedef_kodu]
+        if cift_yonlu:
+            yol = donuk.en_az_durak(baslangic, hedef, cift_yonlu=True)
+        else:
+            yol = self._olcerek("bfs", lambda istatistik: donuk.en_az_durak(baslangic, hedef, istatistik=istatistik))
     
-        # BFS için kuyruk oluştur (istasyon, rota)
-        kuyruk = deque([(baslangic, [baslangic])])
-        ziyaret_edildi = {baslangic}
-        
-        while kuyruk:
-            mevcut_istasyon, rota = kuyruk.popleft()
-            
-            # Eğer hedef istasyona ulaşıldıysa, bulunan rotayı döndür
-            if mevcut_istasyon == hedef:
-                return rota
-            
-            # Komşu istasyonları kontrol et
-            for komsu, _ in mevcut_istasyon.komsu_istasyonlar:
-                if komsu not in ziyaret_edildi:
-                    ziyaret_edildi.add(komsu)
-                    kuyruk.append((komsu, rota + [komsu]))
-        
         # Rota bulunamazsa None döndür
-        return None
+        if yol is None:
+            return None
+        return self._nesnele(donuk, yol)
 
+    @property
+    def ad_indeksi(self) -> IstasyonAdIndeksi:
+        # Ad indeksi ilk kullanımda kurulur, ağ değişince yeniden kurulur
+        if self._ad_indeksi is None:
+            self._ad_indeksi = IstasyonAdIndeksi(self.istasyonlar.values())
+        return self._ad_indeksi
 
-    # A* algoritması:
+    # Otomatik tamamlama: ör. istasyon_ara("kız") -> ["Kızılay"]
+    def istasyon_ara(self, onek: str, adet: int = 10) -> List[str]:
+        return self.ad_indeksi.tamamla(onek, adet)
+
+    def _ad_kodlari(self, ad_ya_da_kod) -> List[str]:
+        # İstasyon kodu verildiyse yalnızca o istasyon, ad verildiyse adın bütün kümesi
+        if ad_ya_da_kod in self.istasyonlar:
+            return [ad_ya_da_kod]
+        return self.ad_indeksi.kodlar(ad_ya_da_kod)
+
+    # Addan ada en hızlı rota: başlangıç ve hedef adları (ya da kodları) aynı adlı istasyon kümelerine çevrilir ve
+    # tek bir çok kaynaklı / çok hedefli arama en iyi peron çiftini bulur. en_hizli_rota_bul ile aynı biçimde
+    # (rota, süre) döndürür; rota seçilen başlangıç peronuyla başlar, seçilen hedef peronuyla biter.
+    def ad_ile_rota_bul(self, baslangic_adi, hedef_adi) -> Optional[Tuple[List[Istasyon], int]]:
+        baslangic_kodlari, hedef_kodlari = self._ad_kodlari(baslangic_adi), self._ad_kodlari(hedef_adi)
+        if not baslangic_kodlari or not hedef_kodlari:
+            return None
+        return self._onbellekten((tuple(baslangic_kodlari), tuple(hedef_kodlari), "ad_hizli"),
+                                 lambda: self._ad_ile_rota_hesapla(baslangic_kodlari, hedef_kodlari))
 
-    def en_hizli_rota_bul(self, baslangic_kodu, hedef_kodu) -> Optional[Tuple[List[Istasyon], int]]:
+    def _ad_ile_rota_hesapla(self, baslangic_kodlari: List[str],
+                             hedef_kodlari: List[str]) -> Optional[Tuple[List[Istasyon], int]]:
+        donuk = self.dondur()
+        kaynaklar = [donuk.kod_indeksi[kod] for kod in baslangic_kodlari]
+        hedef_kumesi = {donuk.kod_indeksi[kod] for kod in hedef_kodlari}
+        sonuc = self._olcerek("kume_dijkstra",
+                              lambda istatistik: donuk.kumeler_arasi_en_kisa_sure(kaynaklar, hedef_kumesi, istatistik))
+        if sonuc is None:
+            return None
+        yol, sure = sonuc
+        return self._nesnele(donuk, yol), sure
+
+    # En az aktarmalı rota: hat değişimleri (farklı hattaki istasyona geçiş; bkz. KompaktMetroAgi.hat_anahtari)
+    # en aza indirilir, eşit aktarmalı rotalar arasından en kısa süreli olan seçilir.
+    # BetülŞakır_MetroSimulation.py'deki aynı adlı metot ise durak sayısını en aza indiren BFS'tir; onun
+    # karşılığı burada en_az_durak_bul'dur.
+    def en_az_aktarma_bul(self, baslangic_kodu, hedef_kodu) -> Optional[List[Istasyon]]:
+        sonuc = self.en_az_aktarma_detayli_bul(baslangic_kodu, hedef_kodu)
+        return None if sonuc is None else sonuc[0]
+
+    # (rota, aktarma sayısı, toplam süre) döndürür
+    def en_az_aktarma_detayli_bul(self, baslangic_kodu, hedef_kodu) -> Optional[Tuple[List[Istasyon], int, int]]:
         if baslangic_kodu not in self.istasyonlar or hedef_kodu not in self.istasyonlar:
             return None
+        return self._onbellekten((baslangic_kodu, hedef_kodu, "aktarma"),
+                                 lambda: self._en_az_aktarma_hesapla(baslangic_kodu, hedef_kodu))
 
-        baslangic = self.istasyonlar[baslangic_kodu]
-        hedef = self.istasyonlar[hedef_kodu]
-        
-        oncelik_kuyrugu = [(0, baslangic_kodu ,[baslangic_kodu])]  
+    def _en_az_aktarma_hesapla(self, baslangic_kodu, hedef_kodu) -> Optional[Tuple[List[Istasyon], int, int]]:
+        donuk = self.dondur()
+        baslangic, hedef = donuk.kod_indeksi[baslangic_kodu], donuk.kod_indeksi[hedef_kodu]
+        sonuc = self._olcerek("en_az_aktarma", lambda istatistik: donuk.en_az_aktarma(baslangic, hedef, istatistik))
+        if sonuc is None:
+            return None
+        yol, aktarma, sure = sonuc
+        return self._nesnele(donuk, yol), aktarma, sure
 
-        ziyaret_edilen = {} 
 
-        while oncelik_kuyrugu:
-            # Öncelik kuyruğundan en düşük süreli istasyonu al
-            mevcut_sure, mevcut_istasyon_kodu, gidilen_yol = heapq.heappop(oncelik_kuyrugu) 
+    # A* algoritması:
 
-            # Eğer hedef istasyona ulaşıldıysa, rotayı ve toplam süreyi döndür
-            if mevcut_istasyon_kodu == hedef.istasyon_kodu:
-                return [self.istasyonlar[istasyon_kodu] for istasyon_kodu in gidilen_yol], mevcut_sure
+    def en_hizli_rota_bul(self, baslangic_kodu, hedef_kodu, cift_yonlu: bool = False) -> Optional[Tuple[List[Istasyon], int]]:
+        if baslangic_kodu not in self.istasyonlar or hedef_kodu not in self.istasyonlar:
+            return None
+        return self._onbellekten((baslangic_kodu, hedef_kodu, "hizli", cift_yonlu),
+                                 lambda: self._en_hizli_rota_hesapla(baslangic_kodu, hedef_kodu, cift_yonlu))
 
-            # Eğer bu istasyona daha önce daha kısa sürede ulaşıldıysa, devam et
-            if mevcut_istasyon_kodu in ziyaret_edilen and ziyaret_edilen[mevcut_istasyon_kodu] <= mevcut_sure:
-                continue
+    def _en_hizli_rota_hesapla(self, baslangic_kodu, hedef_kodu, cift_yonlu: bool) -> Optional[Tuple[List[Istasyon], int]]:
+        donuk = self.dondur()
+        baslangic, hedef = donuk.kod_indeksi[baslangic_kodu], donuk.kod_indeksi[hedef_kodu]
+        if self._rota_tablosu is not None:
+            # Önceden hesaplanmış tablo varsa arama yapılmaz
+            tablo = self._rota_tablosu
+            yol = self._olcerek("tablo", lambda _: tablo.yol(baslangic, hedef))
+            if yol is None:
+                return None
+            return self._nesnele(donuk, yol), tablo.sure(baslangic, hedef)
 
-            # Ziyaret edilen istasyonları güncelle
-            ziyaret_edilen[mevcut_istasyon_kodu] = mevcut_sure
+        if self._hiyerarsi is not None:
+            hiyerarsi = self._hiyerarsi
+            sonuc = self._olcerek("daraltma", lambda istatistik: hiyerarsi.en_kisa_sure(baslangic, hedef, istatistik))
+        else:
+            # Tek yönlü aramada yer işaretli A*, çift yönlüde Dijkstra kullanılır
+            sonuc = self._olcerek("cift_yonlu_dijkstra" if cift_yonlu else "a_yildiz",
+                                  lambda istatistik: donuk.en_kisa_sure(baslangic, hedef, cift_yonlu, sezgisel=True,
+                                                                        istatistik=istatistik))
 
-            # Mevcut istasyonun komşularını (bağlantıları) kontrol et
-            for komsu, gecis_suresi in self.istasyonlar[mevcut_istasyon_kodu].komsu_istasyonlar:
-                yeni_sure = mevcut_sure + gecis_suresi  # Yeni toplam süreyi hesapla
+        if sonuc is None:
+            return None
+        yol, sure = sonuc
+        return self._nesnele(donuk, yol), sure
+    # k alternatif (döngüsüz) rota, süreye göre artan sırada: [(rota, süre), ...]; ilk rota her zaman en hızlısıdır.
+    # en_fazla_benzerlik (0-1) verilirse bir rota, daha önce seçilen her rotayla ortak bağlantılarının süresi kendi
+    # süresinin bu oranını aşmıyorsa seçilir; en_fazla_uzama verilirse en hızlı rotanın bu katından (ör. 1.5) uzun
+    # rotalar seçilmez. Benzerlik nedeniyle elenen adaylar k * ALTERNATIF_DENEME_CARPANI sayısını aşınca arama biter.
+    def alternatif_rotalar(self, baslangic_kodu, hedef_kodu, k: int = 3, en_fazla_benzerlik: Optional[float] = None,
+                           en_fazla_uzama: Optional[float] = None) -> List[Tuple[List[Istasyon], int]]:
+        if baslangic_kodu not in self.istasyonlar or hedef_kodu not in self.istasyonlar or k <= 0:
+            return []
+        sonuc = self._onbellekten((baslangic_kodu, hedef_kodu, "alternatif", k, en_fazla_benzerlik, en_fazla_uzama),
+                                  lambda: self._alternatif_rotalar_hesapla(baslangic_kodu, hedef_kodu, k,
+                                                                           en_fazla_benzerlik, en_fazla_uzama))
+        return [(list(rota), sure) for rota, sure in sonuc]
 
-                # Yeni istasyon ve güncellenmiş yol ile kuyruğa ekle
-                heapq.heappush(oncelik_kuyrugu, (yeni_sure, komsu.istasyon_kodu, gidilen_yol + [komsu.istasyon_kodu]))
+    def _alternatif_rotalar_hesapla(self, baslangic_kodu, hedef_kodu, k: int, en_fazla_benzerlik: Optional[float],
+                                    en_fazla_uzama: Optional[float]) -> List[Tuple[List[Istasyon], int]]:
+        donuk = self.dondur()
+        secilenler = []  # (yol, süre, {bağlantı: süre})
+        elenen = 0
+        for yol, sure in donuk.alternatif_rotalar(donuk.kod_indeksi[baslangic_kodu], donuk.kod_indeksi[hedef_kodu]):
+            if en_fazla_uzama is not None and secilenler and sure > secilenler[0][1] * en_fazla_uzama:
+                break
+            baglantilar = {(min(a, b), max(a, b)): donuk.baglanti_suresi(a, b) for a, b in zip(yol, yol[1:])}
+            if en_fazla_benzerlik is not None and any(
+                    sum(ortak for baglanti, ortak in baglantilar.items() if baglanti in onceki) > en_fazla_benzerlik * sure
+                    for _, _, onceki in secilenler):
+                elenen += 1
+                if elenen >= k * self.ALTERNATIF_DENEME_CARPANI:
+                    break
+                continue
+            secilenler.append((yol, sure, baglantilar))
+            if len(secilenler) == k:
+                break
+        return [(self._nesnele(donuk, yol), sure) for yol, sure, _ in secilenler]
 
-        return None
+    # Pareto rotaları: süre, aktarma sayısı ve yürüme süresi açısından birbirini geçemeyen rotaların tamamı,
+    # süreye göre artan sırada [(rota, süre, aktarma, yürüme süresi), ...]. Ör. AŞTİ'den Söğütözü'ne yürüyerek
+    # aktarmalı hızlı rota ile yürümeden giden daha uzun rota birlikte döner.
+    # en_fazla_aktarma verilirse daha çok aktarmalı, en_fazla_uzama verilirse en hızlı rotanın bu katından uzun
+    # rotalar aranmaz (büyük ağlarda etiket sayısını sınırlar).
+    def pareto_rotalar(self, baslangic_kodu, hedef_kodu, en_fazla_aktarma: Optional[int] = None,
+                       en_fazla_uzama: Optional[float] = None) -> List[Tuple[List[Istasyon], int, int, int]]:
+        if baslangic_kodu not in self.istasyonlar or hedef_kodu not in self.istasyonlar:
+            return []
+        sonuc = self._onbellekten((baslangic_kodu, hedef_kodu, "pareto", en_fazla_aktarma, en_fazla_uzama),
+                                  lambda: self._pareto_rotalar_hesapla(baslangic_kodu, hedef_kodu, en_fazla_aktarma,
+                                                                       en_fazla_uzama))
+        return [(list(rota), sure, aktarma, yuruyus) for rota, sure, aktarma, yuruyus in sonuc]
+
+    def _pareto_rotalar_hesapla(self, baslangic_kodu, hedef_kodu, en_fazla_aktarma: Optional[int],
+                                en_fazla_uzama: Optional[float]) -> List[Tuple[List[Istasyon], int, int, int]]:
+        donuk = self.dondur()
+        baslangic, hedef = donuk.kod_indeksi[baslangic_kodu], donuk.kod_indeksi[hedef_kodu]
+        cephe = self._olcerek("pareto", lambda istatistik: donuk.pareto_rotalar(baslangic, hedef, en_fazla_aktarma,
+                                                                                en_fazla_uzama, istatistik))
+        return [(self._nesnele(donuk, yol), sure, aktarma, yuruyus) for yol, sure, aktarma, yuruyus in cephe]
 
 
 # Örnek Kullanım
 if __name__ == "__main__":
     metro = MetroAgi()
 
-    # Kırmızı Hat M4 (KEÇİÖREN)
-    metro.istasyon_ekle("M4_1", "Kızılay", "Kırmızı Hat")  #aktarma
-    metro.istasyon_ekle("M4_2", "Adliye", "Kırmızı Hat")
-    metro.istasyon_ekle("M4_3", "Gar", "Kırmızı Hat") #aktarma --maltepe
-    metro.istasyon_ekle("M4_4", "Atatürk Kültür Merkezi", "Kırmızı Hat") #aktarma
-    metro.istasyon_ekle("M4_5", "ASKİ", "Kırmızı Hat")
-    metro.istasyon_ekle("M4_6", "Dışkapı", "Kırmızı Hat")
-    metro.istasyon_ekle("M4_7", "Meteoroloji", "Kırmızı Hat")
-    metro.istasyon_ekle("M4_8", "Belediye", "Kırmızı Hat")
-    metro.istasyon_ekle("M4_9", "Mecidiye", "Kırmızı Hat")
-    metro.istasyon_ekle("M4_10", "Kuyubaşı", "Kırmızı Hat")
-    metro.istasyon_ekle("M4_11", "Dutluk", "Kırmızı Hat")
-    metro.istasyon_ekle("M4_12", "Şehitler", "Kırmızı Hat")
-
-    # Yeşil Hat A1 (ANKARAY)
-    metro.istasyon_ekle("A1_1", "AŞTİ", "Yeşil Hat") # aktarma yürüyerek söğütözü
-    metro.istasyon_ekle("A1_2", "Emek", "Yeşil Hat")
-    metro.istasyon_ekle("A1_3", "Bahçelievler", "Yeşil Hat")
-    metro.istasyon_ekle("A1_4", "Beşevler", "Yeşil Hat")
-    metro.istasyon_ekle("A1_5", "Anadolu/ANITKABİR", "Yeşil Hat")
-    metro.istasyon_ekle("A1_6", "Maltepe", "Yeşil Hat") #aktarma --gar
-    metro.istasyon_ekle("A1_7", "Demirtepe", "Yeşil Hat")
-    metro.istasyon_ekle("A1_8", "Kızılay", "Yeşil Hat") #aktarma
-    metro.istasyon_ekle("A1_9", "Kolej", "Yeşil Hat")
-    metro.istasyon_ekle("A1_10", "Kurtuluş", "Yeşil Hat")
-    metro.istasyon_ekle("A1_11", "Dikimevi", "Yeşil Hat")
-
-    # Mavi Hat M2 (ÇAYYOLU)
-    metro.istasyon_ekle("M2_1", "Koru", "Mavi Hat")
-    metro.istasyon_ekle("M2_2", "Çayyolu", "Mavi Hat")
-    metro.istasyon_ekle("M2_3", "Ümitköy", "Mavi Hat")
-    metro.istasyon_ekle("M2_4", "Beytepe", "Mavi Hat")
-    metro.istasyon_ekle("M2_5", "Tarım Bakanlığı/Danıştay", "Mavi Hat")
-    metro.istasyon_ekle("M2_6", "Bilkent", "Mavi Hat")
-    metro.istasyon_ekle("M2_7", "ODTÜ", "Mavi Hat")
-    metro.istasyon_ekle("M2_8", "MTA", "Mavi Hat")
-    metro.istasyon_ekle("M2_9", "Söğütözü", "Mavi Hat") #aktarma yürüyerek aşti
-    metro.istasyon_ekle("M2_10", "Milli Kütüphane", "Mavi Hat")
-    metro.istasyon_ekle("M2_11", "Necatibey", "Mavi Hat")
-    metro.istasyon_ekle("M2_12", "Kızılay", "Mavi Hat") #aktarma
-
-    # Mavi Hat M1 (BATIKENT)
-    metro.istasyon_ekle("M1_1", "Kızılay", "Mavi Hat") #aktarma
-    metro.istasyon_ekle("M1_2", "Sıhhiye", "Mavi Hat")
-    metro.istasyon_ekle("M1_3", "Ulus", "Mavi Hat")
-    metro.istasyon_ekle("M1_4", "Atatürk Kültür Merkezi", "Mavi Hat") #aktarma
-    metro.istasyon_ekle("M1_5", "Akköprü", "Mavi Hat")
-    metro.istasyon_ekle("M1_6", "İvedik", "Mavi Hat")
-    metro.istasyon_ekle("M1_7", "Yenimahalle", "Mavi Hat")
-    metro.istasyon_ekle("M1_8", "Demetevler", "Mavi Hat")
-    metro.istasyon_ekle("M1_9", "Hastane", "Mavi Hat")
-    metro.istasyon_ekle("M1_10", "Macunköy", "Mavi Hat")
-    metro.istasyon_ekle("M1_11", "Ostim", "Mavi Hat")
-    metro.istasyon_ekle("M1_12", "Batıkent", "Mavi Hat")
-
-    # Mavi Hat M3 (SİNCAN)
-    metro.istasyon_ekle("M3_1", "Batıkent", "Mavi Hat") #aktarma
-    metro.istasyon_ekle("M3_2", "Batı Merkez", "Mavi Hat")
-    metro.istasyon_ekle("M3_3", "Mesa", "Mavi Hat")
-    metro.istasyon_ekle("M3_4", "Botanik", "Mavi Hat")
-    metro.istasyon_ekle("M3_5", "İstanbul Yolu", "Mavi Hat")
-    metro.istasyon_ekle("M3_6", "Eryaman 1-2", "Mavi Hat")
-    metro.istasyon_ekle("M3_7", "Eryaman 5", "Mavi Hat")
-    metro.istasyon_ekle("M3_8", "Devlet Mah.", "Mavi Hat")
-    metro.istasyon_ekle("M3_9", "Harikalar Diyarı", "Mavi Hat")
-    metro.istasyon_ekle("M3_10", "Fatih", "Mavi Hat")
-    metro.istasyon_ekle("M3_11", "GOP", "Mavi Hat")
-    metro.istasyon_ekle("M3_12", "OSB-Törekent", "Mavi Hat")
-
-
-        # Gri Hat (BAŞKENTRAY)
-    metro.istasyon_ekle("B_1", "Kayaş", "Gri Hat") 
-    metro.istasyon_ekle("B_2", "Köstence", "Gri Hat")
-    metro.istasyon_ekle("B_3", "Üreğil", "Gri Hat")
-    metro.istasyon_ekle("B_4", "Bağderesi", "Gri Hat")
-    metro.istasyon_ekle("B_5", "Mamak", "Gri Hat")
-    metro.istasyon_ekle("B_6", "Saimekadın", "Gri Hat")
-    metro.istasyon_ekle("B_7", "Demirlibahçe", "Gri Hat")
-    metro.istasyon_ekle("B_8", "Cebeci", "Gri Hat")
-    metro.istasyon_ekle("B_9", "Kurtuluş", "Gri Hat") #aktarma
-    metro.istasyon_ekle("B_10", "Yenişehir", "Gri Hat") #aktarma ---Sıhhiye
-    metro.istasyon_ekle("B_11", "YHT", "Gri Hat") #aktarma--gar maltepe
-    metro.istasyon_ekle("B_12", "Hipodrom", "Gri Hat")
-    metro.istasyon_ekle("B_13", "Gazimahallesi", "Gri Hat")
-    metro.istasyon_ekle("B_14", "Gazi", "Gri Hat")
-    metro.istasyon_ekle("B_15", "Motor", "Gri Hat")
-    metro.istasyon_ekle("B_16", "Behiçbey", "Gri Hat")
-    metro.istasyon_ekle("B_17", "Yıldırım", "Gri Hat")
-    metro.istasyon_ekle("B_18", "Havadurağı", "Gri Hat")
-    metro.istasyon_ekle("B_19", "Etimesgut", "Gri Hat")
-    metro.istasyon_ekle("B_20", "Özgüneş", "Gri Hat")
-    metro.istasyon_ekle("B_21", "Eryaman YHT", "Gri Hat")
-    metro.istasyon_ekle("B_22", "Elvankent", "Gri Hat")
-    metro.istasyon_ekle("B_23", "Lale", "Gri Hat")
-    metro.istasyon_ekle("B_24", "Sincan", "Gri Hat")
-
-
-    
-    # Sarı Hat (ŞENTEPE TELEFERİK)
-    metro.istasyon_ekle("T1_1", "Yenimahalle", "Sarı Hat")
-    metro.istasyon_ekle("T1_2", "Yunus Emre", "Sarı Hat")
-    metro.istasyon_ekle("T1_3", "TRT Seyir", "Sarı Hat")
-    metro.istasyon_ekle("T1_4", "Şentepe", "Sarı Hat")
-
-
-    # Connections
-    metro.baglanti_ekle("M4_1", "A1_8", 5)
-    metro.baglanti_ekle("M4_1", "M1_1", 5)
-    metro.baglanti_ekle("M4_1", "M2_12", 5)
-
-    metro.baglanti_ekle("A1_8", "M2_11", 3)
-    metro.baglanti_ekle("A1_8", "M1_1", 3)
-    metro.baglanti_ekle("M2_12", "M1_1", 2)
-
-    metro.baglanti_ekle("M4_3", "A1_6", 4)
-    metro.baglanti_ekle("M4_4", "M1_4", 3)
-
-    metro.baglanti_ekle("M4_1", "M4_2", 2)
-    metro.baglanti_ekle("M4_2", "M4_3", 2)
-    metro.baglanti_ekle("M4_3", "M4_4", 2)
-    metro.baglanti_ekle("M4_4", "M4_5", 2)
-    metro.baglanti_ekle("M4_5", "M4_6", 2)
-    metro.baglanti_ekle("M4_6", "M4_7", 2)
-    metro.baglanti_ekle("M4_7", "M4_8", 2)
-    metro.baglanti_ekle("M4_8", "M4_9", 2)
-    metro.baglanti_ekle("M4_9", "M4_10", 2)
-    metro.baglanti_ekle("M4_10", "M4_11", 2)
-    metro.baglanti_ekle("M4_11", "M4_12", 2)
-
-    metro.baglanti_ekle("A1_1", "M2_9", 10)
-
-    metro.baglanti_ekle("A1_1", "A1_2", 2)
-    metro.baglanti_ekle("A1_2", "A1_3", 2)
-    metro.baglanti_ekle("A1_3", "A1_4", 2)
-    metro.baglanti_ekle("A1_4", "A1_5", 2)
-    metro.baglanti_ekle("A1_5", "A1_6", 2)
-    metro.baglanti_ekle("A1_6", "A1_7", 2)
-    metro.baglanti_ekle("A1_7", "A1_8", 2)
-    metro.baglanti_ekle("A1_8", "A1_9", 2)
-    metro.baglanti_ekle("A1_9", "A1_10", 2)
-    metro.baglanti_ekle("A1_10", "A1_11", 2)
-
-    metro.baglanti_ekle("M2_1", "M2_2", 3)
-    metro.baglanti_ekle("M2_2", "M2_3", 3)
-    metro.baglanti_ekle("M2_3", "M2_4", 3)
-    metro.baglanti_ekle("M2_4", "M2_5", 3)
-    metro.baglanti_ekle("M2_5", "M2_6", 3)
-    metro.baglanti_ekle("M2_6", "M2_7", 3)
-    metro.baglanti_ekle("M2_7", "M2_8", 3)
-    metro.baglanti_ekle("M2_8", "M2_9", 3)
-    metro.baglanti_ekle("M2_9", "M2_10", 3)
-    metro.baglanti_ekle("M2_10", "M2_11", 3)
-    metro.baglanti_ekle("M2_11", "M2_12", 3)
-
-    metro.baglanti_ekle("M1_1", "M1_2", 3)
-    metro.baglanti_ekle("M1_2", "M1_3", 3)
-    metro.baglanti_ekle("M1_3", "M1_4", 3)
-    metro.baglanti_ekle("M1_4", "M1_5", 3)
-    metro.baglanti_ekle("M1_5", "M1_6", 3)
-    metro.baglanti_ekle("M1_6", "M1_7", 3)
-    metro.baglanti_ekle("M1_7", "M1_8", 3)
-    metro.baglanti_ekle("M1_8", "M1_9", 3)
-    metro.baglanti_ekle("M1_9", "M1_10", 3)
-    metro.baglanti_ekle("M1_10", "M1_11", 3)
-    metro.baglanti_ekle("M1_11", "M1_12", 3)
-
-    metro.baglanti_ekle("M3_1", "M3_2", 3)
-    metro.baglanti_ekle("M3_2", "M3_3", 3)
-    metro.baglanti_ekle("M3_3", "M3_4", 3)
-    metro.baglanti_ekle("M3_4", "M3_5", 3)
-    metro.baglanti_ekle("M3_5", "M3_6", 3)
-    metro.baglanti_ekle("M3_6", "M3_7", 3)
-    metro.baglanti_ekle("M3_7", "M3_8", 3)
-    metro.baglanti_ekle("M3_8", "M3_9", 3)
-    metro.baglanti_ekle("M3_9", "M3_10", 3)
-    metro.baglanti_ekle("M3_10", "M3_11", 3)
-    metro.baglanti_ekle("M3_11", "M3_12", 3)
-
-    metro.baglanti_ekle("M3_1", "M1_12", 2)
-
-    metro.baglanti_ekle("B_1", "B_2", 3)
-    metro.baglanti_ekle("B_2", "B_3", 3)
-    metro.baglanti_ekle("B_3", "B_4", 3)
-    metro.baglanti_ekle("B_4", "B_5", 3)
-    metro.baglanti_ekle("B_5", "B_6", 3)
-    metro.baglanti_ekle("B_6", "B_7", 3)
-    metro.baglanti_ekle("B_7", "B_8", 3)
-    metro.baglanti_ekle("B_8", "B_9", 3)
-    metro.baglanti_ekle("B_9", "B_10", 3)
-    metro.baglanti_ekle("B_10", "B_11", 3)
-    metro.baglanti_ekle("B_11", "B_12", 3)
-    metro.baglanti_ekle("B_12", "B_13", 3)
-    metro.baglanti_ekle("B_13", "B_14", 3)
-    metro.baglanti_ekle("B_14", "B_15", 3)
-    metro.baglanti_ekle("B_15", "B_16", 3)
-    metro.baglanti_ekle("B_16", "B_17", 3)
-    metro.baglanti_ekle("B_17", "B_18", 3)
-    metro.baglanti_ekle("B_18", "B_19", 3)
-    metro.baglanti_ekle("B_19", "B_20", 3)
-    metro.baglanti_ekle("B_20", "B_21", 3)
-    metro.baglanti_ekle("B_21", "B_22", 3)
-    metro.baglanti_ekle("B_22", "B_23", 3)
-    metro.baglanti_ekle("B_23", "B_24", 3)
-
-    metro.baglanti_ekle("B_9", "A1_10", 5)
-    metro.baglanti_ekle("B_10", "M1_2", 5)
-
-    metro.baglanti_ekle("B_11", "A1_6", 4)
-    metro.baglanti_ekle("B_11", "M4_3", 4)
-
-    metro.baglanti_ekle("T1_1", "T1_2", 4)
-    metro.baglanti_ekle("T1_2", "T1_3", 4)
-    metro.baglanti_ekle("T1_3", "T1_4", 4)
-
-    metro.baglanti_ekle("T1_1", "M1_7", 4)
+    # Ankara raylı sistem ağı (istasyonlar ve bağlantılar veri/ankara klasöründeki CSV dosyalarında)
+    metro.yukle(os.path.join(os.path.dirname(os.path.abspath(__file__)), "veri", "ankara"))
 
     # Test senaryoları
     print("\n=== Test Senaryoları ===")
@@ -6,6 +6,9 @@ from typing import Dict, List, Set, Tuple, Optional
 # oop nesne yönelimli prensibi kullandık metroağı yapısı istasyonu kullandı
 
 class Istasyon:
+    # __slots__ ile her istasyon nesnesi __dict__ taşımaz, büyük ağlarda bellek tasarrufu sağlar
+    __slots__ = ("istasyon_kodu", "istasyon_adi", "hat_adi", "komsu_istasyonlar")
+
     def __init__(self, istasyon_kodu, istasyon_adi, hat_adi):
         # Her istasyonun bir kodu, adı ve bağlı olduğu bir hat vardır.
         self.istasyon_kodu = istasyon_kodu  # İstasyonun benzersiz kimlik kodu
@@ -20,10 +23,19 @@ class Istasyon:
         self.komsu_istasyonlar.append((komsu_istasyon, gecis_suresi))
 
 
+# Bu varyant bilerek nesne grafı üzerinde çalışır: aramalar Istasyon nesnelerinin komsu_istasyonlar listelerini izler.
+# Kompakt (CSR) dondurulmuş ağ yalnızca ANKARA_MetroSimulation.py'dedir (MetroAgi.dondur, KompaktMetroAgi).
+# MetroBenchmark.py bu dosyayı karşılaştırma tabanı olarak ölçer ve genişletilen istasyonları komsu_istasyonlar
+# listelerini sayaçlı listelerle değiştirerek sayar; bu yüzden burada Istasyon'a yalnızca __slots__ eklenmiştir.
+
 class MetroAgi:
+    YER_ISARETI_ADEDI = 4  # A* alt sınırları için kullanılan yer işareti (landmark) istasyonu sayısı
+
     def __init__(self):
         self.istasyonlar: Dict[str, Istasyon] = {}
         self.hatlar: Dict[str, List[Istasyon]] = defaultdict(list)
+        # Yer işareti kodu -> (istasyon kodu -> süre) sözlüğü; ağ değişince sıfırlanır, ilk A* çağrısında hesaplanır
+        self.yer_isaretleri: Optional[Dict[str, Dict[str, int]]] = None
 
     def istasyon_ekle(self, istasyon_kodu, istasyon_adi, hat_adi) -> None:
         # Eğer bu istasyon koduna sahip bir istasyon henüz eklenmemişse eklenir.
@@ -31,6 +43,7 @@ class MetroAgi:
             istasyon = Istasyon(istasyon_kodu, istasyon_adi, hat_adi) # Yeni bir istasyon nesnesi oluşturulur
             self.istasyonlar[istasyon_kodu] = istasyon
             self.hatlar[hat_adi].append(istasyon)
+            self.yer_isaretleri = None
 
     def baglanti_ekle(self, istasyon1_kodu, istasyon2_kodu, gecis_suresi) -> None:
         # Belirtilen istasyon kodlarına sahip istasyon nesneleri alınır.
@@ -40,8 +53,12 @@ class MetroAgi:
         # İstasyonların birbirleriyle bağlantılı olduğunu belirten komşuluk bilgisi eklenir.
         istasyon1.komsu_ekle(istasyon2, gecis_suresi)  
         istasyon2.komsu_ekle(istasyon1, gecis_suresi)   #(çift yönlü bağlantı)
+        self.yer_isaretleri = None
 
     # BFS algoritması:
+    # Bu varyantta en_az_aktarma_bul durak sayısını en aza indirir (her bağlantı bir adımdır), hat değişimlerini
+    # saymaz. ANKARA_MetroSimulation.py'deki aynı adlı metot ise hat değişimlerini en aza indirir; oradaki durak
+    # sayısı karşılığı en_az_durak_bul'dur.
 
     def en_az_aktarma_bul(self, baslangic_kodu, hedef_kodu) -> Optional[List[Istasyon]]:
         # Eğer başlangıç veya hedef istasyon yoksa None döndür
@@ -72,11 +89,55 @@ class MetroAgi:
         return None
 
 
+    # Bir istasyondan tüm istasyonlara en kısa süreler (Dijkstra)
+    def tum_sureler(self, baslangic_kodu) -> Dict[str, int]:
+        sureler = {baslangic_kodu: 0}
+        oncelik_kuyrugu = [(0, baslangic_kodu)]
+        while oncelik_kuyrugu:
+            mevcut_sure, mevcut_istasyon_kodu = heapq.heappop(oncelik_kuyrugu)
+            if sureler[mevcut_istasyon_kodu] < mevcut_sure:
+                continue
+            for komsu, gecis_suresi in self.istasyonlar[mevcut_istasyon_kodu].komsu_istasyonlar:
+                yeni_sure = mevcut_sure + gecis_suresi
+                if yeni_sure < sureler.get(komsu.istasyon_kodu, yeni_sure + 1):
+                    sureler[komsu.istasyon_kodu] = yeni_sure
+                    heapq.heappush(oncelik_kuyrugu, (yeni_sure, komsu.istasyon_kodu))
+        return sureler
+
+    # Yer işaretlerini seçer: her seferinde seçilmişlere en uzak istasyon alınır (ağın uçlarına yayılırlar)
+    def yer_isaretlerini_hazirla(self) -> Dict[str, Dict[str, int]]:
+        self.yer_isaretleri = {}
+        if not self.istasyonlar:
+            return self.yer_isaretleri
+
+        en_yakin = self.tum_sureler(next(iter(self.istasyonlar)))
+        for _ in range(min(self.YER_ISARETI_ADEDI, len(self.istasyonlar))):
+            adaylar = [kod for kod in en_yakin if kod not in self.yer_isaretleri]
+            if not adaylar:
+                break
+            yer_isareti = max(adaylar, key=en_yakin.get)
+            sureler = self.tum_sureler(yer_isareti)
+            if not self.yer_isaretleri:
+                en_yakin = dict(sureler)
+            else:
+                en_yakin = {kod: min(sure, sureler[kod]) for kod, sure in en_yakin.items()}
+            self.yer_isaretleri[yer_isareti] = sureler
+        return self.yer_isaretleri
+
     # Heuristik fonksiyon: Tahmini mesafeyi hesaplar
     def heuristik(self, istasyon1: 'Istasyon', istasyon2: 'Istasyon') -> int:
-        # Örnek olarak istasyon kodlarının numaralarına göre bir fark alıyoruz.
-        # Gerçek bir uygulamada, coğrafi mesafeye göre hesaplanabilir.
-        return abs(int(istasyon1.istasyon_kodu[1:]) - int(istasyon2.istasyon_kodu[1:]))
+        # Üçgen eşitsizliği: her yer işareti L için |d(L, istasyon2) - d(L, istasyon1)| <= d(istasyon1, istasyon2).
+        # Bu alt sınır gerçek süreyi asla aşmaz (kabul edilebilir), bu yüzden A* en hızlı rotayı bulur.
+        if self.yer_isaretleri is None:
+            self.yer_isaretlerini_hazirla()
+
+        tahmin = 0
+        for sureler in self.yer_isaretleri.values():
+            sure1 = sureler.get(istasyon1.istasyon_kodu)
+            sure2 = sureler.get(istasyon2.istasyon_kodu)
+            if sure1 is not None and sure2 is not None:
+                tahmin = max(tahmin, abs(sure1 - sure2))
+        return tahmin
 
     # A* algoritması (güncellenmiş)
     def en_hizli_rota_bul(self, baslangic_kodu, hedef_kodu) -> Optional[Tuple[List[Istasyon], int]]:
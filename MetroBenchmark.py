@@ -0,0 +1,265 @@
+# Rota algoritmaları için sentetik şehir üreteci ve kıyaslama (benchmark) aracı.
+# İki varyant ölçülür: ANKARA_MetroSimulation.py (kompakt graf, Dijkstra/ALT A*) ve
+# BetülŞakır_MetroSimulation.py (nesne grafı, yer işaretli A*). ANKARA sürümü ayrıca öncelik kuyruğu arka ucuna göre
+# ölçülebilir: "ankara" otomatik seçimi (tam sayı sürelerde Dial kovaları), "ankara_heapq" ve "ankara_radix" ise
+# ikili yığını ve radix yığınını kullanır (--varyant ile seçilir). Her boyut için ALGORITMALAR'daki sorguların
+# p50/p99 gecikmesi, genişletilen istasyon sayısı ve tepe bellek kullanımı raporlanır; sonuçlar JSON olarak yazılıp
+# sürümler arasında karşılaştırılabilir.
+#
+# Kullanım:
+#   python MetroBenchmark.py --boyut 10x20 --boyut 40x50 --sorgu 200 --cikti sonuc.json
+#   python MetroBenchmark.py --karsilastir onceki.json
+
+import argparse
+import importlib
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+import ANKARA_MetroSimulation as ankara
+
+betul = importlib.import_module("BetülŞakır_MetroSimulation")
+
+SONUC_SURUMU = 2  # JSON çıktısının biçim sürümü (2: en_az_durak_bul satırları, Betül'de en_az_aktarma_bul yok)
+VARSAYILAN_BOYUTLAR = [(10, 20), (40, 50), (100, 100)]  # (hat sayısı, hat başına istasyon)
+# Raporlanan algoritma adı -> varyantın metodu. Aynı addaki satırlar aynı problemi çözer: Betül'ün
+# en_az_aktarma_bul'u durak sayısını en aza indiren BFS'tir, ANKARA'daki karşılığı en_az_durak_bul'dur.
+# ANKARA'nın hat farkındalıklı en_az_aktarma_bul'unun Betül'de karşılığı yoktur, yalnızca ANKARA varyantlarında ölçülür.
+ALGORITMALAR = ("en_az_durak_bul", "en_az_aktarma_bul", "en_hizli_rota_bul")
+ANKARA_METOTLARI = {algoritma: algoritma for algoritma in ALGORITMALAR}
+BETUL_METOTLARI = {"en_az_durak_bul": "en_az_aktarma_bul", "en_hizli_rota_bul": "en_hizli_rota_bul"}
+
+
+# Sentetik şehir: hat_sayisi adet hat, her hatta hat_basina_istasyon istasyon (ardışık istasyonlar 2-10 dk),
+# hatlar arasında rastgele aktarma bağlantıları (2-6 dk). Aynı tohum her zaman aynı ağı üretir.
+def sentetik_sehir(metro_sinifi, hat_sayisi: int, hat_basina_istasyon: int,
+                   aktarma_sayisi: Optional[int] = None, tohum: int = 0):
+    rastgele = random.Random(tohum)
+    if aktarma_sayisi is None:
+        aktarma_sayisi = hat_sayisi * 3
+
+    metro = metro_sinifi()
+    for hat in range(hat_sayisi):
+        for i in range(hat_basina_istasyon):
+            metro.istasyon_ekle(f"H{hat}_{i}", f"İstasyon {hat}-{i}", f"Hat {hat}")
+
+    for hat in range(hat_sayisi):
+        for i in range(1, hat_basina_istasyon):
+            metro.baglanti_ekle(f"H{hat}_{i - 1}", f"H{hat}_{i}", rastgele.randint(2, 10))
+
+    # Önce hatlar bir zincirle birbirine bağlanır (ağ bağlantılı kalsın), kalanlar rastgele aktarmalardır
+    for hat in range(1, hat_sayisi):
+        metro.baglanti_ekle(f"H{hat - 1}_{rastgele.randrange(hat_basina_istasyon)}",
+                            f"H{hat}_{rastgele.randrange(hat_basina_istasyon)}", rastgele.randint(2, 6))
+    for _ in range(max(0, aktarma_sayisi - (hat_sayisi - 1))):
+        hat1, hat2 = rastgele.sample(range(hat_sayisi), 2) if hat_sayisi > 1 else (0, 0)
+        metro.baglanti_ekle(f"H{hat1}_{rastgele.randrange(hat_basina_istasyon)}",
+                            f"H{hat2}_{rastgele.randrange(hat_basina_istasyon)}", rastgele.randint(2, 6))
+    return metro
+
+
+def yuzdelik(degerler: List[float], oran: float) -> float:
+    # En yakın sıra (nearest-rank) yöntemiyle yüzdelik
+    if not degerler:
+        return 0.0
+    sirali = sorted(degerler)
+    return sirali[max(0, math.ceil(oran * len(sirali)) - 1)]
+
+
+# Genişletilen istasyon sayısı: ANKARA sürümünde arama ölçümünden (AramaIstatistikleri.kesinlesen),
+# nesne grafında ise sayaçlı komşu listeleriyle ölçülür. Ölçüm ayrı bir turda yapılır, gecikme ölçümünü etkilemez.
+
+class _SayacliListe(list):
+    # Nesne grafında komşu listesi; her genişletmede liste bir kez dolaşılır
+    sayac = [0]
+
+    def __iter__(self):
+        _SayacliListe.sayac[0] += 1
+        return super().__iter__()
+
+
+def _genisletilenler_ankara(metro, metot: str, sorgular) -> List[int]:
+    olcum = metro.olcum_ac()
+    sonuc = []
+    try:
+        for baslangic, hedef in sorgular:
+            getattr(metro, metot)(baslangic, hedef)
+            sonuc.append(olcum.son.kesinlesen)
+    finally:
+        metro.olcum_kapat()
+    return sonuc
+
+
+def _genisletilenler_betul(metro, metot: str, sorgular) -> List[int]:
+    asil = {kod: istasyon.komsu_istasyonlar for kod, istasyon in metro.istasyonlar.items()}
+    for istasyon in metro.istasyonlar.values():
+        istasyon.komsu_istasyonlar = _SayacliListe(istasyon.komsu_istasyonlar)
+    sonuc = []
+    try:
+        for baslangic, hedef in sorgular:
+            _SayacliListe.sayac[0] = 0
+            getattr(metro, metot)(baslangic, hedef)
+            sonuc.append(_SayacliListe.sayac[0])
+    finally:
+        for kod, istasyon in metro.istasyonlar.items():
+            istasyon.komsu_istasyonlar = asil[kod]
+    return sonuc
+
+
+VARYANTLAR = {
+    # ad: (MetroAgi oluşturucu, ön hazırlık, genişletme sayacı, algoritma adı -> metot)
+    "ankara": (lambda: ankara.MetroAgi(onbellek_kapasitesi=0),  # önbellek kapalı: her sorgu gerçekten aranır
+               lambda metro: metro.dondur().yer_isaretleri(),
+               _genisletilenler_ankara, ANKARA_METOTLARI),
+    "ankara_heapq": (lambda: ankara.MetroAgi(onbellek_kapasitesi=0, kuyruk_turu="heapq"),
+                     lambda metro: metro.dondur().yer_isaretleri(),
+                     _genisletilenler_ankara, ANKARA_METOTLARI),
+    "ankara_radix": (lambda: ankara.MetroAgi(onbellek_kapasitesi=0, kuyruk_turu="radix"),
+                     lambda metro: metro.dondur().yer_isaretleri(),
+                     _genisletilenler_ankara, ANKARA_METOTLARI),
+    "betul": (betul.MetroAgi,
+              lambda metro: metro.yer_isaretlerini_hazirla(),
+              _genisletilenler_betul, BETUL_METOTLARI),
+}
+
+
+def olc(varyant: str, hat_sayisi: int, hat_basina_istasyon: int, sorgu_sayisi: int = 200,
+        tohum: int = 0) -> List[Dict]:
+    if sorgu_sayisi < 1:
+        raise ValueError(f"sorgu sayısı en az 1 olmalı: {sorgu_sayisi}")
+    olusturucu, hazirla, genisletilenler, metotlar = VARYANTLAR[varyant]
+    metro = sentetik_sehir(olusturucu, hat_sayisi, hat_basina_istasyon, tohum=tohum)
+    hazirla(metro)  # yer işaretleri gibi tek seferlik hazırlık ölçüme katılmaz
+
+    kodlar = list(metro.istasyonlar)
+    rastgele = random.Random(tohum + 1)
+    sorgular = [(rastgele.choice(kodlar), rastgele.choice(kodlar)) for _ in range(sorgu_sayisi)]
+    baglanti_sayisi = sum(len(istasyon.komsu_istasyonlar) for istasyon in metro.istasyonlar.values()) // 2
+
+    sonuclar = []
+    for algoritma in ALGORITMALAR:
+        metot = metotlar.get(algoritma)
+        if metot is None:
+            continue  # bu varyantta karşılığı yok
+        fonksiyon = getattr(metro, metot)
+
+        sureler = []
+        for baslangic, hedef in sorgular:
+            t0 = time.perf_counter()
+            fonksiyon(baslangic, hedef)
+            sureler.append((time.perf_counter() - t0) * 1000)
+
+        genisletilen = genisletilenler(metro, metot, sorgular)
+
+        # Tepe bellek: tracemalloc yavaşlattığı için ayrı bir turda, sorgu başına ölçülür
+        tepeler = []
+        tracemalloc.start()
+        for baslangic, hedef in sorgular[:min(50, len(sorgular))]:
+            tracemalloc.reset_peak()
+            taban = tracemalloc.get_traced_memory()[0]
+            fonksiyon(baslangic, hedef)
+            tepeler.append(tracemalloc.get_traced_memory()[1] - taban)
+        tracemalloc.stop()
+
+        sonuclar.append({
+            "varyant": varyant,
+            "algoritma": algoritma,
+            "hat_sayisi": hat_sayisi,
+            "hat_basina_istasyon": hat_basina_istasyon,
+            "istasyon": len(kodlar),
+            "baglanti": baglanti_sayisi,
+            "sorgu": sorgu_sayisi,
+            "p50_ms": round(yuzdelik(sureler, 0.50), 4),
+            "p99_ms": round(yuzdelik(sureler, 0.99), 4),
+            "ortalama_ms": round(sum(sureler) / len(sureler), 4),
+            "genisletilen_p50": yuzdelik(genisletilen, 0.50),
+            "genisletilen_ortalama": round(sum(genisletilen) / len(genisletilen), 2),
+            "tepe_bellek_p50_bayt": yuzdelik(tepeler, 0.50),
+            "tepe_bellek_maks_bayt": max(tepeler),
+        })
+    return sonuclar
+
+
+def calistir(boyutlar: List[Tuple[int, int]], sorgu_sayisi: int = 200, tohum: int = 0,
+             varyantlar=tuple(VARYANTLAR)) -> Dict:
+    sonuclar = []
+    for hat_sayisi, hat_basina_istasyon in boyutlar:
+        for varyant in varyantlar:
+            sonuclar.extend(olc(varyant, hat_sayisi, hat_basina_istasyon, sorgu_sayisi, tohum))
+    return {
+        "surum": SONUC_SURUMU,
+        "zaman": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tohum": tohum,
+        "sonuclar": sonuclar,
+    }
+
+
+def _anahtar(sonuc: Dict) -> Tuple:
+    return sonuc["varyant"], sonuc["algoritma"], sonuc["hat_sayisi"], sonuc["hat_basina_istasyon"]
+
+
+# Önceki bir çalıştırmaya göre p50 gecikmesi esik oranından fazla artan ölçümleri döndürür
+def gerilemeler(onceki: Dict, simdiki: Dict, esik: float = 1.2) -> List[Tuple[Tuple, float, float]]:
+    eski = {_anahtar(sonuc): sonuc for sonuc in onceki["sonuclar"]}
+    bulunan = []
+    for sonuc in simdiki["sonuclar"]:
+        karsilik = eski.get(_anahtar(sonuc))
+        if karsilik and karsilik["p50_ms"] > 0 and sonuc["p50_ms"] / karsilik["p50_ms"] > esik:
+            bulunan.append((_anahtar(sonuc), karsilik["p50_ms"], sonuc["p50_ms"]))
+    return bulunan
+
+
+def tablo_yazdir(rapor: Dict) -> None:
+    print(f"{'varyant':12} {'algoritma':18} {'istasyon':>8} {'p50 ms':>9} {'p99 ms':>9} "
+          f"{'genişletilen':>12} {'tepe bellek':>12}")
+    for sonuc in rapor["sonuclar"]:
+        print(f"{sonuc['varyant']:12} {sonuc['algoritma']:18} {sonuc['istasyon']:>8} {sonuc['p50_ms']:>9.3f} "
+              f"{sonuc['p99_ms']:>9.3f} {sonuc['genisletilen_p50']:>12} {sonuc['tepe_bellek_p50_bayt']:>12}")
+
+
+def _pozitif(metin: str) -> int:
+    deger = int(metin)
+    if deger < 1:
+        raise argparse.ArgumentTypeError(f"en az 1 olmalı: {deger}")
+    return deger
+
+
+def _boyut(metin: str) -> Tuple[int, int]:
+    hat_sayisi, hat_basina_istasyon = metin.lower().split("x")
+    return int(hat_sayisi), int(hat_basina_istasyon)
+
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="Metro rota algoritmaları kıyaslaması")
+    ayristirici.add_argument("--boyut", type=_boyut, action="append",
+                             help="HATxISTASYON biçiminde ağ boyutu (birden çok verilebilir), ör. 40x50")
+    ayristirici.add_argument("--sorgu", type=_pozitif, default=200, help="boyut başına sorgu sayısı (en az 1)")
+    ayristirici.add_argument("--tohum", type=int, default=0)
+    ayristirici.add_argument("--varyant", choices=sorted(VARYANTLAR), action="append")
+    ayristirici.add_argument("--cikti", help="sonuçların yazılacağı JSON dosyası")
+    ayristirici.add_argument("--karsilastir", help="gerileme kontrolü için önceki JSON sonucu")
+    ayristirici.add_argument("--esik", type=float, default=1.2, help="gerileme sayılacak p50 artış oranı")
+    argumanlar = ayristirici.parse_args()
+
+    rapor = calistir(argumanlar.boyut or VARSAYILAN_BOYUTLAR, argumanlar.sorgu, argumanlar.tohum,
+                     argumanlar.varyant or tuple(VARYANTLAR))
+    tablo_yazdir(rapor)
+
+    if argumanlar.cikti:
+        with open(argumanlar.cikti, "w", encoding="utf-8") as dosya:
+            json.dump(rapor, dosya, ensure_ascii=False, indent=2)
+
+    if argumanlar.karsilastir:
+        with open(argumanlar.karsilastir, encoding="utf-8") as dosya:
+            bulunan = gerilemeler(json.load(dosya), rapor, argumanlar.esik)
+        for anahtar, eski_p50, yeni_p50 in bulunan:
+            print(f"GERİLEME {anahtar}: p50 {eski_p50:.3f} ms -> {yeni_p50:.3f} ms")
+        if bulunan:
+            sys.exit(1)
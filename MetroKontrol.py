@@ -0,0 +1,515 @@
+# Rota algoritmaları için karşılaştırmalı (differential) doğrulama betiği.
+# Aynı ağ üzerinde aynı canlı aksaklık dizisi (gecikme_ekle, baglanti_kapat, baglanti_ac) farklı yapılandırmalara
+# uygulanır ve her adımdan sonra sonuçlar, ağın o anki halinden sıfırdan kurulan kompakt kopyada ikili yığınla
+# (heapq) çalışan Dijkstra'nın süreleriyle karşılaştırılır:
+# - her öncelik kuyruğu arka ucu (otomatik, heapq, dial, radix) ile A* (en_hizli_rota_bul), tek kaynaklı Dijkstra
+#   ve en az aktarma (referansı tüm ağda (aktarma, süre) sırasıyla çalışan düz Dijkstra)
+# - önceden hesaplanmış rota tablosunun (on_hesapla) artımlı onarımı
+# Bulunan her rotanın süresi, rotadaki bağlantıların süreleri toplanarak ayrıca doğrulanır.
+# Ayrıca:
+# - daraltma hiyerarşisi ve görüntü (snapshot) dosyasından açılan ağ aynı referansla karşılaştırılır
+# - rastgele küçük ağlarda tüm döngüsüz yollar sayılarak alternatif_rotalar (Yen), pareto_rotalar,
+#   en_az_aktarma_detayli_bul ve rota tablosu (on_hesapla) doğrulanır
+# - küçük bir GTFS klasörünün (dağınık stop_times.txt, transfer_type satırları) yüklenmesi denetlenir
+# - tarifede Connection Scan (en_erken_varis) ile RAPTOR'un en erken varışları karşılaştırılır
+# - MetroServis yerel bir portta başlatılıp özdeş isteklerin birleştirilmesi, hatalı istekler ve metrikler denetlenir
+# Hata bulunursa ayrıntıları yazdırılır ve betik 1 koduyla çıkar.
+#
+# Kullanım:
+#   python MetroKontrol.py
+#   python MetroKontrol.py --adim 50 --sorgu 30 --tohum 7
+
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+from ANKARA_MetroSimulation import ONCELIK_KUYRUKLARI, SONSUZ, KompaktMetroAgi, MetroAgi
+from MetroBenchmark import sentetik_sehir
+from MetroServis import RotaServisi
+
+VERI_KLASORU = os.path.join(os.path.dirname(os.path.abspath(__file__)), "veri", "ankara")
+
+
+class Kontrol:
+    # Başarısız karşılaştırmaları toplar; ilk birkaçı ayrıntılı yazdırılır
+    YAZDIRILACAK_HATA = 20
+
+    def __init__(self):
+        self.denenen = 0
+        self.hatalar: List[str] = []
+
+    def esit_mi(self, aciklama: str, bulunan, beklenen) -> None:
+        self.denenen += 1
+        if bulunan != beklenen:
+            self.hatalar.append(f"{aciklama}: {bulunan!r} != {beklenen!r}")
+            if len(self.hatalar) <= self.YAZDIRILACAK_HATA:
+                print("HATA", self.hatalar[-1])
+
+    def calistir(self, aciklama: str, fonksiyon, *argumanlar):
+        # Beklenmeyen istisnalar da hata olarak kaydedilir (ör. kuyruğa tam sayı olmayan öncelik girmesi)
+        try:
+            return fonksiyon(*argumanlar)
+        except Exception as hata:
+            self.denenen += 1
+            self.hatalar.append(f"{aciklama}: {type(hata).__name__}: {hata}")
+            if len(self.hatalar) <= self.YAZDIRILACAK_HATA:
+                print("HATA", self.hatalar[-1])
+            return None
+
+
+def _referans(metro: MetroAgi) -> KompaktMetroAgi:
+    # Ağın o anki halinden sıfırdan kurulan, önbelleği ve yer işareti olmayan heapq'lu kopya
+    donuk = KompaktMetroAgi.agdan_olustur(metro)
+    donuk.kuyruk_turu = "heapq"
+    return donuk
+
+
+def _rota_suresi(referans: KompaktMetroAgi, rota) -> float:
+    kimlikler = [referans.kod_indeksi[istasyon.istasyon_kodu] for istasyon in rota]
+    return sum(referans.baglanti_suresi(a, b) for a, b in zip(kimlikler, kimlikler[1:]))
+
+
+def _en_az_aktarma(referans: KompaktMetroAgi, baslangic: int, hedef: int):
+    # Tüm ağda (aktarma, süre) ikilisini sözlük sırasıyla en aza indiren düz Dijkstra: (aktarma, süre) ya da None
+    hatlar = referans.istasyon_hatlari
+    en_iyi = {baslangic: (0, 0)}
+    yigin = [(0, 0, baslangic)]
+    while yigin:
+        aktarma, sure, v = heapq.heappop(yigin)
+        if v == hedef:
+            return aktarma, sure
+        if en_iyi[v] < (aktarma, sure):
+            continue
+        for j in range(referans.ofsetler[v], referans.ofsetler[v + 1]):
+            u = referans.hedefler[j]
+            yeni = (aktarma + (hatlar[u] != hatlar[v]), sure + referans.agirliklar[j])
+            if u not in en_iyi or yeni < en_iyi[u]:
+                en_iyi[u] = yeni
+                heapq.heappush(yigin, yeni + (u,))
+    return None
+
+
+def _aktarma_sayisi(referans: KompaktMetroAgi, rota) -> int:
+    hatlar = referans.istasyon_hatlari
+    kimlikler = [referans.kod_indeksi[istasyon.istasyon_kodu] for istasyon in rota]
+    return sum(hatlar[a] != hatlar[b] for a, b in zip(kimlikler, kimlikler[1:]))
+
+
+def aksaklik_dizisi(metro: MetroAgi, adim: int, tohum: int, kesirli: bool) -> List[Tuple]:
+    # (işlem, istasyon1, istasyon2, dakika) dizisi; kesirli=True ise gecikmelerin bir kısmı 1.5 gibi kesirlidir.
+    # Dizi bir kopya üzerinde denenerek üretilir, böylece her işlem uygulandığı anda geçerlidir.
+    rastgele = random.Random(tohum)
+    deneme = MetroAgi()
+    deneme.toplu_ekle(((istasyon.istasyon_kodu, istasyon.istasyon_adi, istasyon.hat_adi)
+                       for istasyon in metro.istasyonlar.values()),
+                      ((istasyon.istasyon_kodu, komsu.istasyon_kodu, sure)
+                       for istasyon in metro.istasyonlar.values() for komsu, sure in istasyon.komsu_istasyonlar))
+    ciftler = sorted({deneme._cift(istasyon.istasyon_kodu, komsu.istasyon_kodu)
+                      for istasyon in deneme.istasyonlar.values() for komsu, _ in istasyon.komsu_istasyonlar})
+    kapali: List[Tuple[str, str]] = []
+    gecikmeler = {}  # çift -> toplam gecikme (kaldırılabilmesi için)
+    dizi = []
+    while len(dizi) < adim:
+        secim = rastgele.random()
+        if kapali and secim < 0.25:
+            cift = kapali.pop(rastgele.randrange(len(kapali)))
+            islem = ("ac", cift[0], cift[1], 0)
+        elif secim < 0.5:
+            # Gecikmeli bağlantılar daha sık kapatılır: kesirli gecikmeli tek bağlantı kapanınca süreler tam sayıya döner
+            cift = rastgele.choice(sorted(gecikmeler) if gecikmeler and rastgele.random() < 0.5 else ciftler)
+            if cift in kapali:
+                continue
+            kapali.append(cift)
+            islem = ("kapat", cift[0], cift[1], 0)
+        else:
+            cift = rastgele.choice(ciftler)
+            if cift in kapali:
+                continue
+            if gecikmeler.get(cift) and rastgele.random() < 0.4:
+                dakika = -gecikmeler.pop(cift)  # gecikme kaldırılır (süre kısalır)
+            else:
+                kesirli_var = any(type(toplam) is float for toplam in gecikmeler.values())
+                dakika = rastgele.choice((1.5, 2.5)) if kesirli and not kesirli_var else rastgele.randint(1, 5)
+                gecikmeler[cift] = gecikmeler.get(cift, 0) + dakika
+            islem = ("gecikme", cift[0], cift[1], dakika)
+        uygula(deneme, islem)
+        dizi.append(islem)
+    return dizi
+
+
+def uygula(metro: MetroAgi, islem: Tuple) -> None:
+    tur, istasyon1_kodu, istasyon2_kodu, dakika = islem
+    if tur == "kapat":
+        metro.baglanti_kapat(istasyon1_kodu, istasyon2_kodu)
+    elif tur == "ac":
+        metro.baglanti_ac(istasyon1_kodu, istasyon2_kodu)
+    else:
+        metro.gecikme_ekle(istasyon1_kodu, istasyon2_kodu, dakika)
+
+
+def kuyruk_kontrolu(kontrol: Kontrol, ag_uret, adi: str, adim: int, sorgu: int, tohum: int) -> None:
+    # Dial ve radix kuyrukları yalnızca tam sayı sürelerle kullanılabildiğinden kesirli gecikmeli dizi yalnızca
+    # otomatik ve heapq ile, tam sayı gecikmeli dizi tüm arka uçlarla denenir.
+    for kesirli, turler in ((False, ONCELIK_KUYRUKLARI), (True, ("otomatik", "heapq"))):
+        for tur in turler:
+            metro = ag_uret()
+            metro.kuyruk_turu = tur
+            dizi = aksaklik_dizisi(metro, adim, tohum, kesirli)
+            tablolu = ag_uret() if tur == "otomatik" else None
+            if tablolu is not None:
+                tablolu.on_hesapla()
+            rastgele = random.Random(tohum)
+            kodlar = sorted(metro.istasyonlar)
+            for sira, islem in enumerate([None] + dizi):
+                if islem is not None:
+                    uygula(metro, islem)
+                    if tablolu is not None:
+                        uygula(tablolu, islem)
+                referans = _referans(metro)
+                etiket = f"{adi} {tur} {'kesirli' if kesirli else 'tam'} adım {sira} {islem}"
+
+                kaynak = rastgele.choice(kodlar)
+                beklenen_sureler = referans.tek_kaynak(referans.kod_indeksi[kaynak])[0]
+                donuk = metro.dondur()
+                sonuc = kontrol.calistir(f"{etiket} tek_kaynak", donuk.tek_kaynak, donuk.kod_indeksi[kaynak])
+                if sonuc is not None:
+                    kontrol.esit_mi(f"{etiket} tek_kaynak {kaynak}",
+                                    [sonuc[0][donuk.kod_indeksi[kod]] for kod in kodlar],
+                                    [beklenen_sureler[referans.kod_indeksi[kod]] for kod in kodlar])
+
+                for _ in range(sorgu):
+                    baslangic, hedef = rastgele.choice(kodlar), rastgele.choice(kodlar)
+                    beklenen = referans.tek_kaynak(referans.kod_indeksi[baslangic])[0][referans.kod_indeksi[hedef]]
+                    for ad, ag in (("a_yildiz", metro), ("tablo", tablolu)):
+                        if ag is None:
+                            continue
+                        sonuc = kontrol.calistir(f"{etiket} {ad} {baslangic}-{hedef}",
+                                                 ag.en_hizli_rota_bul, baslangic, hedef)
+                        bulunan = SONSUZ if sonuc is None else sonuc[1]
+                        kontrol.esit_mi(f"{etiket} {ad} {baslangic}-{hedef} süre", bulunan, beklenen)
+                        if sonuc is not None:
+                            kontrol.esit_mi(f"{etiket} {ad} {baslangic}-{hedef} rota süresi",
+                                            _rota_suresi(referans, sonuc[0]), beklenen)
+
+                    # Gecikme ve kapatmalar arasında korunan hat grafıyla en az aktarma
+                    sonuc = kontrol.calistir(f"{etiket} aktarma {baslangic}-{hedef}",
+                                             metro.en_az_aktarma_detayli_bul, baslangic, hedef)
+                    kontrol.esit_mi(f"{etiket} aktarma {baslangic}-{hedef}", None if sonuc is None else sonuc[1:],
+                                    _en_az_aktarma(referans, referans.kod_indeksi[baslangic],
+                                                   referans.kod_indeksi[hedef]))
+                    if sonuc is not None:
+                        kontrol.esit_mi(f"{etiket} aktarma {baslangic}-{hedef} rota",
+                                        (_aktarma_sayisi(referans, sonuc[0]), _rota_suresi(referans, sonuc[0])),
+                                        sonuc[1:])
+
+
+def gerileme_kontrolu(kontrol: Kontrol) -> None:
+    # M1, M2 ve M3'ün hepsi "Mavi Hat": aktarmalar hat adına göre sayıldığında Batıkent (M3 -> M1) ve
+    # Kızılay (M1 -> M2) aktarmaları görünmüyordu
+    sonuc = ankara().en_az_aktarma_detayli_bul("M3_12", "M2_1")
+    kontrol.esit_mi("gerileme aynı adlı hatlar", None if sonuc is None else sonuc[1:], (2, 103))
+
+    # Yüklü ağa aynı dosya yeniden yüklenince her bağlantının paralel bir kopyası ekleniyordu
+    metro = ankara()
+    baglanti_sayisi = len(metro.dondur().hedefler)
+    metro.baglanti_kapat("A1_2", "A1_3")
+    kontrol.esit_mi("gerileme yeniden yükleme", kontrol.calistir("gerileme yeniden yükleme", metro.yukle, VERI_KLASORU),
+                    (0, 0))
+    metro.baglanti_ac("A1_2", "A1_3")
+    kontrol.esit_mi("gerileme yeniden yükleme bağlantıları", len(metro.dondur().hedefler), baglanti_sayisi)
+
+    # Rota tablosunun ilk adımları kaynak başına ayrı ağaçlardan türetildiğinden sıfır dakikalık bağlantılarda
+    # döngü oluşuyor, tablodan yol okumak hiç bitmiyordu
+    metro = MetroAgi()
+    for i in range(7):
+        metro.istasyon_ekle(str(i), str(i), "H")
+    for a, b, sure in ((5, 2, 0), (6, 3, 0), (5, 0, 0), (0, 2, 2), (6, 1, 2), (4, 0, 0), (0, 5, 0), (3, 2, 0),
+                       (6, 3, 0), (6, 0, 0), (4, 6, 2)):
+        metro.baglanti_ekle(str(a), str(b), sure)
+    metro.on_hesapla()
+    sonuc = kontrol.calistir("gerileme sıfır süreli tablo", metro.en_hizli_rota_bul, "0", "2")
+    kontrol.esit_mi("gerileme sıfır süreli tablo", None if sonuc is None else sonuc[1], 0)
+
+    # Kesirli gecikmeyle hesaplanan yer işaretleri, bağlantı kapatılıp süreler yeniden tam sayıya dönünce
+    # Dial kuyruğuna kesirli öncelik sokuyordu
+    metro = MetroAgi()
+    metro.yukle(VERI_KLASORU)
+    metro.gecikme_ekle("A1_2", "A1_3", 1.5)
+    kontrol.esit_mi("gerileme kesirli gecikme", kontrol.calistir("gerileme", metro.en_hizli_rota_bul,
+                                                                   "M4_12", "A1_1")[1], 33.5)
+    metro.baglanti_kapat("A1_2", "A1_3")
+    # Süreler yeniden tam sayı: kesirli yer işaretleri yeni kompakt kopyaya taşınmamalı
+    kontrol.esit_mi("gerileme yer işaretleri", metro.dondur().yer_isaretleri().tam_sayi, True)
+    sonuc = kontrol.calistir("gerileme kapatma", metro.en_hizli_rota_bul, "M4_12", "A1_1")
+    kontrol.esit_mi("gerileme kapatma", None if sonuc is None else sonuc[1],
+                    _referans(metro).en_kisa_sure(metro.dondur().kod_indeksi["M4_12"],
+                                                  metro.dondur().kod_indeksi["A1_1"])[1])
+
+
+def gtfs_kontrolu(kontrol: Kontrol) -> None:
+    # stop_times.txt seferlere göre gruplu değil ve sefer içinde sırasız; transfers.txt'de aktarma yapılamaz (3),
+    # süresiz (0) ve süreli (2) satırlar var
+    dosyalar = {
+        "stops.txt": "stop_id,stop_name\nA,A\nB,B\nC,C\nD,D\nE,E\n",
+        "stop_times.txt": ("trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+                           "t1,08:00:00,08:00:00,A,1\nt2,09:00:00,09:00:00,D,1\nt1,08:05:00,08:05:00,B,2\n"
+                           "t1,08:12:00,08:12:00,C,10\nt2,09:04:00,09:04:00,E,2\n"),
+        "transfers.txt": ("from_stop_id,to_stop_id,transfer_type,min_transfer_time\n"
+                          "A,D,3,\nC,D,0,\nB,E,2,300\n"),
+    }
+    with tempfile.TemporaryDirectory() as klasor:
+        for ad, icerik in dosyalar.items():
+            with open(os.path.join(klasor, ad), "w", encoding="utf-8") as dosya:
+                dosya.write(icerik)
+        metro = MetroAgi()
+        metro.yukle(klasor)
+
+    baglantilar = {metro._cift(istasyon.istasyon_kodu, komsu.istasyon_kodu): sure
+                   for istasyon in metro.istasyonlar.values() for komsu, sure in istasyon.komsu_istasyonlar}
+    kontrol.esit_mi("gtfs bağlantılar", baglantilar,
+                    {("A", "B"): 5, ("B", "C"): 7, ("D", "E"): 4, ("C", "D"): MetroAgi.GTFS_AKTARMA_SURESI // 60,
+                     ("B", "E"): 5})
+    kontrol.esit_mi("gtfs yürüme bağlantıları", metro.yuruyus_baglantilari, {("C", "D"), ("B", "E")})
+
+
+def tarife_kontrolu(kontrol: Kontrol, sorgu: int, tohum: int) -> None:
+    # Connection Scan (en_erken_varis) ile RAPTOR aynı tarifede aynı en erken varışı bulmalı (aktarma sınırı
+    # yeterince büyükken); başlangıç hedefle aynıysa ikisi de kalkış anında bacaksız varış döndürür
+    metro = ankara()
+    tarife = metro.tarife_olustur(ilk_sefer="06:00", son_sefer="09:00", aralik=7)
+    rastgele = random.Random(tohum)
+    kodlar = sorted(metro.istasyonlar)
+    for _ in range(sorgu):
+        baslangic, hedef = rastgele.choice(kodlar), rastgele.choice(kodlar)
+        kalkis = f"{rastgele.randint(6, 7):02d}:{rastgele.randrange(60):02d}"
+        csa = tarife.en_erken_varis(baslangic, hedef, kalkis)
+        raptor = tarife.raptor(baslangic, hedef, kalkis, en_fazla_aktarma=len(metro.dondur().hat_adlari))
+        kontrol.esit_mi(f"tarife {baslangic}-{hedef} {kalkis}", min((varis for _, varis, _ in raptor), default=None),
+                        None if csa is None else csa[0])
+    kontrol.esit_mi("tarife aynı durak raptor", tarife.raptor("A1_1", "A1_1", "08:00"), [(0, 8 * 3600, [])])
+    kontrol.esit_mi("tarife aynı durak csa", tarife.en_erken_varis("A1_1", "A1_1", "08:00"), (8 * 3600, []))
+
+    for aralik in (0, -5, {"Mavi Hat": 0}):
+        try:
+            metro.tarife_olustur(aralik=aralik)
+            kontrol.esit_mi(f"tarife aralık {aralik}", "hata yok", "ValueError")
+        except ValueError:
+            kontrol.esit_mi(f"tarife aralık {aralik}", "ValueError", "ValueError")
+
+
+def hiyerarsi_kontrolu(kontrol: Kontrol, ag_uret, adi: str, sorgu: int, tohum: int) -> None:
+    # Daraltma hiyerarşisi ve görüntü (snapshot) dosyasından açılan ağ, aynı sorgularda referansla aynı süreyi vermeli
+    metro = ag_uret()
+    referans = _referans(metro)
+    # Görüntü mmap ile açık kaldığından (Windows'ta) klasör silinemezse hata sayılmaz
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as klasor:
+        dosya_yolu = os.path.join(klasor, "ag.snapshot")
+        metro.kaydet_snapshot(dosya_yolu)
+        goruntu = MetroAgi.ac_snapshot(dosya_yolu)
+        metro.hiyerarsi_olustur()
+        rastgele = random.Random(tohum)
+        kodlar = sorted(metro.istasyonlar)
+        for _ in range(sorgu):
+            baslangic, hedef = rastgele.choice(kodlar), rastgele.choice(kodlar)
+            beklenen = referans.tek_kaynak(referans.kod_indeksi[baslangic])[0][referans.kod_indeksi[hedef]]
+            for ad, ag in (("daraltma", metro), ("snapshot", goruntu)):
+                sonuc = kontrol.calistir(f"{adi} {ad} {baslangic}-{hedef}", ag.en_hizli_rota_bul, baslangic, hedef)
+                kontrol.esit_mi(f"{adi} {ad} {baslangic}-{hedef} süre", SONSUZ if sonuc is None else sonuc[1],
+                                beklenen)
+                if sonuc is not None:
+                    kontrol.esit_mi(f"{adi} {ad} {baslangic}-{hedef} rota süresi",
+                                    _rota_suresi(referans, sonuc[0]), beklenen)
+            kontrol.esit_mi(f"{adi} snapshot aktarma {baslangic}-{hedef}",
+                            _kodlu(goruntu.en_az_aktarma_detayli_bul(baslangic, hedef)),
+                            _kodlu(metro.en_az_aktarma_detayli_bul(baslangic, hedef)))
+
+
+def _kodlu(sonuc):
+    # (rota, ...) sonucundaki istasyon nesnelerini kodlara çevirir (farklı ağların sonuçları karşılaştırılabilsin)
+    if sonuc is None:
+        return None
+    return ([istasyon.istasyon_kodu for istasyon in sonuc[0]],) + tuple(sonuc[1:])
+
+
+def _basit_yollar(referans: KompaktMetroAgi, baslangic: int, hedef: int) -> List[Tuple[float, int, float]]:
+    # Küçük ağlarda başlangıçtan hedefe tüm döngüsüz yolların (süre, aktarma, yürüme süresi) değerleri
+    hatlar, sonuc = referans.istasyon_hatlari, []
+
+    def gez(v, gorulen, sure, aktarma, yuruyus):
+        if v == hedef:
+            sonuc.append((sure, aktarma, yuruyus))
+            return
+        for j in range(referans.ofsetler[v], referans.ofsetler[v + 1]):
+            u = referans.hedefler[j]
+            if u not in gorulen:
+                gorulen.add(u)
+                agirlik = referans.agirliklar[j]
+                gez(u, gorulen, sure + agirlik, aktarma + (hatlar[u] != hatlar[v]),
+                    yuruyus + (agirlik if referans.yuruyus[j] else 0))
+                gorulen.discard(u)
+
+    gez(baslangic, {baslangic}, 0, 0, 0)
+    return sonuc
+
+
+def kucuk_ag_kontrolu(kontrol: Kontrol, deneme: int, tohum: int) -> None:
+    # Rastgele küçük ağlarda (paralel ve sıfır süreli bağlantılar, yürüme bağlantıları dahil) tüm döngüsüz yollar
+    # sayılarak alternatif_rotalar (Yen), pareto_rotalar, en_az_aktarma_detayli_bul ve rota tablosu doğrulanır
+    rastgele = random.Random(tohum)
+    for sira in range(deneme):
+        metro = MetroAgi()
+        n = rastgele.randint(2, 9)
+        for i in range(n):
+            metro.istasyon_ekle(f"S{i}", f"S{i}", f"H{rastgele.randint(0, 2)}")
+        for _ in range(rastgele.randint(1, 14)):
+            a, b = rastgele.sample(range(n), 2)
+            metro.baglanti_ekle(f"S{a}", f"S{b}", rastgele.randint(0, 9), yuruyus=rastgele.random() < 0.3)
+        referans = _referans(metro)
+        baslangic, hedef = rastgele.randrange(n), rastgele.randrange(n)
+        etiket = f"küçük ağ {sira} S{baslangic}-S{hedef}"
+        yollar = _basit_yollar(referans, baslangic, hedef)
+
+        k = rastgele.randint(1, 6)
+        alternatifler = metro.alternatif_rotalar(f"S{baslangic}", f"S{hedef}", k)
+        # Paralel bağlantılarda yalnızca en kısası kullanıldığından yollar istasyon dizisine göre tekilleştirilir
+        beklenen = sorted({(sure, tuple(yol)) for sure, yol in _istasyon_yollari(referans, baslangic, hedef)})
+        kontrol.esit_mi(f"{etiket} alternatif süreler", [sure for _, sure in alternatifler],
+                        [sure for sure, _ in beklenen[:k]])
+        for rota, sure in alternatifler:
+            kontrol.esit_mi(f"{etiket} alternatif rota süresi", _rota_suresi(referans, rota), sure)
+
+        sonuc = metro.en_az_aktarma_detayli_bul(f"S{baslangic}", f"S{hedef}")
+        kontrol.esit_mi(f"{etiket} en az aktarma", None if sonuc is None else sonuc[1:],
+                        min(((aktarma, sure) for sure, aktarma, _ in yollar), default=None))
+
+        cephe = {deger for deger in yollar
+                 if not any(diger != deger and all(x <= y for x, y in zip(diger, deger)) for diger in yollar)}
+        kontrol.esit_mi(f"{etiket} pareto", sorted((sure, aktarma, yuruyus) for _, sure, aktarma, yuruyus in
+                                                   metro.pareto_rotalar(f"S{baslangic}", f"S{hedef}")), sorted(cephe))
+
+        # Rota tablosu sıfır süreli bağlantılarda da her hedefe referans süresinde bir yol vermeli
+        metro.on_hesapla()
+        beklenen_sureler = referans.tek_kaynak(baslangic)[0]
+        for varis in range(n):
+            sonuc = kontrol.calistir(f"{etiket} tablo S{varis}", metro.en_hizli_rota_bul, f"S{baslangic}", f"S{varis}")
+            kontrol.esit_mi(f"{etiket} tablo S{varis} süre", SONSUZ if sonuc is None else sonuc[1],
+                            beklenen_sureler[varis])
+            if sonuc is not None:
+                kontrol.esit_mi(f"{etiket} tablo S{varis} rota süresi", _rota_suresi(referans, sonuc[0]), sonuc[1])
+
+
+def _istasyon_yollari(referans: KompaktMetroAgi, baslangic: int, hedef: int) -> List[Tuple[float, List[int]]]:
+    # Tüm döngüsüz yollar (süre, istasyon dizisi); iki istasyon arasında paralel bağlantıların en kısası sayılır
+    sonuc = []
+
+    def gez(yol, sure):
+        v = yol[-1]
+        if v == hedef:
+            sonuc.append((sure, list(yol)))
+            return
+        for u in {referans.hedefler[j] for j in range(referans.ofsetler[v], referans.ofsetler[v + 1])}:
+            if u not in yol:
+                yol.append(u)
+                gez(yol, sure + referans.baglanti_suresi(v, u))
+                yol.pop()
+
+    gez([baslangic], 0)
+    return sonuc
+
+
+async def _http_iste(port: int, istek: bytes) -> Tuple[int, dict]:
+    # Ham istek baytlarını gönderir, bağlantı kapanana dek okunan yanıtın (durum, JSON gövde) çiftini döndürür
+    okuyucu, yazici = await asyncio.open_connection("127.0.0.1", port)
+    yazici.write(istek)
+    await yazici.drain()
+    yanit = await okuyucu.read()
+    yazici.close()
+    basliklar, _, govde = yanit.partition(b"\r\n\r\n")
+    return int(basliklar.split()[1]), json.loads(govde.decode("utf-8"))
+
+
+async def _servisi_dene(kontrol: Kontrol, metro: MetroAgi, baslangic: str, hedef: str, adet: int) -> None:
+    servis = RotaServisi(metro)
+    sunucu = await servis.baslat(port=0)
+    port = sunucu.sockets[0].getsockname()[1]
+
+    def get(adres: str) -> bytes:
+        return f"GET {adres} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode("latin-1")
+
+    try:
+        # Arama kilidi tutulduğu sürece ilk hesaplama bitemez; özdeş isteklerin hepsi ona bağlanana dek beklenir
+        with servis._kilit:
+            gorevler = [asyncio.ensure_future(_http_iste(port, get(f"/rota?bas={baslangic}&hedef={hedef}")))
+                        for _ in range(adet)]
+            bitis = time.monotonic() + 10
+            while servis.metrikler.birlestirilen < adet - 1 and time.monotonic() < bitis:
+                await asyncio.sleep(0.01)
+        yanitlar = await asyncio.gather(*gorevler)
+        beklenen = metro.en_hizli_rota_bul(baslangic, hedef)
+        kontrol.esit_mi("servis özdeş istekler", {(durum, govde.get("sure")) for durum, govde in yanitlar},
+                        {(200, beklenen[1])})
+        kontrol.esit_mi("servis özdeş istek rotası", yanitlar[0][1].get("rota") and
+                        [istasyon["kod"] for istasyon in yanitlar[0][1]["rota"]],
+                        [istasyon.istasyon_kodu for istasyon in beklenen[0]])
+
+        kontrol.esit_mi("servis bilinmeyen istasyon",
+                        (await _http_iste(port, get(f"/rota?bas={baslangic}&hedef=YOK")))[0], 400)
+        kontrol.esit_mi("servis bilinmeyen tür",
+                        (await _http_iste(port, get(f"/rota?bas={baslangic}&hedef={hedef}&tur=ucak")))[0], 400)
+        # Bozuk istek satırı metriklere istek olarak yazılmaz, bağlantı yanıttan sonra kapatılır
+        kontrol.esit_mi("servis bozuk istek satırı", (await _http_iste(port, b"BOZUK\r\n\r\n"))[0], 400)
+
+        durum, metrikler = await _http_iste(port, get("/metrikler"))
+        kontrol.esit_mi("servis metrikler", (durum, {ad: metrikler.get(ad) for ad in
+                                                    ("istek", "hata", "hesaplanan", "birlestirilen", "aktif",
+                                                     "baglanti")}),
+                        (200, {"istek": adet + 2, "hata": 2, "hesaplanan": 1, "birlestirilen": adet - 1, "aktif": 1,
+                               "baglanti": 1}))
+    finally:
+        sunucu.close()
+        await sunucu.wait_closed()
+        servis.kapat()
+
+
+def servis_kontrolu(kontrol: Kontrol, adet: int = 8) -> None:
+    # MetroServis yerel bir portta başlatılır: aynı anda gelen özdeş /rota istekleri tek hesaplamada birleşmeli,
+    # bilinmeyen istasyon / tür ve bozuk istek satırı 400 almalı, /metrikler sayaçları isteklerle tutarlı olmalı
+    metro = ankara()
+    kodlar = sorted(metro.istasyonlar)
+    kontrol.calistir("servis", asyncio.run, _servisi_dene(kontrol, metro, kodlar[0], kodlar[-1], adet))
+
+
+def ankara() -> MetroAgi:
+    metro = MetroAgi()
+    metro.yukle(VERI_KLASORU)
+    return metro
+
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="Metro rota algoritmaları karşılaştırmalı doğrulaması")
+    ayristirici.add_argument("--adim", type=int, default=30, help="ağ başına aksaklık sayısı")
+    ayristirici.add_argument("--sorgu", type=int, default=10, help="adım başına rota sorgusu")
+    ayristirici.add_argument("--tohum", type=int, default=0)
+    argumanlar = ayristirici.parse_args()
+
+    kontrol = Kontrol()
+    gerileme_kontrolu(kontrol)
+    gtfs_kontrolu(kontrol)
+    servis_kontrolu(kontrol)
+    tarife_kontrolu(kontrol, argumanlar.sorgu * 10, argumanlar.tohum)
+    kucuk_ag_kontrolu(kontrol, argumanlar.adim * 10, argumanlar.tohum)
+    for adi, ag_uret in (("ankara", ankara),
+                         ("sentetik", lambda: sentetik_sehir(MetroAgi, 8, 25, tohum=argumanlar.tohum))):
+        kuyruk_kontrolu(kontrol, ag_uret, adi, argumanlar.adim, argumanlar.sorgu, argumanlar.tohum)
+        hiyerarsi_kontrolu(kontrol, ag_uret, adi, argumanlar.sorgu * 10, argumanlar.tohum)
+
+    print(f"{kontrol.denenen} karşılaştırma, {len(kontrol.hatalar)} hata")
+    if kontrol.hatalar:
+        sys.exit(1)
@@ -0,0 +1,220 @@
+# Çok çekirdekli toplu sorgu çalıştırıcısı (paylaşımlı bellek üzerinde).
+# Python'da bir süreç aynı anda tek çekirdek kullanır (GIL). ParalelSorgulayici ağın kompakt (CSR) dizilerini,
+# istasyon hatlarını ve A* yer işareti mesafelerini bir kez multiprocessing.shared_memory bloğuna yazar; işçi süreçler
+# bloğa adıyla bağlanır ve dizileri kopyalamadan (memoryview) kullanır, yani ağ her süreçte yeniden kurulmaz.
+# (başlangıç, hedef) çiftleri parçalar halinde süreç havuzuna dağıtılır; sonuçlar giriş sırasıyla döner.
+# İşçilere yalnızca kimlik çiftleri gönderilir, geri yalnızca kimlik listeleri ve süreler gelir.
+#
+# Kullanım:
+#   with ParalelSorgulayici(metro, isci_sayisi=4) as sorgulayici:
+#       sonuclar = sorgulayici.sorgula([("A1_1", "M3_12"), ("M1_12", "M4_12")])
+#   python MetroParalel.py --veri veri/ankara --sorgu 20000 --isci 4
+
+import argparse
+import math
+import multiprocessing
+import multiprocessing.util
+import os
+import random
+import time
+from array import array
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ANKARA_MetroSimulation import SONSUZ, KompaktMetroAgi, MetroAgi, YerIsaretleri
+
+TURLER = ("hizli", "aktarma", "durak")
+
+
+def _duzen(n: int, m: int, yer_isareti_adedi: int, tip: str):
+    # Paylaşımlı bloktaki bölümlerin (ad, ofset, bayt boyu, tip) listesi ve toplam boy; bölümler 8 bayta hizalanır.
+    # Yer işareti mesafelerinde ulaşılamayan istasyonlar -1 ile tutulur.
+    bolumler = [("ofsetler", n + 1, 'i'), ("hedefler", m, 'i'), ("agirliklar", m, tip), ("istasyon_hatlari", n, 'i'),
+                ("yer_isaretleri", yer_isareti_adedi, 'i'), ("yer_mesafeleri", yer_isareti_adedi * n, tip)]
+    duzen = []
+    ofset = 0
+    for ad, adet, bolum_tipi in bolumler:
+        boy = adet * array(bolum_tipi).itemsize
+        duzen.append((ad, ofset, boy, bolum_tipi))
+        ofset += (boy + 7) // 8 * 8
+    return duzen, ofset
+
+
+# İşçi süreç durumu: havuz başlatılırken bir kez doldurulur
+_isci: Dict[str, object] = {}
+
+
+def _isci_baslat(ad: str, n: int, m: int, yer_isareti_adedi: int, tip: str, hat_adlari: List[str],
+                 kuyruk_turu: str) -> None:
+    bellek = shared_memory.SharedMemory(name=ad)
+    duzen, _ = _duzen(n, m, yer_isareti_adedi, tip)
+    bolum = {ad: bellek.buf[ofset:ofset + boy].cast(bolum_tipi) for ad, ofset, boy, bolum_tipi in duzen}
+
+    # Kodlar işçide gerekmez: sorgular ve sonuçlar kimliklerle taşınır
+    donuk = KompaktMetroAgi(range(n), bolum["ofsetler"], bolum["hedefler"], bolum["agirliklar"], hat_adlari,
+                            bolum["istasyon_hatlari"], kod_indeksi={})
+    donuk.kuyruk_turu = kuyruk_turu
+    # Yer işareti mesafeleri de kopyalanmaz: her satır paylaşımlı bloğun bir dilimidir, -1 SONSUZ sayılır
+    mesafeler = bolum["yer_mesafeleri"]
+    donuk._yer_isaretleri = YerIsaretleri(bolum["yer_isaretleri"],
+                                          [mesafeler[k * n:(k + 1) * n] for k in range(yer_isareti_adedi)],
+                                          ulasilamaz=-1)
+    _isci["bellek"] = bellek  # blok süreç boyunca açık kalır
+    _isci["donuk"] = donuk
+    multiprocessing.util.Finalize(None, _isci_kapat, exitpriority=10)
+
+
+def _isci_kapat() -> None:
+    # Süreç kapanırken blok üzerindeki görünümler bırakılır, sonra blok kapatılır (silinmez; sahibi ana süreçtir)
+    _isci.pop("donuk", None)
+    bellek = _isci.pop("bellek", None)
+    if bellek is not None:
+        bellek.close()
+
+
+def _isci_sorgula(gorev: Tuple[str, bool, List[Tuple[int, int]]]) -> List:
+    tur, rotalar, ciftler = gorev
+    donuk: KompaktMetroAgi = _isci["donuk"]
+    sonuclar = []
+    for baslangic, hedef in ciftler:
+        if tur == "hizli":
+            sonuc = donuk.en_kisa_sure(baslangic, hedef, sezgisel=True)
+            if sonuc is not None and not rotalar:
+                sonuc = sonuc[1]
+        elif tur == "aktarma":
+            sonuc = donuk.en_az_aktarma(baslangic, hedef)
+            if sonuc is not None and not rotalar:
+                sonuc = sonuc[1:]
+        else:
+            sonuc = donuk.en_az_durak(baslangic, hedef)
+            if sonuc is not None and not rotalar:
+                sonuc = len(sonuc) - 1
+        sonuclar.append(sonuc)
+    return sonuclar
+
+
+class ParalelSorgulayici:
+    def __init__(self, metro: MetroAgi, isci_sayisi: Optional[int] = None, parca_boyu: Optional[int] = None):
+        self.metro = metro
+        self.donuk = donuk = metro.dondur()
+        self.surum = metro.surum  # paylaşılan kopyanın ait olduğu ağ sürümü
+        self.isci_sayisi = isci_sayisi or os.cpu_count() or 1
+        self.parca_boyu = parca_boyu  # None: sorgular işçi başına yaklaşık 4 parçaya bölünür
+
+        yer_isaretleri = donuk.yer_isaretleri()
+        n, m, adet = len(donuk), len(donuk.hedefler), len(yer_isaretleri.istasyonlar)
+        tip = 'd' if memoryview(donuk.agirliklar).format == 'd' else 'i'
+        icerik = {"ofsetler": donuk.ofsetler, "hedefler": donuk.hedefler, "agirliklar": donuk.agirliklar,
+                  "istasyon_hatlari": donuk.istasyon_hatlari,
+                  "yer_isaretleri": array('i', yer_isaretleri.istasyonlar),
+                  "yer_mesafeleri": array(tip, (-1 if mesafe == SONSUZ else mesafe
+                                                for satir in yer_isaretleri.mesafeler for mesafe in satir))}
+        duzen, toplam = _duzen(n, m, adet, tip)
+
+        self._bellek = shared_memory.SharedMemory(create=True, size=max(toplam, 1))
+        try:
+            for ad, ofset, boy, _ in duzen:
+                self._bellek.buf[ofset:ofset + boy] = memoryview(icerik[ad]).cast('B')
+            self._havuz = multiprocessing.Pool(self.isci_sayisi, initializer=_isci_baslat,
+                                               initargs=(self._bellek.name, n, m, adet, tip, list(donuk.hat_adlari),
+                                                         donuk.kuyruk_turu))
+        except BaseException:
+            # Havuz kurulamazsa (fork / kaynak hatası) kapat() hiç çağrılamaz; blok burada bırakılır
+            self._bellek.close()
+            self._bellek.unlink()
+            raise
+
+    # Çiftleri işçilere dağıtır, sonuçları giriş sırasıyla döndürür. Sonuçlar MetroAgi'deki karşılıklarıyla aynı
+    # biçimdedir (hizli: en_hizli_rota_bul, aktarma: en_az_aktarma_detayli_bul, durak: en_az_durak_bul); bilinmeyen
+    # kodlar ve rotası olmayan çiftler için None. rotalar=False verilirse rota nesneleri oluşturulmaz ve işçilerden
+    # rota taşınmaz: hizli için süre, aktarma için (aktarma, süre), durak için durak sayısı döner.
+    def sorgula(self, ciftler: Iterable[Tuple[str, str]], tur: str = "hizli", rotalar: bool = True) -> List:
+        if tur not in TURLER:
+            raise ValueError(f"bilinmeyen sorgu türü: {tur}")
+        if self.metro.surum != self.surum:
+            raise RuntimeError("ağ değişti; paylaşılan kopya eski (yeni bir ParalelSorgulayici oluşturun)")
+
+        kod_indeksi = self.donuk.kod_indeksi
+        sonuclar: List = []
+        kimlik_ciftleri, sira = [], []  # bilinen çiftler ve sonuç listesindeki yerleri
+        for baslangic_kodu, hedef_kodu in ciftler:
+            baslangic, hedef = kod_indeksi.get(baslangic_kodu), kod_indeksi.get(hedef_kodu)
+            if baslangic is not None and hedef is not None:
+                kimlik_ciftleri.append((baslangic, hedef))
+                sira.append(len(sonuclar))
+            sonuclar.append(None)
+        if not kimlik_ciftleri:
+            return sonuclar
+
+        parca_boyu = self.parca_boyu or math.ceil(len(kimlik_ciftleri) / (self.isci_sayisi * 4))
+        gorevler = [(tur, rotalar, kimlik_ciftleri[i:i + parca_boyu])
+                    for i in range(0, len(kimlik_ciftleri), parca_boyu)]
+        yer = iter(sira)
+        for parca in self._havuz.imap(_isci_sorgula, gorevler):
+            for sonuc in parca:
+                sonuclar[next(yer)] = self._nesnele(tur, sonuc) if rotalar and sonuc is not None else sonuc
+        return sonuclar
+
+    def _nesnele(self, tur: str, sonuc):
+        # İşçiden gelen kimlik listelerini istasyon nesnelerine çevirir
+        nesnele = self.metro._nesnele
+        if tur == "hizli":
+            return nesnele(self.donuk, sonuc[0]), sonuc[1]
+        if tur == "aktarma":
+            return (nesnele(self.donuk, sonuc[0]),) + tuple(sonuc[1:])
+        return nesnele(self.donuk, sonuc)
+
+    def kapat(self) -> None:
+        # Havuz kapatılır, paylaşımlı blok serbest bırakılır
+        if self._havuz is not None:
+            self._havuz.close()
+            self._havuz.join()
+            self._havuz = None
+            self._bellek.close()
+            self._bellek.unlink()
+
+    def __enter__(self) -> 'ParalelSorgulayici':
+        return self
+
+    def __exit__(self, *hata) -> None:
+        self.kapat()
+
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="Paylaşımlı bellekte paralel toplu rota sorguları")
+    ayristirici.add_argument("--veri", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "veri", "ankara"),
+                             help="yukle() ile okunacak ağ (CSV klasörü, GTFS klasörü ya da .json)")
+    ayristirici.add_argument("--snapshot", help="ağ yerine açılacak ikili ağ görüntüsü")
+    ayristirici.add_argument("--sorgu", type=int, default=20000, help="rastgele (başlangıç, hedef) çifti sayısı")
+    ayristirici.add_argument("--isci", type=int, default=os.cpu_count() or 1, help="işçi süreç sayısı")
+    ayristirici.add_argument("--tur", choices=TURLER, default="hizli")
+    ayristirici.add_argument("--tohum", type=int, default=0)
+    argumanlar = ayristirici.parse_args()
+
+    if argumanlar.snapshot:
+        metro = MetroAgi.ac_snapshot(argumanlar.snapshot)
+    else:
+        metro = MetroAgi()
+        metro.yukle(argumanlar.veri)
+    kodlar = list(metro.dondur().kodlar)
+    rastgele = random.Random(argumanlar.tohum)
+    ciftler = [(rastgele.choice(kodlar), rastgele.choice(kodlar)) for _ in range(argumanlar.sorgu)]
+
+    # Karşılaştırma için aynı aramalar tek süreçte (önbelleksiz, kompakt ağ üzerinde) çalıştırılır
+    donuk = metro.dondur()
+    donuk.yer_isaretleri()
+    fonksiyon = {"hizli": lambda b, h: donuk.en_kisa_sure(b, h, sezgisel=True),
+                 "aktarma": donuk.en_az_aktarma, "durak": donuk.en_az_durak}[argumanlar.tur]
+    t0 = time.perf_counter()
+    for baslangic_kodu, hedef_kodu in ciftler:
+        fonksiyon(donuk.kod_indeksi[baslangic_kodu], donuk.kod_indeksi[hedef_kodu])
+    tek = time.perf_counter() - t0
+
+    with ParalelSorgulayici(metro, argumanlar.isci) as sorgulayici:
+        t0 = time.perf_counter()
+        sorgulayici.sorgula(ciftler, argumanlar.tur, rotalar=False)
+        paralel = time.perf_counter() - t0
+
+    print(f"{len(kodlar)} istasyon, {len(ciftler)} sorgu ({argumanlar.tur})")
+    print(f"tek süreç:        {len(ciftler) / tek:10.0f} sorgu/sn")
+    print(f"{argumanlar.isci:2d} işçi süreç:    {len(ciftler) / paralel:10.0f} sorgu/sn  (x{tek / paralel:.2f})")
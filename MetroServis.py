@@ -0,0 +1,249 @@
+# Metro rota servisi: asyncio üzerinde çalışan küçük bir HTTP/1.1 JSON sunucusu.
+# Aramalar olay döngüsünü (event loop) bloklamamak için bir yürütücüde (executor) çalışır; aynı anda gelen özdeş
+# sorgular (aynı başlangıç, hedef, tür ve ağ sürümü) tek bir hesaplamada birleştirilir. Gecikme ve iş hacmi
+# ölçümleri /metrikler adresinden okunur. Yalnızca standart kütüphane kullanılır.
+#
+# Uç noktalar:
+#   GET /rota?bas=A1_1&hedef=M3_12&tur=hizli   (tur: hizli | aktarma | durak; varsayılan hizli)
+#   GET /metrikler
+#   GET /saglik
+#
+# Kullanım:
+#   python MetroServis.py --veri veri/ankara --port 8080
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ANKARA_MetroSimulation import MetroAgi
+
+TURLER = ("hizli", "aktarma", "durak")
+DURUM_METINLERI = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                   500: "Internal Server Error"}
+
+
+def _json(veri) -> bytes:
+    return json.dumps(veri, ensure_ascii=False).encode("utf-8")
+
+
+class ServisMetrikleri:
+    def __init__(self, pencere: int = 10000):
+        self.baslangic = time.monotonic()
+        self.istek = 0  # tamamlanan istek sayısı
+        self.hata = 0  # 4xx / 5xx yanıtlar
+        self.hesaplanan = 0  # yürütücüde gerçekten yapılan arama sayısı
+        self.birlestirilen = 0  # devam eden özdeş bir aramaya bağlanan istekler
+        self.aktif = 0  # şu anda işlenen istekler
+        self.baglanti = 0  # açık bağlantılar
+        self._gecikmeler = deque(maxlen=pencere)  # son isteklerin gecikmeleri (ms)
+        self._zamanlar = deque(maxlen=pencere)  # son isteklerin bitiş zamanları
+
+    def kaydet(self, gecikme_ms: float, hata: bool) -> None:
+        self.istek += 1
+        self.hata += hata
+        self._gecikmeler.append(gecikme_ms)
+        self._zamanlar.append(time.monotonic())
+
+    @staticmethod
+    def _yuzdelik(sirali: List[float], oran: float) -> float:
+        if not sirali:
+            return 0.0
+        return sirali[max(0, math.ceil(oran * len(sirali)) - 1)]
+
+    def ozet(self, aralik: float = 10.0) -> Dict[str, object]:
+        # Gecikme yüzdelikleri son pencere isteklerinden, iş hacmi son aralik saniyeden hesaplanır
+        simdi = time.monotonic()
+        sirali = sorted(self._gecikmeler)
+        son = sum(1 for zaman in self._zamanlar if simdi - zaman <= aralik)
+        return {
+            "calisma_suresi_sn": round(simdi - self.baslangic, 3),
+            "istek": self.istek,
+            "hata": self.hata,
+            "hesaplanan": self.hesaplanan,
+            "birlestirilen": self.birlestirilen,
+            "aktif": self.aktif,
+            "baglanti": self.baglanti,
+            "istek_sn": round(son / min(aralik, max(simdi - self.baslangic, 1e-9)), 2),
+            "gecikme_ms": {"p50": round(self._yuzdelik(sirali, 0.50), 3), "p90": round(self._yuzdelik(sirali, 0.90), 3),
+                           "p99": round(self._yuzdelik(sirali, 0.99), 3),
+                           "maks": round(sirali[-1], 3) if sirali else 0.0},
+        }
+
+
+class RotaServisi:
+    def __init__(self, metro: MetroAgi, isci_sayisi: int = 1, bos_bekleme: float = 30.0):
+        self.metro = metro
+        self.metrikler = ServisMetrikleri()
+        self.bos_bekleme = bos_bekleme  # boşta bekleyen (keep-alive) bağlantının kapatılma süresi (sn)
+        # MetroAgi (önbellek, tembel yapılar) iş parçacığı güvenli değildir; aramalar kilitle sıraya sokulur.
+        # Arama CPU'ya bağlı olduğundan tek işçi çoğu durumda yeterlidir, olay döngüsü yine de hiç bloklanmaz.
+        self._yurutucu = ThreadPoolExecutor(max_workers=isci_sayisi, thread_name_prefix="rota")
+        self._kilit = threading.Lock()
+        self._devam_edenler: Dict[Tuple, asyncio.Future] = {}  # birleştirme anahtarı -> hesaplamanın sonucu
+
+    def _hesapla(self, baslangic_kodu: str, hedef_kodu: str, tur: str) -> Tuple[int, bytes]:
+        # Yürütücüde çalışır; JSON da burada kodlanır, böylece birleştirilen istekler aynı baytları paylaşır
+        with self._kilit:
+            metro = self.metro
+            yanit: Dict[str, object] = {"bas": baslangic_kodu, "hedef": hedef_kodu, "tur": tur}
+            if tur == "hizli":
+                sonuc = metro.en_hizli_rota_bul(baslangic_kodu, hedef_kodu)
+                if sonuc is not None:
+                    rota, yanit["sure"] = sonuc
+            elif tur == "aktarma":
+                sonuc = metro.en_az_aktarma_detayli_bul(baslangic_kodu, hedef_kodu)
+                if sonuc is not None:
+                    rota, yanit["aktarma"], yanit["sure"] = sonuc
+            else:
+                sonuc = rota = metro.en_az_durak_bul(baslangic_kodu, hedef_kodu)
+
+        if sonuc is None:
+            yanit["hata"] = "rota bulunamadı"
+            return 404, _json(yanit)
+        yanit["rota"] = [{"kod": istasyon.istasyon_kodu, "ad": istasyon.istasyon_adi, "hat": istasyon.hat_adi}
+                         for istasyon in rota]
+        return 200, _json(yanit)
+
+    async def rota(self, baslangic_kodu: str, hedef_kodu: str, tur: str = "hizli") -> Tuple[int, bytes]:
+        # Aynı sorgu hâlâ hesaplanıyorsa yeni bir hesaplama başlatılmaz, onun sonucu beklenir
+        anahtar = (baslangic_kodu, hedef_kodu, tur, self.metro.surum)
+        gelecek = self._devam_edenler.get(anahtar)
+        if gelecek is not None:
+            self.metrikler.birlestirilen += 1
+            return await asyncio.shield(gelecek)
+
+        gelecek = asyncio.get_running_loop().run_in_executor(self._yurutucu, self._hesapla,
+                                                             baslangic_kodu, hedef_kodu, tur)
+        self._devam_edenler[anahtar] = gelecek
+        self.metrikler.hesaplanan += 1
+        try:
+            return await asyncio.shield(gelecek)
+        finally:
+            if self._devam_edenler.get(anahtar) is gelecek:
+                del self._devam_edenler[anahtar]
+
+    async def _isle(self, yontem: str, adres: str) -> Tuple[int, bytes]:
+        if yontem != "GET":
+            return 405, _json({"hata": "yalnızca GET desteklenir"})
+        parcalar = urlsplit(adres)
+        if parcalar.path == "/saglik":
+            return 200, _json({"durum": "ok"})
+        if parcalar.path == "/metrikler":
+            return 200, _json(self.metrikler.ozet())
+        if parcalar.path != "/rota":
+            return 404, _json({"hata": "bilinmeyen adres"})
+
+        parametreler = {ad: degerler[0] for ad, degerler in parse_qs(parcalar.query).items()}
+        baslangic_kodu, hedef_kodu = parametreler.get("bas"), parametreler.get("hedef")
+        tur = parametreler.get("tur", "hizli")
+        if not baslangic_kodu or not hedef_kodu:
+            return 400, _json({"hata": "bas ve hedef parametreleri gerekli"})
+        if tur not in TURLER:
+            return 400, _json({"hata": f"tur şunlardan biri olmalı: {', '.join(TURLER)}"})
+        bilinmeyenler = [kod for kod in (baslangic_kodu, hedef_kodu) if kod not in self.metro.istasyonlar]
+        if bilinmeyenler:
+            return 400, _json({"hata": f"bilinmeyen istasyon: {', '.join(bilinmeyenler)}"})
+        return await self.rota(baslangic_kodu, hedef_kodu, tur)
+
+    async def baglanti_isle(self, okuyucu: asyncio.StreamReader, yazici: asyncio.StreamWriter) -> None:
+        # Bir TCP bağlantısı: keep-alive ile art arda birden çok istek işlenebilir
+        self.metrikler.baglanti += 1
+        try:
+            while True:
+                try:
+                    istek_satiri = await asyncio.wait_for(okuyucu.readline(), self.bos_bekleme)
+                    if not istek_satiri:
+                        break
+                    basliklar = {}
+                    while True:
+                        satir = await okuyucu.readline()
+                        if satir in (b"\r\n", b"\n", b""):
+                            break
+                        ad, _, deger = satir.decode("latin-1").partition(":")
+                        basliklar[ad.strip().lower()] = deger.strip()
+                    if int(basliklar.get("content-length") or 0):
+                        await okuyucu.readexactly(int(basliklar["content-length"]))  # gövde kullanılmaz
+                    yontem, adres, surum = istek_satiri.decode("latin-1").split()
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                except ValueError:
+                    # Bozuk istek satırı / başlık ya da satır sınırı aşıldı: yanıt verilip bağlantı kapatılır
+                    await self._yanit_yaz(yazici, 400, _json({"hata": "bozuk istek"}), kapat=True)
+                    break
+
+                baslangic_zamani = time.perf_counter()
+                self.metrikler.aktif += 1
+                try:
+                    durum, govde = await self._isle(yontem, adres)
+                except Exception:
+                    durum, govde = 500, _json({"hata": "sunucu hatası"})
+                finally:
+                    self.metrikler.aktif -= 1
+                self.metrikler.kaydet((time.perf_counter() - baslangic_zamani) * 1000, durum >= 400)
+
+                kapat = surum == "HTTP/1.0" or basliklar.get("connection", "").lower() == "close"
+                await self._yanit_yaz(yazici, durum, govde, kapat)
+                if kapat:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.metrikler.baglanti -= 1
+            yazici.close()
+
+    @staticmethod
+    async def _yanit_yaz(yazici: asyncio.StreamWriter, durum: int, govde: bytes, kapat: bool) -> None:
+        yazici.write(f"HTTP/1.1 {durum} {DURUM_METINLERI[durum]}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(govde)}\r\n"
+                     f"Connection: {'close' if kapat else 'keep-alive'}\r\n\r\n".encode("latin-1") + govde)
+        await yazici.drain()
+
+    async def baslat(self, host: str = "127.0.0.1", port: int = 8080, kuyruk: int = 4096) -> asyncio.AbstractServer:
+        # port=0 verilirse boş bir port seçilir (sunucu.sockets[0].getsockname() ile okunur)
+        return await asyncio.start_server(self.baglanti_isle, host, port, backlog=kuyruk)
+
+    def kapat(self) -> None:
+        self._yurutucu.shutdown(wait=False)
+
+
+async def _calistir(metro: MetroAgi, host: str, port: int, isci_sayisi: int) -> None:
+    servis = RotaServisi(metro, isci_sayisi)
+    sunucu = await servis.baslat(host, port)
+    adres = sunucu.sockets[0].getsockname()
+    print(f"Metro rota servisi http://{adres[0]}:{adres[1]} adresinde çalışıyor")
+    try:
+        async with sunucu:
+            await sunucu.serve_forever()
+    finally:
+        servis.kapat()
+
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="Metro rota servisi (HTTP/JSON)")
+    ayristirici.add_argument("--veri", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "veri", "ankara"),
+                             help="yukle() ile okunacak ağ (CSV klasörü, GTFS klasörü ya da .json)")
+    ayristirici.add_argument("--snapshot", help="ağ yerine açılacak ikili ağ görüntüsü")
+    ayristirici.add_argument("--host", default="127.0.0.1")
+    ayristirici.add_argument("--port", type=int, default=8080)
+    ayristirici.add_argument("--isci", type=int, default=1, help="arama yürütücüsündeki iş parçacığı sayısı")
+    argumanlar = ayristirici.parse_args()
+
+    if argumanlar.snapshot:
+        metro = MetroAgi.ac_snapshot(argumanlar.snapshot)
+    else:
+        metro = MetroAgi()
+        metro.yukle(argumanlar.veri)
+
+    try:
+        asyncio.run(_calistir(metro, argumanlar.host, argumanlar.port, argumanlar.isci))
+    except KeyboardInterrupt:
+        pass